@@ -4,16 +4,115 @@ Handles: Match scoring, Skill gap analysis, Resume generation, ATS scoring
 """
 import re
 import json
-from typing import Dict, List, Tuple
+import time
+import asyncio
+import threading
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Union
 from student_profile import StudentProfile
 from internship_job import InternshipJob
+from skill_matcher import SkillMatch, get_job_matcher
+from canonical_skills import student_skill_sets
+from keyword_automaton import KeywordAutomaton
+from llm_cache import LLMResponseCache, get_default_cache
+from async_llm import AsyncLLMClient
+from singleflight import SingleFlight, get_default_group
+from llm_scheduler import LLMScheduler, RequestPriority, estimate_tokens, get_default_scheduler
+from taxonomy import get_default_taxonomy
+from prompts import RECOMMENDATION_PROMPT, RESUME_PROMPT
 import config
+import metrics
+import scoring
+
+
+class LLMStream:
+    """
+    Iterator over LLM text chunks that records time-to-first-token
+    `source` is "mock", "cache", "real" or "fallback" (mock after an API error
+    before the first chunk; an error after it is raised to the consumer)
+    """
+    
+    def __init__(self):
+        self.source = "mock"
+        self.started_at = time.perf_counter()
+        self.ttft_seconds: Optional[float] = None
+        self._parts: List[str] = []
+        self._chunks: Iterator[str] = iter(())
+    
+    def __iter__(self) -> Iterator[str]:
+        for chunk in self._chunks:
+            if self.ttft_seconds is None:
+                self.ttft_seconds = time.perf_counter() - self.started_at
+                metrics.LLM_TTFT_SECONDS.observe(self.ttft_seconds, self.source)
+            self._parts.append(chunk)
+            yield chunk
+    
+    @property
+    def text(self) -> str:
+        """Text received so far"""
+        return "".join(self._parts)
+
+
+# analyze_match recommendation modes: generate now, on first access, or never
+RECOMMENDATION_MODES = ("eager", "lazy", "none")
+
+
+class LazyRecommendation:
+    """
+    Recommendation text generated on first use (str(), .text, == or JSON
+    serialization via json_default); the LLM is called at most once
+    """
+    
+    def __init__(self, generate: Callable[[], str]):
+        self._generate = generate
+        self._text: Optional[str] = None
+        self._lock = threading.Lock()
+    
+    @property
+    def resolved(self) -> bool:
+        return self._text is not None
+    
+    @property
+    def text(self) -> str:
+        if self._text is None:
+            with self._lock:
+                if self._text is None:
+                    self._text = self._generate()
+                    self._generate = None
+        return self._text
+    
+    def __str__(self) -> str:
+        return self.text
+    
+    def __eq__(self, other) -> bool:
+        if isinstance(other, LazyRecommendation):
+            other = other.text
+        return self.text == other
+    
+    __hash__ = None
+    
+    def __repr__(self) -> str:
+        state = repr(self._text) if self.resolved else "unresolved"
+        return f"LazyRecommendation({state})"
+
+
+def json_default(obj):
+    """json.dumps(default=...) hook that resolves lazy recommendations"""
+    if isinstance(obj, LazyRecommendation):
+        return obj.text
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
 
 
 class InternHubAIAgent:
     """AI Agent for internship matching and analysis"""
     
-    def __init__(self, use_mock: bool = True):
+    def __init__(
+        self,
+        use_mock: bool = True,
+        cache: Optional[LLMResponseCache] = None,
+        async_client: Optional[AsyncLLMClient] = None,
+        flights: Optional[SingleFlight] = None,
+        scheduler: Optional[LLMScheduler] = None
+    ):
         """Initialize the AI agent"""
         self.use_mock = use_mock
         if not use_mock and config.OPENAI_API_KEY:
@@ -24,38 +123,55 @@ class InternHubAIAgent:
             except ImportError:
                 print("Warning: OpenAI module not installed. Falling back to mock LLM.")
                 self.use_mock = True
+        
+        # Response cache for real LLM calls (mock responses are free)
+        if cache is None and config.LLM_CACHE_ENABLED and not self.use_mock:
+            cache = get_default_cache()
+        self.cache = cache
+        self._async_client = async_client  # Created on first async call
+        # Same taxonomy the canonical skill IDs come from (config.SKILL_TAXONOMY_PATH),
+        # so gap categories and skill matching always agree
+        self.taxonomy = get_default_taxonomy()
+        # Identical concurrent prompts share one upstream request
+        self.flights = flights if flights is not None else get_default_group()
+        # RPM/TPM budgets for upstream requests, interactive before batch
+        self.scheduler = scheduler if scheduler is not None else get_default_scheduler()
     
     def analyze_match(
         self, 
         student: StudentProfile, 
-        job: InternshipJob
+        job: InternshipJob,
+        recommendation: str = "eager"
     ) -> Dict:
         """
         Analyze how well a student matches an internship
         Returns: match_score, skill_gaps, strengths, recommendation
-        """
-        # 1. Calculate match confidence score
-        confidence = self._calculate_match_score(student, job)
         
-        # 2. Identify skill gaps
-        skill_gaps = self._analyze_skill_gaps(student, job)
+        recommendation: "eager" calls the LLM now, "lazy" returns a
+        LazyRecommendation resolved on first use, "none" (score-only) omits
+        the key and never calls the LLM
+        """
+        if recommendation not in RECOMMENDATION_MODES:
+            raise ValueError(
+                f"recommendation must be one of {RECOMMENDATION_MODES}, got {recommendation!r}"
+            )
         
-        # 3. Identify student strengths
-        strengths = self._identify_strengths(student, job)
+        # 1-3. Score, skill gaps and strengths
+        confidence, skill_gaps, strengths = self._score_match(student, job)
         
         # 4. Generate recommendation
-        recommendation = self._generate_recommendation(
-            student, job, confidence, skill_gaps
-        )
+        if recommendation == "none":
+            result = self._match_result(confidence, skill_gaps, strengths, None)
+            del result["recommendation"]
+            return result
+        if recommendation == "lazy":
+            text = LazyRecommendation(
+                lambda: self._generate_recommendation(student, job, confidence, skill_gaps)
+            )
+        else:
+            text = self._generate_recommendation(student, job, confidence, skill_gaps)
         
-        return {
-            "confidence_score": round(confidence, 2),
-            "match_percentage": f"{int(confidence * 100)}%",
-            "skill_gaps": skill_gaps,
-            "strengths": strengths,
-            "recommendation": recommendation,
-            "is_match": confidence >= config.CONFIDENCE_THRESHOLD
-        }
+        return self._match_result(confidence, skill_gaps, strengths, text)
     
     def generate_optimized_resume(
         self,
@@ -66,51 +182,118 @@ class InternHubAIAgent:
         Generate a resume optimized for the JD using prompt engineering
         Focuses on relevant skills, reframes experience
         """
-        prompt = f"""You are a resume optimization expert. 
-        
-Student Profile:
-- Name: {student.name}
-- Skills: {', '.join(student.skills)}
-- Interests: {', '.join(student.interests)}
-- Experience: {student.experience}
-- CGPA: {student.cgpa}
-
-Job Description:
-- Title: {job.title}
-- Company: {job.company}
-- Required Skills: {', '.join(job.required_skills)}
-- Preferred Skills: {', '.join(job.preferred_skills)}
-- Key Responsibilities: {', '.join(job.responsibilities[:3])}
-
-Task: Generate a concise, ATS-friendly resume tailored to this internship. 
-Focus on highlighting relevant skills and experiences. 
-Format as a professional resume snippet (under 300 words).
-Emphasize alignment with: {', '.join(job.required_skills[:3])}
-
-Resume:"""
+        prompt = self._build_resume_prompt(student, job)
         
         return self._call_llm(prompt)
     
+    def generate_optimized_resume_stream(
+        self,
+        student: StudentProfile,
+        job: InternshipJob
+    ) -> LLMStream:
+        """Stream the optimized resume as it is generated (see LLMStream)"""
+        return self._call_llm_stream(self._build_resume_prompt(student, job))
+    
     def calculate_ats_score(
         self,
         student: StudentProfile,
         job: InternshipJob,
-        resume_text: str = None
+        resume_text: str = None,
+        word_boundary: bool = False
     ) -> Dict:
         """
         Calculate ATS (Applicant Tracking System) score
         Checks keyword matches, formatting, relevance
+        word_boundary=True only counts keywords appearing as whole words
         """
         resume = resume_text or student.resume_text or ""
         
-        # Simple keyword matching for ATS
+        # Per-keyword scan over one lowercased copy of the resume
         all_keywords = set(job.required_skills + job.preferred_skills)
-        matched_keywords = set()
+        matched_keywords = get_job_matcher(job).find_keywords(
+            resume.lower(), word_boundary
+        )
         
-        for keyword in all_keywords:
-            if keyword.lower() in resume.lower():
-                matched_keywords.add(keyword)
+        return self._ats_result(all_keywords, matched_keywords)
+    
+    def bulk_ats(
+        self,
+        resume_text: str,
+        jobs: List[InternshipJob],
+        word_boundary: bool = False
+    ) -> List[Dict]:
+        """
+        Calculate ATS scores for one resume against many jobs
+        Builds one automaton over the union of all job keywords, scans the
+        resume once and derives each job's score from the shared hit set
+        """
+        automaton = KeywordAutomaton(
+            keyword.lower()
+            for job in jobs
+            for keyword in job.required_skills + job.preferred_skills
+        )
+        term_ids = {term: i for i, term in enumerate(automaton.patterns)}
+        found = automaton.find((resume_text or "").lower(), word_boundary)
         
+        results = []
+        for job in jobs:
+            all_keywords = set(job.required_skills + job.preferred_skills)
+            matched_keywords = {
+                keyword for keyword in all_keywords
+                if term_ids[keyword.lower()] in found
+            }
+            results.append(self._ats_result(all_keywords, matched_keywords))
+        return results
+
+    def match_matrix(
+        self,
+        students: List[StudentProfile],
+        jobs: List[InternshipJob]
+    ):
+        """
+        Score every student against every job in one vectorized pass
+        Returns a NumPy array of shape (len(students), len(jobs)) holding the
+        same values as _calculate_match_score for each pair
+        """
+        from match_matrix import build_match_matrix
+        return build_match_matrix(students, jobs)
+
+    async def analyze_match_async(
+        self,
+        student: StudentProfile,
+        job: InternshipJob
+    ) -> Dict:
+        """analyze_match with a non-blocking recommendation LLM call"""
+        confidence, skill_gaps, strengths = self._score_match(student, job)
+        recommendation = await self._call_llm_async(
+            self._build_recommendation_prompt(student, job, confidence, skill_gaps)
+        )
+        return self._match_result(confidence, skill_gaps, strengths, recommendation)
+    
+    async def generate_optimized_resume_async(
+        self,
+        student: StudentProfile,
+        job: InternshipJob
+    ) -> str:
+        """generate_optimized_resume with a non-blocking LLM call"""
+        return await self._call_llm_async(self._build_resume_prompt(student, job))
+    
+    async def analyze_batch_async(
+        self,
+        pairs: List[Tuple[StudentProfile, InternshipJob]]
+    ) -> List[Dict]:
+        """
+        Analyze many (student, job) pairs concurrently, results in input order
+        In-flight LLM requests are bounded by the async client's semaphore
+        """
+        return await asyncio.gather(
+            *(self.analyze_match_async(student, job) for student, job in pairs)
+        )
+    
+    # ==================== PRIVATE METHODS ====================
+    
+    def _ats_result(self, all_keywords: set, matched_keywords: set) -> Dict:
+        """Build the ATS result dict from keyword and match sets"""
         # ATS score: keyword match percentage
         ats_score = len(matched_keywords) / len(all_keywords) if all_keywords else 0
         
@@ -123,58 +306,53 @@ Resume:"""
             "matched_count": len(matched_keywords)
         }
     
-    # ==================== PRIVATE METHODS ====================
+    def _match_skills(
+        self,
+        student: StudentProfile,
+        job: InternshipJob
+    ) -> SkillMatch:
+        """Match student skills against the job's compiled skill matcher"""
+        return get_job_matcher(job).match(student.skills, student_skill_sets(student))
     
     def _calculate_match_score(
         self, 
         student: StudentProfile, 
-        job: InternshipJob
+        job: InternshipJob,
+        skill_match: Optional[SkillMatch] = None
     ) -> float:
         """
         Calculate match confidence score (0-1)
         Considers skill overlap, interest alignment, and CGPA
         """
         # Skill matching
-        student_skills_lower = [s.lower() for s in student.skills]
-        required_skill_matches = sum(
-            1 for req in job.required_skills 
-            if any(req.lower() in s for s in student_skills_lower)
-        )
-        preferred_skill_matches = sum(
-            1 for pref in job.preferred_skills 
-            if any(pref.lower() in s for s in student_skills_lower)
-        )
+        if skill_match is None:
+            skill_match = self._match_skills(student, job)
         
         # Score components
-        skill_coverage = (
-            required_skill_matches / len(job.required_skills) * 0.6 +
-            preferred_skill_matches / len(job.preferred_skills) * 0.3
-        ) if job.required_skills else 0
-        
-        # Interest alignment
-        interest_match = any(
-            interest.lower() in ' '.join(job.description).lower()
-            for interest in student.interests
+        coverage = scoring.skill_coverage(
+            skill_match.required_matches, len(job.required_skills),
+            skill_match.preferred_matches, len(job.preferred_skills)
         )
-        interest_score = 0.2 if interest_match else 0
         
-        # CGPA factor (3.0+ is good)
-        cgpa_score = min(student.cgpa / 4.0, 1.0) * 0.1
+        # Interest alignment + CGPA factor (3.0+ is good)
+        interest_match = scoring.interest_matches(student.interests, job)
         
-        total_score = min(skill_coverage + interest_score + cgpa_score, 1.0)
-        return total_score
+        return scoring.combine(coverage, interest_match, student.cgpa)
     
     def _analyze_skill_gaps(
         self,
         student: StudentProfile,
-        job: InternshipJob
+        job: InternshipJob,
+        skill_match: Optional[SkillMatch] = None
     ) -> List[Dict]:
         """Identify skill gaps between student and job requirements"""
-        student_skills_lower = [s.lower() for s in student.skills]
+        if skill_match is None:
+            skill_match = self._match_skills(student, job)
         gaps = []
         
-        for req_skill in job.required_skills[:config.MAX_SKILL_GAPS]:
-            has_skill = any(req_skill.lower() in s for s in student_skills_lower)
+        for req_skill, has_skill in zip(
+            job.required_skills[:config.MAX_SKILL_GAPS], skill_match.required_hits
+        ):
             if not has_skill:
                 gaps.append({
                     "skill": req_skill,
@@ -187,16 +365,16 @@ Resume:"""
     def _identify_strengths(
         self,
         student: StudentProfile,
-        job: InternshipJob
+        job: InternshipJob,
+        skill_match: Optional[SkillMatch] = None
     ) -> List[str]:
         """Identify matching strengths"""
-        student_skills_lower = [s.lower() for s in student.skills]
-        strengths = []
-        
-        for req_skill in job.required_skills[:3]:
-            for student_skill in student.skills:
-                if req_skill.lower() in student_skill.lower():
-                    strengths.append(f"Strong in {student_skill} (aligns with {req_skill})")
+        if skill_match is None:
+            skill_match = self._match_skills(student, job)
+        strengths = [
+            f"Strong in {student_skill} (aligns with {req_skill})"
+            for student_skill, req_skill in get_job_matcher(job).strengths(skill_match)
+        ]
         
         if student.cgpa >= 3.5:
             strengths.append("Excellent academic performance (CGPA ≥ 3.5)")
@@ -211,51 +389,143 @@ Resume:"""
         skill_gaps: List[Dict]
     ) -> str:
         """Generate personalized recommendation using prompt engineering"""
+        lap = metrics.stage_timer()
+        prompt = self._build_recommendation_prompt(
+            student, job, confidence, skill_gaps
+        )
         
-        prompt = f"""You are a career advisor for an internship platform.
-        
-Student: {student.name}
-Match Confidence: {confidence * 100:.0f}%
-Student Skills: {', '.join(student.skills)}
-Student Interests: {', '.join(student.interests)}
-
-Job: {job.title} at {job.company}
-Required: {', '.join(job.required_skills)}
-Skill Gaps: {', '.join(gap['skill'] for gap in skill_gaps)}
-
-Provide a 2-3 sentence personalized recommendation on whether this student should apply.
-Consider the match score and skill gaps. Be encouraging but honest.
-
-Recommendation:"""
-        
-        return self._call_llm(prompt)
+        text = self._call_llm(prompt)
+        lap("recommendation")
+        return text
+    
+    def _score_match(
+        self,
+        student: StudentProfile,
+        job: InternshipJob
+    ) -> Tuple[float, List[Dict], List[str]]:
+        """Confidence, skill gaps and strengths from one pass of the job's matcher"""
+        lap = metrics.stage_timer()
+        skill_match = self._match_skills(student, job)
+        lap("match_skills")
+        confidence = self._calculate_match_score(student, job, skill_match)
+        lap("score")
+        skill_gaps = self._analyze_skill_gaps(student, job, skill_match)
+        lap("gaps")
+        strengths = self._identify_strengths(student, job, skill_match)
+        lap("strengths")
+        return confidence, skill_gaps, strengths
+    
+    def _match_result(
+        self,
+        confidence: float,
+        skill_gaps: List[Dict],
+        strengths: List[str],
+        recommendation: Union[str, LazyRecommendation, None]
+    ) -> Dict:
+        """Assemble the analyze_match result dict"""
+        return {
+            "confidence_score": round(confidence, 2),
+            "match_percentage": f"{int(confidence * 100)}%",
+            "skill_gaps": skill_gaps,
+            "strengths": strengths,
+            "recommendation": recommendation,
+            "is_match": confidence >= config.CONFIDENCE_THRESHOLD
+        }
+    
+    def _build_resume_prompt(
+        self,
+        student: StudentProfile,
+        job: InternshipJob
+    ) -> str:
+        """Prompt for generate_optimized_resume (job-first, see prompts.py)"""
+        return RESUME_PROMPT.render(
+            job,
+            name=student.name,
+            skills=', '.join(student.skills),
+            interests=', '.join(student.interests),
+            experience=student.experience,
+            cgpa=student.cgpa
+        )
+    
+    def _build_recommendation_prompt(
+        self,
+        student: StudentProfile,
+        job: InternshipJob,
+        confidence: float,
+        skill_gaps: List[Dict]
+    ) -> str:
+        """Prompt for _generate_recommendation (job-first, see prompts.py)"""
+        return RECOMMENDATION_PROMPT.render(
+            job,
+            name=student.name,
+            confidence=f"{confidence * 100:.0f}",
+            skills=', '.join(student.skills),
+            interests=', '.join(student.interests),
+            skill_gaps=', '.join(gap['skill'] for gap in skill_gaps)
+        )
     
     def _categorize_skill(self, skill: str) -> str:
         """Categorize a skill (Programming, Tools, Domain, etc.)"""
-        programming_langs = ["python", "javascript", "java", "c++", "go", "rust"]
-        frameworks = ["react", "django", "flask", "spring", "vue", "angular"]
-        cloud = ["aws", "azure", "gcp", "google cloud"]
-        
-        skill_lower = skill.lower()
-        
-        if any(lang in skill_lower for lang in programming_langs):
-            return "Programming Language"
-        elif any(fw in skill_lower for fw in frameworks):
-            return "Framework/Library"
-        elif any(c in skill_lower for c in cloud):
-            return "Cloud Platform"
-        else:
-            return "Technical Skill"
+        return self.taxonomy.categorize(skill)
     
     def _call_llm(self, prompt: str) -> str:
         """
         Call LLM (real or mock) to generate text
         Supports OpenAI API or falls back to mock responses
         """
+        start = time.perf_counter()
         if self.use_mock:
-            return self._mock_llm_response(prompt)
+            text, source = self._mock_llm_response(prompt), "mock"
         else:
-            return self._call_openai(prompt)
+            text, source = self._call_openai_with_source(prompt)
+        metrics.LLM_CALL_SECONDS.observe_since(start, source)
+        return text
+    
+    def _call_llm_stream(self, prompt: str) -> LLMStream:
+        """Streaming counterpart of _call_llm, yielding text chunks as they arrive"""
+        stream = LLMStream()
+        stream._chunks = self._stream_chunks(prompt, stream)
+        return stream
+    
+    def _stream_chunks(self, prompt: str, stream: LLMStream) -> Iterator[str]:
+        """
+        Produce chunks for _call_llm_stream, falling back to mock on API errors
+        before the first chunk. A failure mid-stream is re-raised rather than
+        ending the stream as if the truncated text were complete.
+        """
+        if self.use_mock:
+            yield from self._mock_llm_stream(prompt)
+            return
+        
+        key = self._cache_key(prompt)
+        if key is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                stream.source = "cache"
+                yield cached
+                return
+        
+        stream.source = "real"
+        parts = []
+        try:
+            self.scheduler.acquire(estimate_tokens(prompt))
+            for chunk in self._request_completion_stream(prompt):
+                parts.append(chunk)
+                yield chunk
+        except Exception as e:
+            print(f"Error calling OpenAI: {e}")
+            if parts:
+                raise
+            stream.source = "fallback"
+            yield from self._mock_llm_stream(prompt)
+            return
+        
+        if key is not None:
+            self.cache.set(key, "".join(parts).strip())
+    
+    def _mock_llm_stream(self, prompt: str) -> Iterator[str]:
+        """Mock response split into word-sized chunks"""
+        yield from re.findall(r'\s*\S+|\s+$', self._mock_llm_response(prompt))
     
     def _mock_llm_response(self, prompt: str) -> str:
         """Generate mock LLM response based on prompt intent"""
@@ -290,29 +560,122 @@ Currently pursuing studies with focus on software development and computer scien
         return "Generated response based on the provided context and job description."
     
     def _call_openai(self, prompt: str) -> str:
-        """Call real OpenAI API"""
+        """Call real OpenAI API, serving repeat prompts from the response cache"""
+        return self._call_openai_with_source(prompt)[0]
+    
+    def _call_openai_with_source(self, prompt: str) -> Tuple[str, str]:
+        """
+        _call_openai plus where the text came from ("cache", "real", "coalesced"
+        or "fallback"). Concurrent callers with the same prompt key share one
+        request; on an API error each of them falls back to the mock. The
+        shared request waits for budget at the highest priority of its callers.
+        """
+        key = self._cache_key(prompt)
+        if key is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached, "cache"
+        
+        flight_key = key or LLMResponseCache.make_key(
+            prompt, config.MODEL_NAME, config.LLM_TEMPERATURE
+        )
+        request = RequestPriority()
         try:
-            response = self.openai.ChatCompletion.create(
-                model=config.MODEL_NAME,
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=300,
-                temperature=0.7
+            (text, source), shared = self.flights.do(
+                flight_key,
+                lambda: self._fetch_completion(prompt, key, request),
+                state=request,
+                on_join=lambda leader: leader.raise_to(request.priority)
             )
-            return response.choices[0].message.content.strip()
+        except Exception as e:
+            print(f"Error calling OpenAI: {e}")
+            return self._mock_llm_response(prompt), "fallback"
+        return text, "coalesced" if shared else source
+    
+    def _fetch_completion(
+        self,
+        prompt: str,
+        key: Optional[str],
+        priority: Optional[RequestPriority] = None
+    ) -> Tuple[str, str]:
+        """One upstream request for a single-flight leader (stores the response)"""
+        if key is not None:
+            # A flight for this key may have finished since our (counted) cache miss
+            cached = self.cache.peek(key)
+            if cached is not None:
+                return cached, "cache"
+        self.scheduler.acquire(estimate_tokens(prompt), priority)
+        text = self._request_completion(prompt)
+        if key is not None:
+            self.cache.set(key, text)
+        return text, "real"
+    
+    async def _call_llm_async(self, prompt: str) -> str:
+        """Async counterpart of _call_llm (shares the response cache)"""
+        if self.use_mock:
+            return self._mock_llm_response(prompt)
+        
+        key = self._cache_key(prompt)
+        if key is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+        
+        if self._async_client is None:
+            self._async_client = AsyncLLMClient()
+        try:
+            await asyncio.to_thread(self.scheduler.acquire, estimate_tokens(prompt))
+            text = await self._async_client.complete(prompt)
         except Exception as e:
             print(f"Error calling OpenAI: {e}")
             return self._mock_llm_response(prompt)
+        
+        if key is not None:
+            self.cache.set(key, text)
+        return text
+    
+    def _cache_key(self, prompt: str) -> Optional[str]:
+        """Response cache key for a prompt, or None when caching is off"""
+        if self.cache is None:
+            return None
+        return self.cache.make_key(prompt, config.MODEL_NAME, config.LLM_TEMPERATURE)
+    
+    def _request_completion(self, prompt: str) -> str:
+        """Send one chat completion request (raises on API errors)"""
+        response = self.openai.ChatCompletion.create(
+            model=config.MODEL_NAME,
+            messages=[{"role": "user", "content": prompt}],
+            max_tokens=config.LLM_MAX_TOKENS,
+            temperature=config.LLM_TEMPERATURE
+        )
+        return response.choices[0].message.content.strip()
+
+
+    def _request_completion_stream(self, prompt: str) -> Iterator[str]:
+        """Send one streaming chat completion request, yielding content deltas"""
+        response = self.openai.ChatCompletion.create(
+            model=config.MODEL_NAME,
+            messages=[{"role": "user", "content": prompt}],
+            max_tokens=config.LLM_MAX_TOKENS,
+            temperature=config.LLM_TEMPERATURE,
+            stream=True
+        )
+        for chunk in response:
+            content = chunk.choices[0].delta.get("content")
+            if content:
+                yield content
 
 
 # Convenience functions
 def analyze_internship_fit(
     student: StudentProfile,
     job: InternshipJob,
-    use_mock: bool = True
+    use_mock: bool = True,
+    recommendation: str = "eager"
 ) -> Dict:
     """Analyze internship fit for a student"""
     agent = InternHubAIAgent(use_mock=use_mock)
-    return agent.analyze_match(student, job)
+    return agent.analyze_match(student, job, recommendation)
 
 
 def generate_resume(
@@ -1,18 +1,67 @@
 """
 InternHub Flask API - Minimal web interface
 """
-from flask import Flask, request, jsonify
+from flask import Flask, Response, g, request, jsonify, stream_with_context
+from flask.json.provider import DefaultJSONProvider
 from student_profile import StudentProfile
 from internship_job import InternshipJob
-from ai_agent import (
-    InternHubAIAgent,
-    analyze_internship_fit,
-    generate_resume,
-    get_ats_score
-)
+from ai_agent import RECOMMENDATION_MODES, InternHubAIAgent, LazyRecommendation
+from match_index import StudentIndex
+from pipeline import run_full_analysis
+from store import InternHubStore
+from batch import BatchFormatError, iter_json_records, map_as_completed
+from llm_scheduler import BATCH, llm_priority
+from concurrent.futures import ThreadPoolExecutor
+import config
 import json
+import metrics
+import prompts
+import time
+
+
+class InternHubJSONProvider(DefaultJSONProvider):
+    """Resolves lazy recommendations when a response is serialized"""
+    
+    @staticmethod
+    def default(o):
+        if isinstance(o, LazyRecommendation):
+            return o.text
+        return DefaultJSONProvider.default(o)
+
 
 app = Flask(__name__)
+app.json = InternHubJSONProvider(app)
+
+# Candidate pool for recruiter-side ranking (filled via POST /students)
+student_pool = StudentIndex()
+
+# Long-lived agent shared by all endpoints (keeps caches warm across requests)
+agent = InternHubAIAgent(use_mock=True)
+
+# Persistent student/job store, opened on first use
+store = None
+
+# Worker pool for running independent analysis stages concurrently
+executor = ThreadPoolExecutor(max_workers=config.PIPELINE_WORKERS)
+
+# Separate pool for streamed batches so they can't starve interactive requests
+batch_executor = ThreadPoolExecutor(max_workers=config.BATCH_WORKERS)
+
+
+@app.before_request
+def _start_timer():
+    g.request_started = time.perf_counter()
+
+
+@app.after_request
+def _record_latency(response):
+    """Per-route latency histogram (streamed bodies are timed until headers)"""
+    if metrics.enabled() and 'request_started' in g:
+        route = request.url_rule.rule if request.url_rule else "unmatched"
+        metrics.HTTP_REQUEST_SECONDS.observe_since(
+            g.request_started, route, request.method, str(response.status_code)
+        )
+    return response
 
 
 @app.route('/', methods=['GET'])
@@ -23,10 +72,22 @@ def home():
         "version": "1.0",
         "description": "AI-powered internship matching and optimization platform",
         "endpoints": {
-            "POST /analyze": "Analyze internship fit (returns match score, gaps, recommendation)",
-            "POST /resume": "Generate optimized resume for a job",
-            "POST /ats": "Calculate ATS score",
-            "POST /full-analysis": "Run complete analysis (fit + resume + ATS)"
+            "POST /analyze": "Analyze internship fit (returns match score, gaps, recommendation; "
+                             "\"recommendation\": \"none\" for score-only)",
+            "POST /analyze/batch": "Analyze many pairs (NDJSON or JSON array), streams NDJSON results",
+            "POST /resume": "Generate optimized resume for a job (?stream=1 for SSE)",
+            "POST /ats": "Calculate ATS score (\"word_boundary\": true for whole-word keywords)",
+            "POST /ats/batch": "ATS scores for one resume against many jobs",
+            "POST /full-analysis": "Run complete analysis (fit + resume + ATS)",
+            "POST /students": "Add students to the candidate pool",
+            "POST /candidates": "Rank the best candidates in the pool for a job",
+            "POST /store/jobs": "Upsert job postings into the store",
+            "POST /store/students": "Upsert students into the store",
+            "POST /store/jobs/search": "Find stored jobs by skill, location and duration",
+            "POST /store/match": "Score a student against stored jobs matching the filters",
+            "GET /metrics": "Latency histograms in Prometheus text format",
+            "GET /prompts/stats": "Prompt renders and job-prefix reuse ratio per template",
+            "GET /llm/queue": "LLM rate-limit budgets, queue depth and wait times per priority"
         },
         "example_body": {
             "student": {
@@ -61,7 +122,9 @@ def analyze():
         student = StudentProfile.from_dict(data['student'])
         job = InternshipJob.from_dict(data['job'])
         
-        result = analyze_internship_fit(student, job, use_mock=True)
+        # "none" = score-only (no LLM call); also accepted as ?recommendation=
+        mode = data.get('recommendation', request.args.get('recommendation', 'eager'))
+        result = agent.analyze_match(student, job, mode)
         
         return jsonify({
             "status": "success",
@@ -75,16 +138,63 @@ def analyze():
         }), 400
 
 
+@app.route('/analyze/batch', methods=['POST'])
+def analyze_batch():
+    """
+    Analyze a batch of {"student", "job"} pairs
+    Accepts NDJSON or a JSON array; streams one NDJSON line per pair as soon
+    as it completes, tagged with the pair's input index
+    ?recommendation=none skips the LLM recommendation for every pair
+    LLM calls run at batch priority, behind interactive requests
+    """
+    mode = request.args.get('recommendation', 'eager')
+    if mode not in RECOMMENDATION_MODES:
+        return jsonify({
+            "status": "error",
+            "message": f"recommendation must be one of {RECOMMENDATION_MODES}"
+        }), 400
+    records = iter_json_records(request.stream)
+    
+    def analyze_record(index, record):
+        try:
+            student = StudentProfile.from_dict(record['student'])
+            job = InternshipJob.from_dict(record['job'])
+            # Lazy would only defer the LLM call to serialization, so resolve now
+            with llm_priority(BATCH):
+                result = agent.analyze_match(student, job, "eager" if mode == "lazy" else mode)
+            return {"index": index, "status": "success", "data": result}
+        except Exception as e:
+            return {"index": index, "status": "error", "message": str(e)}
+    
+    def generate():
+        try:
+            for result in map_as_completed(
+                analyze_record, records, batch_executor, config.BATCH_MAX_IN_FLIGHT
+            ):
+                yield json.dumps(result) + "\n"
+        except BatchFormatError as e:
+            yield json.dumps({"index": None, "status": "error", "message": str(e)}) + "\n"
+    
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+
 @app.route('/resume', methods=['POST'])
 def resume():
-    """Generate optimized resume"""
+    """
+    Generate optimized resume
+    With ?stream=1 (or Accept: text/event-stream) tokens are sent as
+    server-sent events as they arrive
+    """
     try:
         data = request.get_json()
         
         student = StudentProfile.from_dict(data['student'])
         job = InternshipJob.from_dict(data['job'])
         
-        optimized_resume = generate_resume(student, job, use_mock=True)
+        if _wants_stream():
+            return _stream_resume(student, job)
+        
+        optimized_resume = agent.generate_optimized_resume(student, job)
         
         return jsonify({
             "status": "success",
@@ -102,6 +212,42 @@ def resume():
         }), 400
 
 
+def _wants_stream() -> bool:
+    """True if the client asked for a server-sent event stream"""
+    if request.args.get('stream', '').lower() in ('1', 'true', 'yes'):
+        return True
+    return request.accept_mimetypes.best == 'text/event-stream'
+
+
+def _sse(event: str, payload: dict) -> str:
+    """Format one server-sent event"""
+    return f"event: {event}\ndata: {json.dumps(payload)}\n\n"
+
+
+def _stream_resume(student: StudentProfile, job: InternshipJob) -> Response:
+    """Stream resume tokens as SSE: token* then done (or error)"""
+    stream = agent.generate_optimized_resume_stream(student, job)
+    
+    def generate():
+        try:
+            for chunk in stream:
+                yield _sse("token", {"text": chunk})
+            yield _sse("done", {
+                "job": job.title,
+                "company": job.company,
+                "source": stream.source,
+                "ttft_ms": round((stream.ttft_seconds or 0) * 1000, 2)
+            })
+        except Exception as e:
+            yield _sse("error", {"message": str(e)})
+    
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @app.route('/ats', methods=['POST'])
 def ats():
     """Calculate ATS score"""
@@ -112,10 +258,10 @@ def ats():
         job = InternshipJob.from_dict(data['job'])
         resume_text = data.get('resume_text', '')
         
-        ats_result = get_ats_score(
+        ats_result = agent.calculate_ats_score(
             student, job, 
             resume_text if resume_text else None,
-            use_mock=True
+            word_boundary=bool(data.get('word_boundary', False))
         )
         
         return jsonify({
@@ -130,6 +276,35 @@ def ats():
         }), 400
 
 
+@app.route('/ats/batch', methods=['POST'])
+def ats_batch():
+    """Calculate ATS scores for one resume against many jobs"""
+    try:
+        data = request.get_json()
+        
+        jobs = [InternshipJob.from_dict(j) for j in data['jobs']]
+        resume_text = data.get('resume_text') or data.get('student', {}).get('resume_text', '')
+        
+        results = agent.bulk_ats(
+            resume_text, jobs,
+            word_boundary=bool(data.get('word_boundary', False))
+        )
+        
+        return jsonify({
+            "status": "success",
+            "data": [
+                {"job": job.title, "company": job.company, **result}
+                for job, result in zip(jobs, results)
+            ]
+        }), 200
+    
+    except Exception as e:
+        return jsonify({
+            "status": "error",
+            "message": str(e)
+        }), 400
+
+
 @app.route('/full-analysis', methods=['POST'])
 def full_analysis():
     """Run complete analysis"""
@@ -139,10 +314,11 @@ def full_analysis():
         student = StudentProfile.from_dict(data['student'])
         job = InternshipJob.from_dict(data['job'])
         
-        # Run all analyses
-        match_result = analyze_internship_fit(student, job, use_mock=True)
-        optimized_resume = generate_resume(student, job, use_mock=True)
-        ats_result = get_ats_score(student, job, optimized_resume, use_mock=True)
+        # Run all analyses (match || resume -> ATS)
+        stages = run_full_analysis(agent, student, job, executor)
+        match_result = stages["match"]
+        optimized_resume = stages["resume"]
+        ats_result = stages["ats"]
         
         return jsonify({
             "status": "success",
@@ -163,6 +339,230 @@ def full_analysis():
         }), 400
 
 
+@app.route('/students', methods=['POST'])
+def add_students():
+    """Add students to the candidate pool"""
+    try:
+        data = request.get_json()
+        
+        records = data['students'] if 'students' in data else [data['student']]
+        students = [StudentProfile.from_dict(record) for record in records]
+        for student in students:
+            student_pool.add(student)
+        
+        return jsonify({
+            "status": "success",
+            "data": {
+                "added": len(students),
+                "pool_size": len(student_pool)
+            }
+        }), 200
+    
+    except Exception as e:
+        return jsonify({
+            "status": "error",
+            "message": str(e)
+        }), 400
+
+
+@app.route('/candidates', methods=['POST'])
+def candidates():
+    """Rank the best candidates for a job"""
+    try:
+        data = request.get_json()
+        
+        job = InternshipJob.from_dict(data['job'])
+        n = int(data.get('n', 10))
+        
+        # Rank an ad-hoc pool if one is supplied, otherwise the shared pool
+        if 'students' in data:
+            pool = StudentIndex(StudentProfile.from_dict(s) for s in data['students'])
+        else:
+            pool = student_pool
+        
+        ranked = pool.rank_candidates(job, n)
+        
+        return jsonify({
+            "status": "success",
+            "data": {
+                "job": job.title,
+                "company": job.company,
+                "pool_size": len(pool),
+                "candidates": [
+                    {
+                        "name": student.name,
+                        "email": student.email,
+                        "confidence_score": round(score, 2),
+                        "match_percentage": f"{int(score * 100)}%",
+                        "is_match": score >= config.CONFIDENCE_THRESHOLD
+                    }
+                    for student, score in ranked
+                ]
+            }
+        }), 200
+    
+    except Exception as e:
+        return jsonify({
+            "status": "error",
+            "message": str(e)
+        }), 400
+
+
+def _get_store() -> InternHubStore:
+    global store
+    if store is None:
+        store = InternHubStore(config.STORE_PATH)
+    return store
+
+
+def _store_filters(data: dict) -> dict:
+    """find_jobs keyword arguments from a request body"""
+    filters = {}
+    if 'skills' in data:
+        filters['skills'] = data['skills']
+    for key in ('location', 'skill_kind'):
+        if key in data:
+            filters[key] = data[key]
+    for key in ('max_duration', 'min_duration', 'limit'):
+        if data.get(key) is not None:
+            filters[key] = int(data[key])
+    return filters
+
+
+@app.route('/store/jobs', methods=['POST'])
+def store_jobs():
+    """Upsert job postings (an optional "id" field is used as the key)"""
+    try:
+        data = request.get_json()
+        
+        records = data['jobs'] if 'jobs' in data else [data['job']]
+        items = []
+        for record in records:
+            record = dict(record)
+            key = record.pop('id', None)
+            items.append((str(key) if key is not None else None, InternshipJob.from_dict(record)))
+        keys = _get_store().upsert_jobs(items)
+        
+        return jsonify({
+            "status": "success",
+            "data": {
+                "upserted": keys,
+                **_get_store().counts()
+            }
+        }), 200
+    
+    except Exception as e:
+        return jsonify({
+            "status": "error",
+            "message": str(e)
+        }), 400
+
+
+@app.route('/store/students', methods=['POST'])
+def store_students():
+    """Upsert students (keyed by email)"""
+    try:
+        data = request.get_json()
+        
+        records = data['students'] if 'students' in data else [data['student']]
+        emails = _get_store().upsert_students(StudentProfile.from_dict(r) for r in records)
+        
+        return jsonify({
+            "status": "success",
+            "data": {
+                "upserted": emails,
+                **_get_store().counts()
+            }
+        }), 200
+    
+    except Exception as e:
+        return jsonify({
+            "status": "error",
+            "message": str(e)
+        }), 400
+
+
+@app.route('/store/jobs/search', methods=['POST'])
+def store_search():
+    """Find stored jobs by skills, location and duration"""
+    try:
+        data = request.get_json() or {}
+        
+        jobs = _get_store().find_jobs(**_store_filters(data))
+        
+        return jsonify({
+            "status": "success",
+            "data": {
+                "count": len(jobs),
+                "jobs": [{"id": key, **job.to_dict()} for key, job in jobs]
+            }
+        }), 200
+    
+    except Exception as e:
+        return jsonify({
+            "status": "error",
+            "message": str(e)
+        }), 400
+
+
+@app.route('/store/match', methods=['POST'])
+def store_match():
+    """Score a student (inline or stored, by email) against filtered stored jobs"""
+    try:
+        data = request.get_json()
+        
+        if 'student' in data:
+            student = StudentProfile.from_dict(data['student'])
+        else:
+            student = _get_store().get_student(data['email'])
+            if student is None:
+                raise KeyError(f"No stored student with email {data['email']!r}")
+        n = int(data.get('n', 10))
+        
+        matches = _get_store().match_student(
+            agent, student, n=n, recommendation=data.get('recommendation', 'eager'),
+            **_store_filters(data)
+        )
+        
+        return jsonify({
+            "status": "success",
+            "data": {
+                "student": student.email,
+                "matches": matches
+            }
+        }), 200
+    
+    except Exception as e:
+        return jsonify({
+            "status": "error",
+            "message": str(e)
+        }), 400
+
+
+@app.route('/metrics', methods=['GET'])
+def metrics_endpoint():
+    """Prometheus scrape endpoint"""
+    return Response(metrics.render(), content_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+@app.route('/prompts/stats', methods=['GET'])
+def prompt_stats():
+    """Per-template prompt renders and job-prefix reuse"""
+    return jsonify({
+        "status": "success",
+        "data": prompts.stats()
+    }), 200
+
+
+@app.route('/llm/queue', methods=['GET'])
+def llm_queue():
+    """LLM scheduler budgets, queue depth and wait-time stats"""
+    return jsonify({
+        "status": "success",
+        "data": agent.scheduler.stats()
+    }), 200
+
+
 @app.route('/health', methods=['GET'])
 def health():
     """Health check"""
@@ -0,0 +1,123 @@
+"""
+Async LLM Client
+Non-blocking chat completion client for batch workloads: bounded concurrency,
+per-call timeouts and retries with jittered exponential backoff
+"""
+import asyncio
+import random
+
+import config
+
+
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504}
+
+
+class LLMRequestError(Exception):
+    """Raised when a completion request fails after all retries"""
+
+
+class AsyncLLMClient:
+    """
+    Async OpenAI-compatible chat completion client (httpx)
+
+    Any server speaking the /chat/completions protocol works, which makes it
+    testable against a local stand-in via base_url. A client (its semaphore
+    and connection pool) belongs to the event loop that first uses it.
+    """
+
+    def __init__(
+        self,
+        api_key: str = config.OPENAI_API_KEY,
+        base_url: str = config.OPENAI_BASE_URL,
+        model: str = config.MODEL_NAME,
+        max_concurrency: int = config.LLM_MAX_CONCURRENCY,
+        timeout: float = config.LLM_TIMEOUT_SECONDS,
+        max_retries: int = config.LLM_MAX_RETRIES,
+        backoff_base: float = config.LLM_BACKOFF_BASE_SECONDS,
+        backoff_max: float = config.LLM_BACKOFF_MAX_SECONDS
+    ):
+        self.api_key = api_key
+        self.base_url = base_url.rstrip("/")
+        self.model = model
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._http = None
+        self.requests_sent = 0
+        self.retries = 0
+
+    async def __aenter__(self) -> "AsyncLLMClient":
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
+
+    async def aclose(self):
+        """Close the underlying HTTP connection pool"""
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+
+    async def complete(
+        self,
+        prompt: str,
+        max_tokens: int = config.LLM_MAX_TOKENS,
+        temperature: float = config.LLM_TEMPERATURE
+    ) -> str:
+        """Return the completion text for a single-message prompt"""
+        payload = {
+            "model": self.model,
+            "messages": [{"role": "user", "content": prompt}],
+            "max_tokens": max_tokens,
+            "temperature": temperature
+        }
+        async with self._semaphore:
+            data = await self._post_with_retry("/chat/completions", payload)
+        return data["choices"][0]["message"]["content"].strip()
+
+    async def _post_with_retry(self, path: str, payload: dict) -> dict:
+        """POST with retries on timeouts, transport errors and retryable statuses"""
+        import httpx
+
+        if self._http is None:
+            self._http = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers={"Authorization": f"Bearer {self.api_key}"},
+                timeout=httpx.Timeout(self.timeout)
+            )
+
+        last_error = None
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                self.retries += 1
+                await asyncio.sleep(self._backoff(attempt, last_error))
+            try:
+                self.requests_sent += 1
+                response = await self._http.post(path, json=payload)
+            except (httpx.TimeoutException, httpx.TransportError) as e:
+                last_error = e
+                continue
+            if response.status_code in RETRYABLE_STATUS:
+                last_error = response
+                continue
+            if response.status_code >= 400:
+                raise LLMRequestError(
+                    f"LLM request failed with HTTP {response.status_code}: {response.text[:200]}"
+                )
+            return response.json()
+
+        raise LLMRequestError(f"LLM request failed after {self.max_retries + 1} attempts: {last_error}")
+
+    def _backoff(self, attempt: int, last_error) -> float:
+        """Full-jitter exponential backoff, honoring Retry-After when sent"""
+        ceiling = min(self.backoff_max, self.backoff_base * (2 ** (attempt - 1)))
+        retry_after = getattr(last_error, "headers", {}).get("retry-after")
+        if retry_after:
+            try:
+                return min(float(retry_after), self.backoff_max)
+            except ValueError:
+                pass
+        return random.uniform(0, ceiling)
@@ -0,0 +1,152 @@
+"""
+Streaming Batch Helpers
+Lazy record parsing (NDJSON or JSON array) and bounded, completion-ordered
+execution so batch memory stays flat regardless of batch size
+"""
+import codecs
+import json
+from concurrent.futures import FIRST_COMPLETED, Executor, wait
+from typing import IO, Any, Callable, Dict, Iterable, Iterator, Tuple
+
+
+CHUNK_SIZE = 64 * 1024
+
+
+class BatchFormatError(ValueError):
+    """Raised when the batch body is not valid NDJSON or a JSON array"""
+
+
+def iter_json_records(stream: IO[bytes], chunk_size: int = CHUNK_SIZE) -> Iterator[Any]:
+    """
+    Yield records from a binary stream holding NDJSON or a single JSON array
+    Only the current chunk and the record being decoded are held in memory
+    """
+    buffer = ""
+    decoder = json.JSONDecoder()
+    chunks = _iter_text_chunks(stream, chunk_size)
+
+    # Sniff the format from the first non-whitespace character
+    for chunk in chunks:
+        buffer += chunk
+        if buffer.strip():
+            break
+    buffer = buffer.lstrip()
+    if not buffer:
+        return
+
+    if not buffer.startswith("["):
+        yield from _iter_ndjson(buffer, chunks)
+        return
+
+    pos = 1
+    expect_comma = False
+    while True:
+        # Skip whitespace/separators, pulling more data as needed
+        while True:
+            while pos < len(buffer) and buffer[pos] in " \t\r\n":
+                pos += 1
+            if pos < len(buffer):
+                break
+            chunk = next(chunks, None)
+            if chunk is None:
+                raise BatchFormatError("Unterminated JSON array")
+            buffer = buffer[pos:] + chunk
+            pos = 0
+
+        if buffer[pos] == "]":
+            return
+        if expect_comma:
+            if buffer[pos] != ",":
+                raise BatchFormatError(f"Expected ',' in JSON array, got {buffer[pos]!r}")
+            pos += 1
+            expect_comma = False
+            continue
+
+        try:
+            record, end = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            chunk = next(chunks, None)
+            if chunk is None:
+                raise BatchFormatError("Truncated or invalid JSON array element")
+            buffer = buffer[pos:] + chunk
+            pos = 0
+            continue
+        # A number at the buffer edge may continue in the next chunk
+        if end == len(buffer) and not isinstance(record, (dict, list, str)):
+            chunk = next(chunks, None)
+            if chunk is not None:
+                buffer = buffer[pos:] + chunk
+                pos = 0
+                continue
+        yield record
+        buffer = buffer[end:]
+        pos = 0
+        expect_comma = True
+
+
+def _iter_text_chunks(stream: IO[bytes], chunk_size: int) -> Iterator[str]:
+    """Decode a byte stream chunk by chunk (multi-byte characters may straddle chunks)"""
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    for chunk in iter(lambda: stream.read(chunk_size), b""):
+        text = decoder.decode(chunk)
+        if text:
+            yield text
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        yield tail
+
+
+def _iter_ndjson(buffer: str, chunks: Iterator[str]) -> Iterator[Any]:
+    """Yield one record per non-blank line"""
+    while True:
+        *lines, buffer = buffer.split("\n")
+        for line in lines:
+            if line.strip():
+                yield _decode_line(line)
+        chunk = next(chunks, None)
+        if chunk is None:
+            break
+        buffer += chunk
+    if buffer.strip():
+        yield _decode_line(buffer)
+
+
+def _decode_line(line: str) -> Any:
+    try:
+        return json.loads(line)
+    except json.JSONDecodeError as e:
+        raise BatchFormatError(f"Invalid NDJSON line: {e}")
+
+
+def map_as_completed(
+    fn: Callable[[int, Any], Dict],
+    items: Iterable[Any],
+    executor: Executor,
+    max_in_flight: int
+) -> Iterator[Dict]:
+    """
+    Apply fn(index, item) on the executor, yielding results as they complete
+    At most max_in_flight items are pulled from `items` and pending at a time.
+    If `items` itself raises, work already submitted is drained first.
+    """
+    items = enumerate(items)
+    in_flight = set()
+    exhausted = False
+    source_error = None
+    while True:
+        while not exhausted and len(in_flight) < max_in_flight:
+            try:
+                entry: Tuple[int, Any] = next(items, None)
+            except Exception as e:
+                source_error, entry = e, None
+            if entry is None:
+                exhausted = True
+                break
+            in_flight.add(executor.submit(fn, *entry))
+        if not in_flight:
+            if source_error is not None:
+                raise source_error
+            return
+        done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+        for future in done:
+            yield future.result()
@@ -0,0 +1,259 @@
+"""
+InternHub Benchmark Suite
+Times scoring, ATS and API paths on synthetic data and compares against a
+saved baseline
+Run: python benchmark.py -o bench.json [--baseline baseline.json]
+"""
+import argparse
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+from typing import Callable, Dict, List, Optional
+
+from student_profile import StudentProfile
+from internship_job import InternshipJob
+from ai_agent import InternHubAIAgent
+
+
+SKILL_POOL = [
+    "Python", "JavaScript", "TypeScript", "Java", "Go", "Rust", "C++", "SQL",
+    "React", "Vue", "Angular", "Node.js", "Flask", "Django", "FastAPI",
+    "Docker", "Kubernetes", "AWS", "GCP", "Azure", "Git", "CI/CD", "REST APIs",
+    "GraphQL", "PostgreSQL", "MongoDB", "Redis", "Machine Learning",
+    "TensorFlow", "PyTorch", "Pandas", "NumPy", "Linux", "Database Design"
+]
+INTEREST_POOL = ["Web Development", "AI", "Data Science", "Cloud", "APIs",
+                 "Open Source", "Security", "Mobile"]
+WORD_POOL = ["built", "scalable", "services", "team", "deployed", "designed",
+             "data", "pipelines", "web", "apps", "tested", "api", "cloud",
+             "users", "improved", "performance", "project", "internship"]
+
+DEFAULT_THRESHOLD = 0.20  # Fail when a median is >20% slower than baseline
+
+
+# ==================== SYNTHETIC DATA ====================
+
+def make_students(n: int, skills_per_profile: int = 6, seed: int = 0) -> List[StudentProfile]:
+    """Synthetic students drawing skills/interests from the shared pools"""
+    rng = random.Random(seed)
+    k = min(skills_per_profile, len(SKILL_POOL))
+    return [
+        StudentProfile(
+            name=f"Bench Student {i}",
+            email=f"bench{i}@example.com",
+            skills=rng.sample(SKILL_POOL, k),
+            interests=rng.sample(INTEREST_POOL, rng.randint(1, 3)),
+            experience=make_text(rng, 40),
+            cgpa=round(rng.uniform(2.0, 4.0), 2)
+        )
+        for i in range(n)
+    ]
+
+
+def make_jobs(n: int, skills_per_job: int = 5, seed: int = 1) -> List[InternshipJob]:
+    """Synthetic postings; required/preferred split roughly 60/40"""
+    rng = random.Random(seed)
+    k = min(skills_per_job, len(SKILL_POOL))
+    jobs = []
+    for i in range(n):
+        skills = rng.sample(SKILL_POOL, k)
+        split = max(1, round(k * 0.6))
+        jobs.append(InternshipJob(
+            title=f"Bench Intern {i}",
+            company=f"Company {i % 50}",
+            description=make_text(rng, 60),
+            required_skills=skills[:split],
+            preferred_skills=skills[split:],
+            responsibilities=["Build features", "Write tests", "Review code"],
+            duration_months=rng.randint(1, 6),
+            location=rng.choice(["Remote", "Bangalore, India", "Pune, India"])
+        ))
+    return jobs
+
+
+def make_text(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORD_POOL) for _ in range(words))
+
+
+def make_resume(words: int, seed: int = 2) -> str:
+    """Resume-like text of roughly `words` words with skills sprinkled in"""
+    rng = random.Random(seed)
+    pool = WORD_POOL * 3 + SKILL_POOL
+    return " ".join(rng.choice(pool) for _ in range(words))
+
+
+# ==================== TIMING ====================
+
+def time_op(fn: Callable[[], object], ops: int, repeats: int) -> Dict:
+    """
+    Run fn `ops` times per repeat; report per-op seconds for each repeat
+    (median is what baselines compare)
+    """
+    fn()  # Warm caches (compiled matchers, imports)
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for _ in range(ops):
+            fn()
+        samples.append((time.perf_counter() - start) / ops)
+    return {
+        "ops": ops,
+        "repeats": repeats,
+        "median_s": statistics.median(samples),
+        "min_s": min(samples),
+        "mean_s": statistics.fmean(samples)
+    }
+
+
+def run_suite(
+    students: int = 50,
+    jobs: int = 200,
+    skills_per_profile: int = 6,
+    resume_words: int = 400,
+    repeats: int = 5
+) -> Dict:
+    """Run every benchmark and return the JSON-serializable report"""
+    cohort = make_students(students, skills_per_profile)
+    catalog = make_jobs(jobs)
+    resume = make_resume(resume_words)
+    agent = InternHubAIAgent(use_mock=True)
+    pairs = [(s, j) for s in cohort for j in catalog]
+
+    def cycle(items):
+        state = {"i": 0}
+
+        def next_item():
+            item = items[state["i"] % len(items)]
+            state["i"] += 1
+            return item
+        return next_item
+
+    next_pair = cycle(pairs)
+    next_job = cycle(catalog)
+    n_pairs = min(len(pairs), 2000)
+
+    results = {
+        "match_score": time_op(lambda: agent._calculate_match_score(*next_pair()), n_pairs, repeats),
+        "ats_score": time_op(
+            lambda: agent.calculate_ats_score(cohort[0], next_job(), resume), min(jobs, 500), repeats
+        ),
+        "analyze_match_mock": time_op(lambda: agent.analyze_match(*next_pair()), min(n_pairs, 500), repeats),
+    }
+    results.update(_bench_routes(cohort, catalog, resume, repeats))
+
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "params": {
+                "students": students,
+                "jobs": jobs,
+                "skills_per_profile": skills_per_profile,
+                "resume_words": resume_words,
+                "repeats": repeats
+            }
+        },
+        "results": results
+    }
+
+
+def _bench_routes(cohort, catalog, resume, repeats) -> Dict:
+    """Flask routes through the test client (includes JSON encode/decode)"""
+    from app import app
+    client = app.test_client()
+    analyze_body = {"student": cohort[0].to_dict(), "job": catalog[0].to_dict()}
+    ats_body = dict(analyze_body, resume_text=resume)
+    batch_body = "\n".join(
+        json.dumps({"student": s.to_dict(), "job": catalog[i % len(catalog)].to_dict()})
+        for i, s in enumerate(cohort)
+    )
+
+    def post(path, **kwargs):
+        response = client.post(path, **kwargs)
+        response.get_data()
+        assert response.status_code == 200, f"{path} returned {response.status_code}"
+
+    return {
+        "route_analyze": time_op(lambda: post('/analyze', json=analyze_body), 50, repeats),
+        "route_ats": time_op(lambda: post('/ats', json=ats_body), 50, repeats),
+        "route_analyze_batch": time_op(
+            lambda: post('/analyze/batch', data=batch_body, content_type="application/x-ndjson"),
+            5, repeats
+        ),
+    }
+
+
+# ==================== BASELINES ====================
+
+def compare(report: Dict, baseline: Dict, threshold: float = DEFAULT_THRESHOLD) -> List[Dict]:
+    """
+    Per-benchmark ratio of current to baseline median; `regressed` is set when
+    the ratio exceeds 1 + threshold. Benchmarks missing from either side are skipped.
+    """
+    rows = []
+    for name, current in report["results"].items():
+        base = baseline.get("results", {}).get(name)
+        if base is None or not base["median_s"]:
+            continue
+        ratio = current["median_s"] / base["median_s"]
+        rows.append({
+            "name": name,
+            "baseline_s": base["median_s"],
+            "current_s": current["median_s"],
+            "ratio": ratio,
+            "regressed": ratio > 1 + threshold
+        })
+    return rows
+
+
+def _print_report(report: Dict, comparison: Optional[List[Dict]]):
+    by_name = {row["name"]: row for row in comparison or []}
+    print(f"{'benchmark':<22} {'median':>12} {'min':>12}  vs baseline")
+    for name, r in report["results"].items():
+        row = by_name.get(name)
+        delta = ""
+        if row:
+            delta = f"{(row['ratio'] - 1) * 100:+.1f}%" + ("  ❌ REGRESSION" if row["regressed"] else "")
+        print(f"{name:<22} {r['median_s'] * 1e6:>10.1f}µs {r['min_s'] * 1e6:>10.1f}µs  {delta}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="InternHub benchmark suite")
+    parser.add_argument("--students", type=int, default=50)
+    parser.add_argument("--jobs", type=int, default=200)
+    parser.add_argument("--skills-per-profile", type=int, default=6)
+    parser.add_argument("--resume-words", type=int, default=400)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--output", "-o", help="write the JSON report here")
+    parser.add_argument("--baseline", help="JSON report to compare against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed slowdown vs baseline median (default: 0.20)")
+    args = parser.parse_args(argv)
+
+    report = run_suite(args.students, args.jobs, args.skills_per_profile,
+                       args.resume_words, args.repeats)
+
+    comparison = None
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            comparison = compare(report, json.load(f), args.threshold)
+        report["comparison"] = {"threshold": args.threshold, "benchmarks": comparison}
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+    _print_report(report, comparison)
+    regressions = [row["name"] for row in comparison or [] if row["regressed"]]
+    if regressions:
+        print(f"\n❌ Regressions: {', '.join(regressions)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,107 @@
+"""
+Canonical Skill IDs
+Maps free-text skills to dense integer IDs through the skill taxonomy's names
+and aliases ("JS", "javascript" -> one ID), computed once per profile/posting
+so scorers compare ID sets instead of running substring tests per pair.
+Skills the taxonomy doesn't know match by token-phrase containment, the same
+rule interests use (a job's "Excel" is covered by a student's "Microsoft Excel"),
+for job skills of up to scoring.MAX_PHRASE_TOKENS tokens; longer ones must
+match a student skill's whole phrase.
+"""
+from typing import Dict, FrozenSet, List, Tuple
+
+from interning import StringInterner
+from scoring import MAX_PHRASE_TOKENS, normalize_phrase, tokenize
+from taxonomy import MAX_MEMO_ENTRIES, get_default_taxonomy
+
+
+# Canonical key -> dense int ID. Keys are taxonomy IDs ("python") or, for
+# skills the taxonomy doesn't know, "~" + the normalized phrase.
+CANONICAL_IDS = StringInterner()
+
+# Per-string memos, cleared when full (like SkillTaxonomy's)
+_job_ids: Dict[str, int] = {}
+_student_ids: Dict[str, FrozenSet[int]] = {}
+
+
+def canonical_key(skill: str) -> str:
+    """Canonical key of a skill as a requirement (its best taxonomy entry)"""
+    entry = get_default_taxonomy().resolve(skill)
+    return entry.id if entry is not None else "~" + normalize_phrase(skill)
+
+
+def student_keys(skill: str) -> List[str]:
+    """
+    Canonical keys a student's skill covers: every taxonomy entry it mentions
+    ("Python/Django" covers python and django), plus a phrase key for every
+    run of up to MAX_PHRASE_TOKENS consecutive tokens, so unknown job skills
+    contained in it match ("Data Structures and Algorithms" covers
+    "~data structures"), and one for the whole phrase.
+    Always includes canonical_key(skill).
+    """
+    keys = [entry.id for entry in get_default_taxonomy().matches(skill)]
+    tokens = tokenize(skill)
+    keys.extend(
+        "~" + " ".join(tokens[start:end])
+        for start in range(len(tokens))
+        for end in range(start + 1, min(start + MAX_PHRASE_TOKENS, len(tokens)) + 1)
+    )
+    if len(tokens) > MAX_PHRASE_TOKENS:
+        keys.append("~" + " ".join(tokens))
+    return keys or ["~"]
+
+
+def job_skill_id(skill: str) -> int:
+    """Integer ID of a job skill (memoized per string)"""
+    skill_id = _job_ids.get(skill)
+    if skill_id is None:
+        skill_id = CANONICAL_IDS.intern(canonical_key(skill))
+        if len(_job_ids) >= MAX_MEMO_ENTRIES:
+            _job_ids.clear()
+        _job_ids[skill] = skill_id
+    return skill_id
+
+
+def student_skill_ids(skill: str) -> FrozenSet[int]:
+    """Integer IDs a student skill covers (memoized per string)"""
+    ids = _student_ids.get(skill)
+    if ids is None:
+        ids = frozenset(CANONICAL_IDS.intern(key) for key in student_keys(skill))
+        if len(_student_ids) >= MAX_MEMO_ENTRIES:
+            _student_ids.clear()
+        _student_ids[skill] = ids
+    return ids
+
+
+def student_skill_sets(student) -> List[FrozenSet[int]]:
+    """
+    Per-skill ID sets for a student, computed at ingestion and cached on the
+    profile (recomputed only if the skills list changes)
+    """
+    skills = student.skills
+    cached = getattr(student, '_canonical_skills', None)
+    if cached is None or cached[0] != skills:
+        cached = (list(skills), [student_skill_ids(s) for s in skills])
+        student._canonical_skills = cached
+    return cached[1]
+
+
+def student_skill_union(student) -> FrozenSet[int]:
+    """Every ID the student covers"""
+    return frozenset().union(*student_skill_sets(student))
+
+
+def job_skill_ids(job) -> Tuple[List[int], List[int]]:
+    """
+    (required IDs, preferred IDs) for a posting, computed at ingestion and
+    cached on the job (recomputed only if a skill list changes)
+    """
+    required, preferred = job.required_skills, job.preferred_skills
+    cached = getattr(job, '_canonical_skills', None)
+    if cached is None or cached[0] != required or cached[1] != preferred:
+        cached = (
+            list(required), list(preferred),
+            [job_skill_id(s) for s in required], [job_skill_id(s) for s in preferred]
+        )
+        job._canonical_skills = cached
+    return cached[2], cached[3]
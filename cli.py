@@ -1,11 +1,18 @@
 """
 InternHub CLI - Command Line Interface for AI Matching
 """
+import argparse
 import json
+import os
 import sys
-from typing import Dict, Optional
+import threading
+import time
+from multiprocessing import Pool
+from typing import Dict, Iterator, Optional, Set, Tuple
 from student_profile import StudentProfile
 from internship_job import InternshipJob
+from store import InternHubStore
+from llm_scheduler import BATCH, llm_priority
 from ai_agent import (
     InternHubAIAgent,
     analyze_internship_fit,
@@ -17,8 +24,9 @@ from ai_agent import (
 class InternHubCLI:
     """Command-line interface for InternHub"""
     
-    def __init__(self):
+    def __init__(self, recommendation: str = "eager"):
         self.agent = InternHubAIAgent(use_mock=True)
+        self.recommendation = recommendation  # "none" = score-only fit analysis
     
     def run_interactive(self):
         """Run interactive mode"""
@@ -65,7 +73,8 @@ class InternHubCLI:
         job = self._input_internship_job()
         
         print("\n⏳ Analyzing fit...")
-        result = analyze_internship_fit(student, job, use_mock=True)
+        result = analyze_internship_fit(student, job, use_mock=True,
+                                        recommendation=self.recommendation)
         
         self._print_match_analysis(result)
     
@@ -253,8 +262,9 @@ class InternHubCLI:
             for gap in result['skill_gaps']:
                 print(f"  • {gap['skill']} ({gap['category']})")
         
-        print(f"\n📋 Recommendation:")
-        print(f"  {result['recommendation']}")
+        if 'recommendation' in result:
+            print(f"\n📋 Recommendation:")
+            print(f"  {result['recommendation']}")
     
     def _print_ats_score(self, ats: Dict):
         """Pretty print ATS score"""
@@ -272,23 +282,248 @@ class InternHubCLI:
                 print(f"  • {kw}")
 
 
+# ==================== BATCH MODE ====================
+
+BATCH_MODES = ("score", "ats", "full")
+_worker_agent: Optional[InternHubAIAgent] = None
+_worker_mode = "score"
+
+
+def _iter_jsonl(path: str) -> Iterator[Dict]:
+    """Lazily yield one record per non-blank line of a JSONL file"""
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def _batch_tasks(
+    args: argparse.Namespace,
+    done: Set[int]
+) -> Iterator[Tuple[int, Dict, Dict]]:
+    """
+    Yield (index, student_dict, job_dict) for every pair not yet in `done`
+    --batch crosses a streamed students file with the (in-memory) job catalog;
+    --pairs streams {"student", "job"} records
+    """
+    if args.pairs:
+        for index, record in enumerate(_iter_jsonl(args.pairs)):
+            if index not in done:
+                yield index, record['student'], record['job']
+        return
+    
+    students_path, jobs_path = args.batch
+    jobs = list(_iter_jsonl(jobs_path))
+    for s_idx, student in enumerate(_iter_jsonl(students_path)):
+        for j_idx, job in enumerate(jobs):
+            index = s_idx * len(jobs) + j_idx
+            if index not in done:
+                yield index, student, job
+
+
+def _load_checkpoint(output: str) -> Set[int]:
+    """
+    Indices already written to an output file from an interrupted run
+    A trailing partial line (crash mid-write) is truncated away
+    """
+    done = set()
+    if not os.path.exists(output):
+        return done
+    with open(output, 'rb+') as f:
+        data = f.read()
+        complete = data[:data.rfind(b"\n") + 1]
+        if len(complete) != len(data):
+            f.truncate(len(complete))
+    for line in complete.splitlines():
+        try:
+            done.add(json.loads(line)['index'])
+        except (ValueError, KeyError):
+            continue
+    return done
+
+
+def _init_batch_worker(mode: str):
+    """
+    Per-process agent so workers share nothing but the task queue
+    LLM budgets are shared with other workers and the server via LLM_BUDGET_PATH
+    """
+    global _worker_agent, _worker_mode
+    _worker_agent = InternHubAIAgent(use_mock=True)
+    _worker_mode = mode
+
+
+def _run_batch_task(task: Tuple[int, Dict, Dict]) -> str:
+    """Analyze one pair and return its JSONL output line"""
+    index, student_data, job_data = task
+    try:
+        student = StudentProfile.from_dict(student_data)
+        job = InternshipJob.from_dict(job_data)
+        result = {"index": index, "student": student.email, "job": job.title,
+                  "company": job.company, "status": "success"}
+        
+        if _worker_mode == "ats":
+            result["ats"] = _worker_agent.calculate_ats_score(student, job)
+        elif _worker_mode == "score":
+            result["match"] = _worker_agent.analyze_match(student, job, recommendation="none")
+        else:
+            # LLM calls wait behind interactive traffic for the rate-limit budget
+            with llm_priority(BATCH):
+                result["match"] = _worker_agent.analyze_match(student, job)
+                resume = _worker_agent.generate_optimized_resume(student, job)
+            result["optimized_resume"] = resume
+            result["ats"] = _worker_agent.calculate_ats_score(student, job, resume)
+    except Exception as e:
+        result = {"index": index, "status": "error", "message": str(e)}
+    return json.dumps(result)
+
+
+def _bounded(tasks: Iterator, slots: threading.Semaphore) -> Iterator:
+    """Hold back the task feeder so only a bounded number of tasks are queued"""
+    for task in tasks:
+        slots.acquire()
+        yield task
+
+
+def run_batch(args: argparse.Namespace) -> int:
+    """Run batch mode; returns the number of pairs processed in this run"""
+    done = _load_checkpoint(args.output) if args.resume else set()
+    if done:
+        print(f"↩️  Resuming: {len(done)} pairs already in {args.output}", file=sys.stderr)
+    
+    workers = max(1, args.workers)
+    chunksize = 16
+    slots = threading.Semaphore(workers * chunksize * 4)
+    tasks = _bounded(_batch_tasks(args, done), slots)
+    
+    processed = 0
+    start = last_report = time.perf_counter()
+    with open(args.output, 'a' if args.resume else 'w', encoding='utf-8') as out, \
+            Pool(workers, initializer=_init_batch_worker, initargs=(args.only,)) as pool:
+        for line in pool.imap_unordered(_run_batch_task, tasks, chunksize=chunksize):
+            out.write(line + "\n")
+            slots.release()
+            processed += 1
+            
+            now = time.perf_counter()
+            if now - last_report >= 0.5:
+                out.flush()
+                last_report = now
+                _print_progress(processed, now - start)
+    
+    _print_progress(processed, time.perf_counter() - start)
+    print(f"\n✅ Wrote {processed} results to {args.output}", file=sys.stderr)
+    return processed
+
+
+def _print_progress(processed: int, elapsed: float):
+    """One-line progress/throughput readout on stderr"""
+    rate = processed / elapsed if elapsed > 0 else 0.0
+    print(f"\r⏳ {processed} pairs | {rate:,.1f} pairs/s | {elapsed:.1f}s elapsed",
+          end="", file=sys.stderr, flush=True)
+
+
+# ==================== STORE MODE ====================
+
+def run_store(args: argparse.Namespace):
+    """Import JSONL files into the store and/or score a stored student against it"""
+    with InternHubStore(args.store) as store:
+        if args.import_jobs:
+            items = []
+            for record in _iter_jsonl(args.import_jobs):
+                key = record.pop('id', None)
+                items.append((str(key) if key is not None else None,
+                              InternshipJob.from_dict(record)))
+            print(f"📥 Upserted {len(store.upsert_jobs(items))} jobs")
+        if args.import_students:
+            students = (StudentProfile.from_dict(r) for r in _iter_jsonl(args.import_students))
+            print(f"📥 Upserted {len(store.upsert_students(students))} students")
+        
+        if args.match:
+            student = store.get_student(args.match)
+            if student is None:
+                print(f"❌ No stored student with email {args.match}", file=sys.stderr)
+                sys.exit(1)
+            matches = store.match_student(
+                InternHubAIAgent(use_mock=True), student, n=args.top,
+                recommendation="none" if args.score_only else "eager",
+                skills=args.skill, location=args.location, max_duration=args.max_duration
+            )
+            for match in matches:
+                analysis = match["analysis"]
+                print(f"{analysis['match_percentage']:>5}  {match['job']} @ {match['company']}"
+                      f"  [{match['job_key']}]")
+        
+        counts = store.counts()
+        print(f"🗄️  {args.store}: {counts['students']} students, {counts['jobs']} jobs")
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="InternHub CLI - interactive by default, or batch over JSONL files"
+    )
+    parser.add_argument("--quick-test", action="store_true",
+                        help="run a quick test with the example data")
+    parser.add_argument("--score-only", action="store_true",
+                        help="skip the LLM recommendation in fit analysis (quick test, "
+                             "interactive, --match)")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--batch", nargs=2, metavar=("STUDENTS", "JOBS"),
+                        help="score every student x job from two JSONL files")
+    source.add_argument("--pairs", metavar="PAIRS",
+                        help="score {student, job} records from a JSONL file")
+    parser.add_argument("--output", "-o", default="results.jsonl",
+                        help="JSONL output file (default: results.jsonl)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="worker processes (default: CPU count)")
+    parser.add_argument("--only", choices=BATCH_MODES, default="score",
+                        help="score (no LLM), ats, or full analysis (default: score)")
+    parser.add_argument("--resume", action="store_true",
+                        help="continue an interrupted run, skipping pairs already in --output")
+    
+    store = parser.add_argument_group("store mode")
+    store.add_argument("--store", metavar="DB",
+                       help="SQLite store to import into / score against")
+    store.add_argument("--import-jobs", metavar="JOBS",
+                       help="upsert jobs from a JSONL file (optional \"id\" field as key)")
+    store.add_argument("--import-students", metavar="STUDENTS",
+                       help="upsert students from a JSONL file")
+    store.add_argument("--match", metavar="EMAIL",
+                       help="rank stored jobs for the stored student with this email")
+    store.add_argument("--skill", action="append", default=[],
+                       help="only jobs requiring this skill (repeatable)")
+    store.add_argument("--location", help="only jobs in this location")
+    store.add_argument("--max-duration", type=int, metavar="MONTHS",
+                       help="only jobs lasting at most this many months")
+    store.add_argument("--top", type=int, default=10,
+                       help="number of matches to show (default: 10)")
+    return parser
+
+
 def main():
     """Main entry point"""
-    cli = InternHubCLI()
+    args = _build_parser().parse_args()
+    
+    if args.batch or args.pairs:
+        run_batch(args)
+        return
+    if args.store:
+        run_store(args)
+        return
     
-    if len(sys.argv) > 1:
+    cli = InternHubCLI(recommendation="none" if args.score_only else "eager")
+    
+    if args.quick_test:
         # Command-line argument mode
-        if sys.argv[1] == "--quick-test":
-            print("Running quick test with example data...")
-            from example_data.examples import get_example_student, get_example_job
-            student = get_example_student()
-            job = get_example_job()
-            
-            print(student.get_profile_summary())
-            print(job.get_jd_summary())
-            
-            result = analyze_internship_fit(student, job)
-            cli._print_match_analysis(result)
+        print("Running quick test with example data...")
+        from example_data.examples import get_example_student, get_example_job
+        student = get_example_student()
+        job = get_example_job()
+        
+        print(student.get_profile_summary())
+        print(job.get_jd_summary())
+        
+        result = analyze_internship_fit(student, job, recommendation=cli.recommendation)
+        cli._print_match_analysis(result)
     else:
         # Interactive mode
         cli.run_interactive()
@@ -10,7 +10,53 @@ load_dotenv()
 USE_MOCK_LLM = True  # Set to False to use real OpenAI API
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
 MODEL_NAME = "gpt-4"  # or "gpt-3.5-turbo"
+LLM_TEMPERATURE = 0.7
+LLM_MAX_TOKENS = 300
+OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL", "https://api.openai.com/v1")
+
+# Async LLM client (batch workloads)
+LLM_MAX_CONCURRENCY = 16  # Max requests in flight per client
+LLM_TIMEOUT_SECONDS = 30.0  # Per-call timeout
+LLM_MAX_RETRIES = 3  # Retries on timeouts, 429 and 5xx
+LLM_BACKOFF_BASE_SECONDS = 0.5  # Backoff ceiling doubles per retry (full jitter)
+LLM_BACKOFF_MAX_SECONDS = 8.0
+
+# LLM rate limits for upstream requests (0 = unlimited); batch traffic
+# waits behind interactive requests for the shared budget
+LLM_RPM_LIMIT = int(os.getenv("LLM_RPM_LIMIT", "0"))  # Requests per minute
+LLM_TPM_LIMIT = int(os.getenv("LLM_TPM_LIMIT", "0"))  # Prompt + completion tokens per minute
+# Share of each budget batch requests may draw down; the rest is held for interactive ones
+LLM_BATCH_BUDGET_FRACTION = float(os.getenv("LLM_BATCH_BUDGET_FRACTION", "0.5"))
+# Budget state shared by every process on this host (Flask server, CLI batch
+# workers); anchored to the package so runs from any directory share it
+LLM_BUDGET_PATH = os.getenv(
+    "LLM_BUDGET_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "llm_budget.sqlite3")
+)
+
+# LLM response cache (memory LRU + SQLite)
+LLM_CACHE_ENABLED = True
+LLM_CACHE_PATH = os.getenv(
+    "LLM_CACHE_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "llm_responses.sqlite3")
+)
+LLM_CACHE_TTL_SECONDS = 7 * 24 * 3600  # Responses older than this are refetched
+LLM_CACHE_MEMORY_ENTRIES = 1024  # In-memory LRU tier size
+LLM_CACHE_DISK_ENTRIES = 100_000  # SQLite tier size
+
+# Student / job store (SQLite)
+STORE_PATH = os.getenv("INTERNHUB_STORE_PATH", "internhub.sqlite3")
+
+# Skill taxonomy (canonical skill IDs and categories)
+SKILL_TAXONOMY_PATH = os.getenv(
+    "SKILL_TAXONOMY_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "skill_taxonomy.json")
+)
 
 # Application settings
 CONFIDENCE_THRESHOLD = 0.5  # Match confidence threshold (0-1)
 MAX_SKILL_GAPS = 5  # Max skill gaps to highlight
+PIPELINE_WORKERS = 8  # Threads for concurrent analysis stages in the API
+BATCH_WORKERS = 8  # Threads for POST /analyze/batch
+BATCH_MAX_IN_FLIGHT = 32  # Pairs read ahead of the slowest pending result
+METRICS_ENABLED = os.getenv("INTERNHUB_METRICS", "1") != "0"  # Latency histograms for /metrics
@@ -0,0 +1,78 @@
+"""
+String Interning & Text Packing
+Shared string -> small int tables and compact text storage for the compact
+StudentProfile / InternshipJob representations
+"""
+import json
+import threading
+import zlib
+from array import array
+from typing import Iterable, List
+
+
+COMPRESS_MIN_BYTES = 256  # Shorter texts are stored as plain UTF-8
+
+
+class StringInterner:
+    """Maps each distinct string to a dense int ID and back"""
+
+    def __init__(self):
+        self._ids = {}
+        self._strings: List[str] = []
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._strings)
+
+    def intern(self, value: str) -> int:
+        """ID for a string, assigning the next ID on first sight"""
+        string_id = self._ids.get(value)
+        if string_id is None:
+            with self._lock:
+                string_id = self._ids.get(value)
+                if string_id is None:
+                    string_id = len(self._strings)
+                    self._strings.append(value)
+                    self._ids[value] = string_id
+        return string_id
+
+    def intern_all(self, values: Iterable[str]) -> array:
+        """IDs for a list of strings as a compact unsigned int array"""
+        return array('I', [self.intern(v) for v in values])
+
+    def lookup(self, string_id: int) -> str:
+        return self._strings[string_id]
+
+    def lookup_all(self, ids: Iterable[int]) -> List[str]:
+        strings = self._strings
+        return [strings[i] for i in ids]
+
+
+# Process-wide tables shared by all compact records
+SKILLS = StringInterner()
+INTERESTS = StringInterner()
+
+
+def pack_text(text: str) -> bytes:
+    """Store text as UTF-8, zlib-compressed when long (prefix byte marks which)"""
+    raw = text.encode('utf-8')
+    if len(raw) >= COMPRESS_MIN_BYTES:
+        return b'z' + zlib.compress(raw)
+    return b'r' + raw
+
+
+def unpack_text(packed: bytes) -> str:
+    """Inverse of pack_text"""
+    if packed[:1] == b'z':
+        return zlib.decompress(packed[1:]).decode('utf-8')
+    return packed[1:].decode('utf-8')
+
+
+def pack_list(values: List[str]) -> bytes:
+    """Store a list of strings via pack_text"""
+    return pack_text(json.dumps(values, ensure_ascii=False))
+
+
+def unpack_list(packed: bytes) -> List[str]:
+    """Inverse of pack_list"""
+    return json.loads(unpack_text(packed))
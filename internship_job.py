@@ -4,6 +4,8 @@ Internship Job Description Data Model
 from typing import List, Dict
 from dataclasses import dataclass, asdict
 import json
+from interning import SKILLS, pack_text, unpack_text, pack_list, unpack_list
+from canonical_skills import job_skill_ids
 
 
 @dataclass
@@ -19,6 +21,10 @@ class InternshipJob:
     location: str  # Location (e.g., "Remote", "San Francisco")
     compensation: str = "Competitive"  # Stipend/salary info
     
+    def __post_init__(self):
+        """Resolve skills to canonical IDs once, at ingestion"""
+        job_skill_ids(self)
+    
     def to_dict(self) -> Dict:
         """Convert to dictionary"""
         return asdict(self)
@@ -56,3 +62,86 @@ Responsibilities:
 Full Description:
 {self.description}
 """
+
+
+class CompactInternshipJob:
+    """
+    Memory-lean InternshipJob for large in-memory catalogs
+    Uses __slots__, interned skill IDs (small int arrays) and packed text
+    fields (description, responsibilities) that are only decoded when accessed.
+    Field access, to_dict and to_json match InternshipJob.
+    """
+    __slots__ = ('title', 'company', 'required_skill_ids', 'preferred_skill_ids',
+                 'duration_months', 'location', 'compensation',
+                 '_description', '_responsibilities', '_skill_matcher', '_interest_terms',
+                 '_canonical_skills', '_prompt_prefixes')
+    
+    @property
+    def required_skills(self) -> List[str]:
+        return SKILLS.lookup_all(self.required_skill_ids)
+    
+    @property
+    def preferred_skills(self) -> List[str]:
+        return SKILLS.lookup_all(self.preferred_skill_ids)
+    
+    @property
+    def description(self) -> str:
+        return unpack_text(self._description)
+    
+    @property
+    def responsibilities(self) -> List[str]:
+        return unpack_list(self._responsibilities)
+    
+    def to_dict(self) -> Dict:
+        """Convert to dictionary (same shape as InternshipJob.to_dict)"""
+        return {
+            "title": self.title,
+            "company": self.company,
+            "description": self.description,
+            "required_skills": self.required_skills,
+            "preferred_skills": self.preferred_skills,
+            "responsibilities": self.responsibilities,
+            "duration_months": self.duration_months,
+            "location": self.location,
+            "compensation": self.compensation
+        }
+    
+    def to_json(self) -> str:
+        """Convert to JSON string"""
+        return json.dumps(self.to_dict(), indent=2)
+    
+    def to_job(self) -> InternshipJob:
+        """Materialize a regular InternshipJob"""
+        return InternshipJob(**self.to_dict())
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'CompactInternshipJob':
+        """Create from dictionary without going through __init__"""
+        obj = cls.__new__(cls)
+        obj.title = data['title']
+        obj.company = data['company']
+        obj.required_skill_ids = SKILLS.intern_all(data['required_skills'])
+        obj.preferred_skill_ids = SKILLS.intern_all(data['preferred_skills'])
+        obj.duration_months = data['duration_months']
+        obj.location = data['location']
+        obj.compensation = data.get('compensation', "Competitive")
+        obj._description = pack_text(data['description'])
+        obj._responsibilities = pack_list(data['responsibilities'])
+        obj._skill_matcher = None
+        obj._interest_terms = None
+        obj._canonical_skills = None
+        obj._prompt_prefixes = None
+        job_skill_ids(obj)
+        return obj
+    
+    @classmethod
+    def from_json(cls, json_str: str) -> 'CompactInternshipJob':
+        """Create from JSON string"""
+        return cls.from_dict(json.loads(json_str))
+    
+    @classmethod
+    def from_job(cls, job: InternshipJob) -> 'CompactInternshipJob':
+        """Compact an existing InternshipJob"""
+        return cls.from_dict(job.__dict__)
+    
+    get_jd_summary = InternshipJob.get_jd_summary
@@ -0,0 +1,166 @@
+"""
+Memory-Mapped Job Catalog
+Random access to postings in a JSONL catalog via a persisted byte-offset index;
+postings are only decoded when accessed
+"""
+import json
+import mmap
+import os
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from internship_job import InternshipJob, CompactInternshipJob
+
+
+INDEX_VERSION = 1
+
+
+class JobCatalog:
+    """
+    Read-only, lazily decoded view over a JSONL file of job postings
+
+    Each line is one InternshipJob dict plus an ID field (default "id"); lines
+    without one are keyed by their 0-based line number. The byte-offset index
+    is saved next to the catalog (<path>.idx) and rebuilt automatically when
+    the catalog file changes.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        id_field: str = "id",
+        index_path: Optional[str] = None,
+        compact: bool = False
+    ):
+        self.path = path
+        self.id_field = id_field
+        self.index_path = index_path or path + ".idx"
+        self.job_class = CompactInternshipJob if compact else InternshipJob
+
+        self._file = open(path, 'rb')
+        size = os.fstat(self._file.fileno()).st_size
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+
+        self.index_loaded_from_disk = False
+        self._offsets: Dict[str, Tuple[int, int]] = self._load_index()
+        if self._offsets is None:
+            self._offsets = self._build_index()
+            self._save_index()
+        else:
+            self.index_loaded_from_disk = True
+
+    # ---- Mapping-style access ----
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def __contains__(self, job_id: str) -> bool:
+        return job_id in self._offsets
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._offsets)
+
+    def __getitem__(self, job_id: str) -> InternshipJob:
+        offset, length = self._offsets[job_id]
+        return self._decode(self._map[offset:offset + length])
+
+    def get(self, job_id: str, default=None) -> Optional[InternshipJob]:
+        return self[job_id] if job_id in self._offsets else default
+
+    def ids(self) -> List[str]:
+        """All job IDs in file order"""
+        return list(self._offsets)
+
+    def get_many(self, job_ids: Iterable[str]) -> List[InternshipJob]:
+        """Decode only the requested postings"""
+        return [self[job_id] for job_id in job_ids]
+
+    def iter_jobs(
+        self,
+        start: int = 0,
+        stop: Optional[int] = None
+    ) -> Iterator[Tuple[str, InternshipJob]]:
+        """Lazily yield (id, job) for a slice of the catalog in file order"""
+        ids = self.ids()[start:stop]
+        for job_id in ids:
+            yield job_id, self[job_id]
+
+    # ---- Lifecycle ----
+
+    def close(self):
+        if isinstance(self._map, mmap.mmap):
+            self._map.close()
+        self._file.close()
+
+    def __enter__(self) -> "JobCatalog":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ---- Internals ----
+
+    def _decode(self, raw: bytes) -> InternshipJob:
+        data = json.loads(raw)
+        data.pop(self.id_field, None)
+        return self.job_class.from_dict(data)
+
+    def _build_index(self) -> Dict[str, Tuple[int, int]]:
+        """One sequential pass over the file recording (offset, length) per line"""
+        offsets: Dict[str, Tuple[int, int]] = {}
+        data = self._map
+        pos, line_no, size = 0, 0, len(data)
+        while pos < size:
+            end = data.find(b"\n", pos)
+            if end == -1:
+                end = size
+            line = data[pos:end]
+            if line.strip():
+                job_id = json.loads(line).get(self.id_field)
+                job_id = str(line_no) if job_id is None else str(job_id)
+                if job_id in offsets:
+                    raise ValueError(f"Duplicate job id {job_id!r} in {self.path}")
+                offsets[job_id] = (pos, end - pos)
+            pos = end + 1
+            line_no += 1
+        return offsets
+
+    def _fingerprint(self) -> Dict:
+        stat = os.stat(self.path)
+        return {
+            "version": INDEX_VERSION,
+            "id_field": self.id_field,
+            "source_size": stat.st_size,
+            "source_mtime_ns": stat.st_mtime_ns
+        }
+
+    def _load_index(self) -> Optional[Dict[str, Tuple[int, int]]]:
+        """Saved index, or None if missing or stale"""
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                saved = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if saved.get("fingerprint") != self._fingerprint():
+            return None
+        return {job_id: (offset, length) for job_id, offset, length in saved["entries"]}
+
+    def _save_index(self):
+        payload = {
+            "fingerprint": self._fingerprint(),
+            "entries": [[job_id, offset, length]
+                        for job_id, (offset, length) in self._offsets.items()]
+        }
+        tmp_path = self.index_path + ".tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(payload, f)
+            os.replace(tmp_path, self.index_path)
+        except OSError as e:
+            print(f"Warning: could not save catalog index {self.index_path}: {e}")
+
+
+def write_catalog(path: str, jobs: Iterable[Tuple[str, InternshipJob]], id_field: str = "id"):
+    """Write (id, job) pairs as a JSONL catalog"""
+    with open(path, 'w', encoding='utf-8') as f:
+        for job_id, job in jobs:
+            f.write(json.dumps({id_field: job_id, **job.to_dict()}, ensure_ascii=False) + "\n")
@@ -0,0 +1,107 @@
+"""
+Aho-Corasick Keyword Automaton
+Finds every occurrence of a fixed set of keywords in one pass over the text
+"""
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, Set, Tuple
+
+
+class KeywordAutomaton:
+    """
+    Multi-pattern substring matcher (Aho-Corasick)
+
+    Patterns are matched verbatim, so callers normalize (e.g. lowercase) both
+    patterns and text. Pattern ids are positions in `patterns`, duplicates
+    removed in first-seen order. The empty pattern matches every text.
+    """
+
+    def __init__(self, patterns: Iterable[str]):
+        self.patterns: List[str] = list(dict.fromkeys(patterns))
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[Tuple[int, ...]] = [()]
+        self._empty: Tuple[int, ...] = ()
+
+        for pattern_id, pattern in enumerate(self.patterns):
+            if not pattern:
+                self._empty = (pattern_id,)
+                continue
+            state = 0
+            for ch in pattern:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(())
+                state = nxt
+            self._out[state] += (pattern_id,)
+
+        self._build_failure_links()
+
+    def __len__(self) -> int:
+        return len(self.patterns)
+
+    def _build_failure_links(self):
+        """Breadth-first failure links, merging outputs along each link"""
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                link = self._goto[fallback].get(ch, 0)
+                self._fail[nxt] = link if link != nxt else 0
+                self._out[nxt] += self._out[self._fail[nxt]]
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int, int]]:
+        """Yield (pattern_id, start, end) for every non-empty pattern occurrence"""
+        goto, fail, out, patterns = self._goto, self._fail, self._out, self.patterns
+        state = 0
+        for end, ch in enumerate(text, 1):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for pattern_id in out[state]:
+                yield pattern_id, end - len(patterns[pattern_id]), end
+
+    def find(self, text: str, word_boundary: bool = False) -> Set[int]:
+        """
+        Return the ids of all patterns occurring in text
+        With word_boundary, a pattern edge that is a word character must not
+        touch another word character (like regex \\b), so "java" does not
+        match inside "javascript" but "c++" still matches "c++,"
+        """
+        if word_boundary:
+            found = set(self._empty)
+            for pattern_id, start, end in self.iter_matches(text):
+                if pattern_id not in found and _on_word_boundary(text, start, end):
+                    found.add(pattern_id)
+            return found
+
+        goto, fail, out = self._goto, self._fail, self._out
+        found = set(self._empty)
+        state = 0
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                found.update(out[state])
+        return found
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == '_'
+
+
+def _on_word_boundary(text: str, start: int, end: int) -> bool:
+    """True if text[start:end] is not glued to surrounding word characters"""
+    if _is_word_char(text[start]) and start > 0 and _is_word_char(text[start - 1]):
+        return False
+    if _is_word_char(text[end - 1]) and end < len(text) and _is_word_char(text[end]):
+        return False
+    return True
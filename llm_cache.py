@@ -0,0 +1,226 @@
+"""
+LLM Response Cache
+Content-addressed cache for LLM completions: an in-memory LRU tier in front
+of a SQLite tier that survives restarts
+"""
+import atexit
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+import config
+
+
+TOUCH_FLUSH_ENTRIES = 64  # Memory-tier hits buffered before their last_access is written
+
+
+class LLMResponseCache:
+    """
+    Two-tier response cache keyed on sha256(model, temperature, prompt)
+
+    - Memory tier: LRU, bounded by max_memory_entries
+    - Disk tier (optional): SQLite, bounded by max_disk_entries, evicting the
+      least recently used rows (memory-tier hits count as accesses; their
+      last_access updates are written in batches)
+    - Entries older than ttl_seconds are treated as misses and removed
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        ttl_seconds: float = config.LLM_CACHE_TTL_SECONDS,
+        max_memory_entries: int = config.LLM_CACHE_MEMORY_ENTRIES,
+        max_disk_entries: int = config.LLM_CACHE_DISK_ENTRIES
+    ):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_entries = max_disk_entries
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()  # key -> (response, expires_at)
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        self._db = None
+        self._disk_count = 0
+        self._touched: Dict[str, float] = {}  # key -> last memory-tier hit, not yet on disk
+        if path:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                """CREATE TABLE IF NOT EXISTS llm_cache (
+                    key TEXT PRIMARY KEY,
+                    response TEXT NOT NULL,
+                    expires_at REAL NOT NULL,
+                    last_access REAL NOT NULL
+                )"""
+            )
+            self._db.execute(
+                "CREATE INDEX IF NOT EXISTS idx_llm_cache_access ON llm_cache(last_access)"
+            )
+            self._db.commit()
+            self._disk_count = self._db.execute(
+                "SELECT COUNT(*) FROM llm_cache"
+            ).fetchone()[0]
+
+    @staticmethod
+    def make_key(prompt: str, model: str, temperature: float) -> str:
+        """Content address for a completion request"""
+        payload = json.dumps([model, temperature, prompt], ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response or None on a miss"""
+        return self._lookup(key, record=True)
+
+    def peek(self, key: str) -> Optional[str]:
+        """
+        get() without counting a hit or miss or refreshing recency, for
+        re-checking a key whose lookup already counted as a miss
+        """
+        return self._lookup(key, record=False)
+
+    def _lookup(self, key: str, record: bool) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                response, expires_at = entry
+                if expires_at > now:
+                    if not record:
+                        return response
+                    self._memory.move_to_end(key)
+                    self.memory_hits += 1
+                    if self._db is not None:
+                        self._touched[key] = now
+                        if len(self._touched) >= TOUCH_FLUSH_ENTRIES:
+                            self._flush_touches()
+                            self._db.commit()
+                    return response
+                del self._memory[key]
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT response, expires_at FROM llm_cache WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    response, expires_at = row
+                    if expires_at > now:
+                        if not record:
+                            return response
+                        self._db.execute(
+                            "UPDATE llm_cache SET last_access = ? WHERE key = ?", (now, key)
+                        )
+                        self._db.commit()
+                        self._remember(key, response, expires_at)
+                        self.disk_hits += 1
+                        return response
+                    self._db.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                    self._db.commit()
+                    self._disk_count -= 1
+
+            if record:
+                self.misses += 1
+            return None
+
+    def set(self, key: str, response: str):
+        """Store a response in both tiers"""
+        now = time.time()
+        expires_at = now + self.ttl_seconds
+        with self._lock:
+            self._remember(key, response, expires_at)
+            if self._db is None:
+                return
+            self._touched.pop(key, None)
+            existed = self._db.execute(
+                "SELECT 1 FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            self._db.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, response, expires_at, last_access) "
+                "VALUES (?, ?, ?, ?)",
+                (key, response, expires_at, now)
+            )
+            if not existed:
+                self._disk_count += 1
+            if self._disk_count > self.max_disk_entries:
+                self._evict_disk(now)
+            self._db.commit()
+
+    def clear(self):
+        """Drop all entries from both tiers"""
+        with self._lock:
+            self._memory.clear()
+            self._touched.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM llm_cache")
+                self._db.commit()
+                self._disk_count = 0
+
+    def stats(self) -> Dict:
+        """Hit/miss counters and tier sizes"""
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.memory_hits + self.disk_hits) / lookups, 4) if lookups else 0.0,
+            "memory_entries": len(self._memory),
+            "disk_entries": self._disk_count
+        }
+
+    def _remember(self, key: str, response: str, expires_at: float):
+        """Insert into the memory tier, evicting the least recently used entry"""
+        self._memory[key] = (response, expires_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def flush(self):
+        """Write buffered memory-tier access times to the disk tier"""
+        with self._lock:
+            if self._db is not None and self._touched:
+                self._flush_touches()
+                self._db.commit()
+
+    def _flush_touches(self):
+        self._db.executemany(
+            "UPDATE llm_cache SET last_access = ? WHERE key = ?",
+            [(at, key) for key, at in self._touched.items()]
+        )
+        self._touched.clear()
+
+    def _evict_disk(self, now: float):
+        """Drop expired rows, then the least recently used ones over the limit"""
+        self._flush_touches()
+        self._db.execute("DELETE FROM llm_cache WHERE expires_at <= ?", (now,))
+        self._disk_count = self._db.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+        excess = self._disk_count - self.max_disk_entries
+        if excess > 0:
+            self._db.execute(
+                "DELETE FROM llm_cache WHERE key IN "
+                "(SELECT key FROM llm_cache ORDER BY last_access LIMIT ?)",
+                (excess,)
+            )
+            self._disk_count -= excess
+
+
+_default_cache: Optional[LLMResponseCache] = None
+_default_lock = threading.Lock()
+
+
+def get_default_cache() -> LLMResponseCache:
+    """Process-wide cache shared by all agents"""
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = LLMResponseCache(path=config.LLM_CACHE_PATH)
+            atexit.register(_default_cache.flush)
+        return _default_cache
@@ -0,0 +1,311 @@
+"""
+LLM Rate Limiter and Priority Scheduler
+Token buckets for requests-per-minute and tokens-per-minute budgets in front
+of upstream LLM requests. Callers queue by priority: interactive requests are
+granted budget before any waiting batch request, FIFO within a priority.
+Batch requests may only draw each bucket down to a reserve, so interactive
+requests from another process sharing the budget file still find headroom.
+"""
+import contextlib
+import contextvars
+import heapq
+import itertools
+import os
+import sqlite3
+import threading
+import time
+from typing import Callable, Dict, Iterator, Optional, Union
+
+import config
+import metrics
+
+
+INTERACTIVE = "interactive"
+BATCH = "batch"
+PRIORITIES = (INTERACTIVE, BATCH)  # Served in this order
+
+_priority: contextvars.ContextVar = contextvars.ContextVar("llm_priority", default=INTERACTIVE)
+
+
+@contextlib.contextmanager
+def llm_priority(priority: str) -> Iterator[None]:
+    """Run the enclosed LLM calls (in this thread/context) at `priority`"""
+    if priority not in PRIORITIES:
+        raise ValueError(f"priority must be one of {PRIORITIES}")
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def current_priority() -> str:
+    return _priority.get()
+
+
+class RequestPriority:
+    """
+    Priority of one waiting request. It can be raised while the request is
+    queued, e.g. when an interactive caller joins a batch caller's flight.
+    """
+
+    def __init__(self, priority: Optional[str] = None):
+        priority = priority or current_priority()
+        if priority not in PRIORITIES:
+            raise ValueError(f"priority must be one of {PRIORITIES}")
+        self.priority = priority
+        self._scheduler: Optional["LLMScheduler"] = None  # set while queued
+
+    def raise_to(self, priority: str) -> bool:
+        """Adopt `priority` if it is served before the current one"""
+        if PRIORITIES.index(priority) >= PRIORITIES.index(self.priority):
+            return False
+        self.priority = priority
+        scheduler = self._scheduler
+        if scheduler is not None:
+            scheduler._wake()
+        return True
+
+
+def estimate_tokens(prompt: str) -> int:
+    """Budgeted tokens for one request: ~4 chars per prompt token plus the completion cap"""
+    return len(prompt) // 4 + config.LLM_MAX_TOKENS
+
+
+class TokenBucket:
+    """Continuously refilling bucket holding up to one minute of budget"""
+
+    def __init__(self, per_minute: float, clock: Callable[[], float] = time.monotonic):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0  # per second
+        self.tokens = self.capacity
+        self._clock = clock
+        self._updated = clock()
+
+    def wait_time(self, amount: float, reserve: float = 0.0) -> float:
+        """
+        Seconds until `amount` is available while leaving `reserve` (a fraction
+        of capacity) untouched; requests above that wait for a full bucket
+        """
+        self._refill()
+        floor = self.capacity * reserve
+        missing = min(amount, self.capacity - floor) + floor - self.tokens
+        return missing / self.rate if missing > 0 else 0.0
+
+    def take(self, amount: float):
+        """Consume `amount` (may go negative for oversized requests)"""
+        self._refill()
+        self.tokens -= amount
+
+    def _refill(self):
+        now = self._clock()
+        elapsed = max(0.0, now - self._updated)
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+        self._updated = now
+
+
+class MemoryBudget:
+    """Named token buckets private to this process"""
+
+    def __init__(self, limits: Dict[str, float], clock: Callable[[], float] = time.monotonic):
+        self._buckets = {name: TokenBucket(per_minute, clock) for name, per_minute in limits.items()}
+
+    def reserve(self, amounts: Dict[str, float], reserve: float = 0.0) -> float:
+        """Take every amount if all fit above the reserve (0.0), else the seconds to wait"""
+        delay = max(
+            (self._buckets[name].wait_time(amount, reserve) for name, amount in amounts.items()),
+            default=0.0
+        )
+        if delay <= 0:
+            for name, amount in amounts.items():
+                self._buckets[name].take(amount)
+        return delay
+
+
+class SharedBudget:
+    """
+    Named token buckets stored in a SQLite file, so every process opening the
+    same path (Flask server, CLI batch workers) draws from one budget. Each
+    check-and-take runs in one write transaction.
+    """
+
+    def __init__(self, path: str, limits: Dict[str, float], clock: Callable[[], float] = time.time):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.limits = dict(limits)
+        self._clock = clock
+        self._conn = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_budget ("
+            "name TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)"
+        )
+
+    def reserve(self, amounts: Dict[str, float], reserve: float = 0.0) -> float:
+        """Same contract as MemoryBudget.reserve, across processes"""
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            now = self._clock()
+            buckets = {}
+            for name in amounts:
+                bucket = TokenBucket(self.limits[name], clock=lambda: now)
+                row = self._conn.execute(
+                    "SELECT tokens, updated FROM llm_budget WHERE name = ?", (name,)
+                ).fetchone()
+                if row is not None:
+                    bucket.tokens, bucket._updated = row
+                buckets[name] = bucket
+            delay = max(
+                (bucket.wait_time(amounts[name], reserve) for name, bucket in buckets.items()),
+                default=0.0
+            )
+            if delay <= 0:
+                for name, bucket in buckets.items():
+                    bucket.take(amounts[name])
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO llm_budget (name, tokens, updated) VALUES (?, ?, ?)",
+                        (name, bucket.tokens, now)
+                    )
+            self._conn.execute("COMMIT")
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        return delay
+
+
+class LLMScheduler:
+    """
+    Grants upstream LLM requests within RPM/TPM budgets (0 = unlimited)
+
+    acquire() blocks until the caller is at the head of the priority queue and
+    both buckets can cover the request. Batch requests only draw on
+    `batch_fraction` of each bucket; the rest is held for interactive ones.
+    With `path`, the buckets live in a SQLite file shared by every process
+    using it (the queue itself is per process). Queue depth and wait times
+    per priority are exposed via stats() and the LLM queue-wait histogram.
+    """
+
+    def __init__(
+        self,
+        rpm: float = config.LLM_RPM_LIMIT,
+        tpm: float = config.LLM_TPM_LIMIT,
+        clock: Callable[[], float] = time.monotonic,
+        batch_fraction: float = config.LLM_BATCH_BUDGET_FRACTION,
+        path: Optional[str] = None
+    ):
+        if not 0 < batch_fraction <= 1:
+            raise ValueError("batch_fraction must be in (0, 1]")
+        self.rpm = rpm
+        self.tpm = tpm
+        self.batch_fraction = batch_fraction
+        self.path = path
+        self._limits = {name: per_minute for name, per_minute in (("requests", rpm), ("tokens", tpm))
+                        if per_minute > 0}
+        if path and self._limits:
+            self._budget = SharedBudget(path, self._limits)
+        else:
+            self._budget = MemoryBudget(self._limits, clock)
+        self._clock = clock
+        self._cond = threading.Condition()
+        self._queue = []  # heap of (priority rank, sequence)
+        self._seq = itertools.count()
+        self._stats = {p: {"granted": 0, "wait_total": 0.0, "wait_max": 0.0} for p in PRIORITIES}
+
+    def acquire(
+        self,
+        tokens: int = 0,
+        priority: Union[str, RequestPriority, None] = None
+    ) -> float:
+        """
+        Block until the request fits the budgets; returns the seconds waited.
+        A RequestPriority may be raised by another thread while this waits.
+        """
+        request = priority if isinstance(priority, RequestPriority) else RequestPriority(priority)
+        amounts = {name: amount for name, amount in (("requests", 1), ("tokens", tokens))
+                   if name in self._limits}
+        start = self._clock()
+        with self._cond:
+            entry = (PRIORITIES.index(request.priority), next(self._seq))
+            heapq.heappush(self._queue, entry)
+            request._scheduler = self
+            try:
+                while True:
+                    rank = PRIORITIES.index(request.priority)
+                    if rank != entry[0]:
+                        self._queue.remove(entry)
+                        entry = (rank, entry[1])
+                        self._queue.append(entry)
+                        heapq.heapify(self._queue)
+                    if self._queue[0] != entry:
+                        self._cond.wait()
+                        continue
+                    if not amounts:
+                        break
+                    reserve = 1 - self.batch_fraction if request.priority == BATCH else 0.0
+                    delay = self._budget.reserve(amounts, reserve)
+                    if delay <= 0:
+                        break
+                    self._cond.wait(delay)
+            finally:
+                request._scheduler = None
+                self._queue.remove(entry)
+                heapq.heapify(self._queue)
+                self._cond.notify_all()
+
+            priority = request.priority
+            waited = self._clock() - start
+            stats = self._stats[priority]
+            stats["granted"] += 1
+            stats["wait_total"] += waited
+            stats["wait_max"] = max(stats["wait_max"], waited)
+        metrics.LLM_QUEUE_SECONDS.observe(waited, priority)
+        return waited
+
+    def _wake(self):
+        """Re-check queue order (a waiting request's priority changed)"""
+        with self._cond:
+            self._cond.notify_all()
+
+    def queue_depth(self) -> Dict[str, int]:
+        """Waiting requests per priority"""
+        with self._cond:
+            depth = {p: 0 for p in PRIORITIES}
+            for rank, _ in self._queue:
+                depth[PRIORITIES[rank]] += 1
+            return depth
+
+    def stats(self) -> Dict:
+        """Budgets, queue depth and wait times per priority"""
+        depth = self.queue_depth()
+        with self._cond:
+            return {
+                "rpm_limit": self.rpm,
+                "tpm_limit": self.tpm,
+                "batch_fraction": self.batch_fraction,
+                "shared": isinstance(self._budget, SharedBudget),
+                "queue_depth": depth,
+                "priorities": {
+                    p: {
+                        "granted": s["granted"],
+                        "wait_mean_s": round(s["wait_total"] / s["granted"], 6) if s["granted"] else 0.0,
+                        "wait_max_s": round(s["wait_max"], 6),
+                    }
+                    for p, s in self._stats.items()
+                }
+            }
+
+
+_default_scheduler: Optional[LLMScheduler] = None
+_default_lock = threading.Lock()
+
+
+def get_default_scheduler() -> LLMScheduler:
+    """
+    Process-wide scheduler shared by all agents; its budgets (from config)
+    are also shared with other processes through LLM_BUDGET_PATH
+    """
+    global _default_scheduler
+    with _default_lock:
+        if _default_scheduler is None:
+            _default_scheduler = LLMScheduler(path=config.LLM_BUDGET_PATH)
+        return _default_scheduler
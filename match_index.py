@@ -0,0 +1,208 @@
+"""
+Inverted Skill Indexes
+Posting-list indexes over canonical skill IDs for top-K retrieval without
+scoring every job in the catalog
+"""
+import heapq
+import threading
+from typing import Callable, Dict, Iterable, List, Tuple
+
+from student_profile import StudentProfile
+from internship_job import InternshipJob
+import scoring
+from canonical_skills import job_skill_ids, student_skill_union
+
+
+def _bounded_top(
+    bounded: List[Tuple[float, int, float]],
+    k: int,
+    score: Callable[[int, float], float]
+) -> List[Tuple[int, float]]:
+    """
+    Top-k (position, score) from (-upper bound, position, coverage) candidates
+
+    Candidates are scored in bound order with a bounded min-heap; the scan
+    stops once the k-th best exact score beats the next bound. Ties keep the
+    lower position first.
+    """
+    bounded.sort()
+    best: List[Tuple[float, int]] = []  # min-heap of (score, -position)
+    for neg_bound, pos, coverage in bounded:
+        if len(best) == k and best[0][0] > -neg_bound:
+            break
+        entry = (score(pos, coverage), -pos)
+        if len(best) < k:
+            heapq.heappush(best, entry)
+        elif entry > best[0]:
+            heapq.heapreplace(best, entry)
+    return [(-neg_pos, s) for s, neg_pos in sorted(best, reverse=True)]
+
+
+class JobIndex:
+    """
+    Inverted index: canonical skill ID -> postings of jobs listing it
+
+    A job is a candidate for a student only if at least one of its required or
+    preferred skill IDs is covered by the student's skills (same rule as the
+    per-pair scorer). Jobs sharing no skill are never touched.
+    """
+
+    def __init__(self, jobs: Iterable[InternshipJob] = ()):
+        self.jobs: List[InternshipJob] = []
+        # canonical skill ID -> [(job position, required count, preferred count)]
+        self._postings: Dict[int, List[Tuple[int, int, int]]] = {}
+        self._terms: List[scoring.DescriptionTerms] = []  # interest phrase set per job
+        for job in jobs:
+            self.add(job)
+
+    def __len__(self) -> int:
+        return len(self.jobs)
+
+    def add(self, job: InternshipJob) -> int:
+        """Index a job and return its position"""
+        pos = len(self.jobs)
+        self.jobs.append(job)
+        self._terms.append(scoring.interest_terms(job))
+
+        required_ids, preferred_ids = job_skill_ids(job)
+        counts: Dict[int, List[int]] = {}
+        for skill_id in required_ids:
+            counts.setdefault(skill_id, [0, 0])[0] += 1
+        for skill_id in preferred_ids:
+            counts.setdefault(skill_id, [0, 0])[1] += 1
+
+        for skill_id, (required, preferred) in counts.items():
+            self._postings.setdefault(skill_id, []).append((pos, required, preferred))
+        return pos
+
+    def candidates(self, student: StudentProfile) -> Dict[int, List[int]]:
+        """
+        Map job position -> [required matches, preferred matches] for every job
+        sharing at least one skill with the student
+        """
+        hits: Dict[int, List[int]] = {}
+        for skill_id in student_skill_union(student):
+            for pos, required, preferred in self._postings.get(skill_id, ()):
+                counts = hits.setdefault(pos, [0, 0])
+                counts[0] += required
+                counts[1] += preferred
+        return hits
+
+    def top_k(
+        self,
+        student: StudentProfile,
+        k: int = 10
+    ) -> List[Tuple[InternshipJob, float]]:
+        """
+        Return up to k (job, confidence) pairs, best first
+
+        Skill coverage is exact from the posting lists, so each candidate's upper
+        bound is coverage + INTEREST_WEIGHT + the student's CGPA term. Candidates
+        are scored in bound order and the scan stops once the k-th best exact
+        score beats the next bound. Ties keep catalog order.
+        """
+        if k <= 0:
+            return []
+        cgpa = scoring.cgpa_component(student.cgpa)
+
+        bounded = []
+        for pos, (required, preferred) in self.candidates(student).items():
+            job = self.jobs[pos]
+            coverage = scoring.skill_coverage(
+                required, len(job.required_skills),
+                preferred, len(job.preferred_skills)
+            )
+            bound = min(coverage + scoring.INTEREST_WEIGHT + cgpa, 1.0)
+            bounded.append((-bound, pos, coverage))
+
+        def score(pos: int, coverage: float) -> float:
+            interest_match = scoring.interests_in_terms(
+                student.interests, self._terms[pos]
+            )
+            return scoring.combine(coverage, interest_match, student.cgpa)
+
+        return [(self.jobs[pos], s) for pos, s in _bounded_top(bounded, k, score)]
+
+
+class StudentIndex:
+    """
+    Inverted index: canonical skill ID -> postings of students covering it
+
+    The recruiter-side mirror of JobIndex. A student is posted under every ID
+    their skills cover, so each job skill ID is a single posting lookup.
+    """
+
+    def __init__(self, students: Iterable[StudentProfile] = ()):
+        self.students: List[StudentProfile] = []
+        self._postings: Dict[int, List[int]] = {}  # canonical skill ID -> student positions
+        self._lock = threading.Lock()  # The API's shared pool is added to from request threads
+        for student in students:
+            self.add(student)
+
+    def __len__(self) -> int:
+        return len(self.students)
+
+    def add(self, student: StudentProfile) -> int:
+        """Index a student and return their position"""
+        skill_ids = student_skill_union(student)
+        with self._lock:
+            pos = len(self.students)
+            self.students.append(student)
+            for skill_id in skill_ids:
+                self._postings.setdefault(skill_id, []).append(pos)
+        return pos
+
+    def candidates(self, job: InternshipJob) -> Dict[int, List[int]]:
+        """
+        Map student position -> [required matches, preferred matches] for every
+        student sharing at least one skill with the job
+        """
+        required_ids, preferred_ids = job_skill_ids(job)
+        per_skill: Dict[int, List[int]] = {}
+        for skill_id in required_ids:
+            per_skill.setdefault(skill_id, [0, 0])[0] += 1
+        for skill_id in preferred_ids:
+            per_skill.setdefault(skill_id, [0, 0])[1] += 1
+
+        hits: Dict[int, List[int]] = {}
+        with self._lock:
+            for skill_id, (required, preferred) in per_skill.items():
+                for pos in self._postings.get(skill_id, ()):
+                    counts = hits.setdefault(pos, [0, 0])
+                    counts[0] += required
+                    counts[1] += preferred
+        return hits
+
+    def rank_candidates(
+        self,
+        job: InternshipJob,
+        n: int = 10
+    ) -> List[Tuple[StudentProfile, float]]:
+        """
+        Return up to n (student, confidence) pairs, best first
+
+        Uses the same bound-ordered scan as JobIndex.top_k with a bounded heap,
+        so only students sharing a skill are visited and most of them are
+        never fully scored. Ties keep pool order.
+        """
+        if n <= 0:
+            return []
+        terms = scoring.interest_terms(job)
+        n_required = len(job.required_skills)
+        n_preferred = len(job.preferred_skills)
+
+        bounded = []
+        for pos, (required, preferred) in self.candidates(job).items():
+            coverage = scoring.skill_coverage(
+                required, n_required, preferred, n_preferred
+            )
+            cgpa = scoring.cgpa_component(self.students[pos].cgpa)
+            bound = min(coverage + scoring.INTEREST_WEIGHT + cgpa, 1.0)
+            bounded.append((-bound, pos, coverage))
+
+        def score(pos: int, coverage: float) -> float:
+            student = self.students[pos]
+            interest_match = scoring.interests_in_terms(student.interests, terms)
+            return scoring.combine(coverage, interest_match, student.cgpa)
+
+        return [(self.students[pos], s) for pos, s in _bounded_top(bounded, n, score)]
@@ -0,0 +1,166 @@
+"""
+Vectorized Match Matrix
+Scores a whole cohort x catalog grid with sparse incidence matrices instead of
+one (student, job) pair at a time. Produces exactly the same values as
+InternHubAIAgent._calculate_match_score.
+"""
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+
+from student_profile import StudentProfile
+from internship_job import InternshipJob
+import scoring
+from canonical_skills import job_skill_ids, student_skill_union
+
+
+DEFAULT_BLOCK_SIZE = 2048  # Students scored per block (bounds peak memory)
+
+# Compressed sparse rows: (indptr, column indices, values)
+CSR = Tuple[np.ndarray, np.ndarray, np.ndarray]
+
+
+def build_match_matrix(
+    students: Sequence[StudentProfile],
+    jobs: Sequence[InternshipJob],
+    block_size: int = DEFAULT_BLOCK_SIZE
+) -> np.ndarray:
+    """
+    Compute the (len(students), len(jobs)) matrix of match confidence scores.
+
+    Skills are encoded as sparse incidence matrices over the vocabulary of
+    canonical job skill IDs: S (students x vocab) marks which IDs each student
+    covers, R/P (vocab x jobs) count required/preferred occurrences per job,
+    so S @ R and S @ P give the match counts for every pair at once. Interests
+    work the same way against a sparse (interest x job) hit table. Only the
+    nonzeros are stored, so memory is the score matrix itself plus one
+    (block x jobs) working set, independent of the vocabulary size.
+    """
+    students = list(students)
+    jobs = list(jobs)
+    scores = np.zeros((len(students), len(jobs)))
+    if not students or not jobs:
+        return scores
+
+    # ---- Job side: skill vocabulary and required/preferred incidence ----
+    vocab: Dict[int, int] = {}  # canonical skill ID -> row
+    req_entries, pref_entries = [], []
+    for col, job in enumerate(jobs):
+        required_ids, preferred_ids = job_skill_ids(job)
+        for skill_id in required_ids:
+            req_entries.append((vocab.setdefault(skill_id, len(vocab)), col))
+        for skill_id in preferred_ids:
+            pref_entries.append((vocab.setdefault(skill_id, len(vocab)), col))
+
+    required = _csr(req_entries, len(vocab))
+    preferred = _csr(pref_entries, len(vocab))
+    n_required = np.array([len(job.required_skills) for job in jobs], dtype=float)
+    n_preferred = np.array([len(job.preferred_skills) for job in jobs], dtype=float)
+    has_required = n_required > 0
+    has_preferred = n_preferred > 0
+    n_required[~has_required] = 1.0
+    n_preferred[~has_preferred] = 1.0
+
+    # ---- Interest alignment: sparse unique interests x jobs hit table ----
+    interest_ids: Dict[str, int] = {}
+    for student in students:
+        for interest in student.interests:
+            interest_ids.setdefault(scoring.normalize_phrase(interest), len(interest_ids))
+    # Walk each job's phrase set once; only interests too long for the phrase
+    # sets fall back to a text scan per job
+    long_interests = [
+        (phrase, row) for phrase, row in interest_ids.items()
+        if phrase.count(" ") >= scoring.MAX_PHRASE_TOKENS
+    ]
+    hit_entries = []
+    for col, job in enumerate(jobs):
+        terms = scoring.interest_terms(job)
+        for phrase in terms.phrases:
+            row = interest_ids.get(phrase)
+            if row is not None:
+                hit_entries.append((row, col))
+        for phrase, row in long_interests:
+            if terms.contains(phrase):
+                hit_entries.append((row, col))
+    interest_hits = _csr(hit_entries, len(interest_ids))
+
+    cgpa = np.array(
+        [scoring.cgpa_component(student.cgpa) for student in students]
+    )
+
+    # ---- Student side, one block at a time ----
+    for start in range(0, len(students), block_size):
+        block = students[start:start + block_size]
+        covered: List[Tuple[int, int]] = []  # (row, vocab row)
+        interested: List[Tuple[int, int]] = []  # (row, interest row)
+        for row, student in enumerate(block):
+            covered.extend(
+                (row, vocab[i]) for i in student_skill_union(student) if i in vocab
+            )
+            interested.extend(
+                (row, interest_ids[phrase])
+                for phrase in {scoring.normalize_phrase(i) for i in student.interests}
+            )
+
+        req_matches = _sparse_product(covered, required, len(block), len(jobs))
+        pref_matches = _sparse_product(covered, preferred, len(block), len(jobs))
+
+        # Same operation order as scoring.skill_coverage for bit-identical floats
+        pref_term = np.where(
+            has_preferred,
+            pref_matches / n_preferred * scoring.PREFERRED_WEIGHT,
+            0.0
+        )
+        coverage = np.where(
+            has_required,
+            req_matches / n_required * scoring.REQUIRED_WEIGHT + pref_term,
+            0.0
+        )
+        interest_score = np.where(
+            _sparse_product(interested, interest_hits, len(block), len(jobs)) > 0,
+            scoring.INTEREST_WEIGHT, 0.0
+        )
+
+        block_cgpa = cgpa[start:start + len(block), None]
+        scores[start:start + len(block)] = np.minimum(
+            coverage + interest_score + block_cgpa, 1.0
+        )
+
+    return scores
+
+
+def _csr(entries: Iterable[Tuple[int, int]], n_rows: int) -> CSR:
+    """Sparse count matrix from (row, col) entries (duplicates add up)"""
+    entries = sorted(entries)
+    if not entries:
+        return np.zeros(n_rows + 1, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0)
+    rows, cols = (np.array(a, dtype=np.int64) for a in zip(*entries))
+    indptr = np.zeros(n_rows + 1, dtype=np.int64)
+    np.add.at(indptr, rows + 1, 1)
+    return np.cumsum(indptr), cols, np.ones(len(cols))
+
+
+def _sparse_product(
+    pairs: List[Tuple[int, int]],
+    matrix: CSR,
+    n_rows: int,
+    n_cols: int
+) -> np.ndarray:
+    """
+    Dense (n_rows, n_cols) product of the 0/1 matrix with nonzeros at `pairs`
+    and a CSR matrix: every (row, k) pair adds matrix row k to output row `row`
+    """
+    out = np.zeros(n_rows * n_cols)
+    if not pairs:
+        return out.reshape(n_rows, n_cols)
+    indptr, cols, data = matrix
+    rows, keys = (np.array(a, dtype=np.int64) for a in zip(*pairs))
+    starts, lengths = indptr[keys], indptr[keys + 1] - indptr[keys]
+    total = int(lengths.sum())
+    if total:
+        # Positions of every nonzero in the selected matrix rows, in pair order
+        offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+        nz = offsets + np.arange(total)
+        flat = np.repeat(rows, lengths) * n_cols + cols[nz]
+        out += np.bincount(flat, weights=data[nz], minlength=n_rows * n_cols)
+    return out.reshape(n_rows, n_cols)
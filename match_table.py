@@ -0,0 +1,263 @@
+"""
+Incremental Materialized Match Table
+Keeps analyze_match scores for every student x job pair and, on updates,
+recomputes only the rows whose inputs actually changed
+"""
+import threading
+from collections import OrderedDict
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from student_profile import StudentProfile
+from internship_job import InternshipJob
+from store import job_key
+import config
+
+
+# Fields the score-only part of analyze_match reads; anything else (name,
+# experience, title, location, ...) can change without invalidating a score
+STUDENT_SCORE_FIELDS = ("skills", "interests", "cgpa")
+JOB_SCORE_FIELDS = ("required_skills", "preferred_skills", "description")
+
+RowKey = Tuple[str, str]  # (student email, job key)
+
+
+def row_dependencies(student: StudentProfile, job: InternshipJob) -> FrozenSet[str]:
+    """
+    Qualified fields ("student.skills", "job.description", ...) one row's score
+    depends on. The description only feeds interest alignment, so rows for
+    students without interests don't depend on it.
+    """
+    deps = {f"student.{field}" for field in STUDENT_SCORE_FIELDS}
+    deps.update(f"job.{field}" for field in JOB_SCORE_FIELDS if field != "description")
+    if student.interests:
+        deps.add("job.description")
+    return frozenset(deps)
+
+
+def score_snapshot(record, fields: Iterable[str]) -> Dict[str, object]:
+    """Copy of a record's score fields (lists copied, so in-place edits are detected)"""
+    return {
+        field: list(value) if isinstance(value, list) else value
+        for field, value in ((field, getattr(record, field)) for field in fields)
+    }
+
+
+def changed_fields(prefix: str, snapshot: Dict[str, object], new) -> FrozenSet[str]:
+    """Qualified names of the score fields that differ from a snapshot"""
+    return frozenset(
+        f"{prefix}.{field}" for field, value in snapshot.items()
+        if getattr(new, field) != value
+    )
+
+
+class MatchTable:
+    """
+    Materialized {(student email, job key): score-only analyze_match result}
+
+    Updates are diffed against a snapshot of the score fields taken at the
+    previous upsert (so re-upserting an object edited in place works) and
+    mark affected rows dirty; dirty rows are rescored by
+    process_pending() or by the background worker (start()/stop()). Rows keep
+    their last score until rescored. A row whose rescore raises is removed and
+    its error kept in `errors` until a later update rescores it successfully.
+    set_threshold() re-flags is_match from the stored confidences without
+    rescoring anything.
+    """
+
+    def __init__(self, agent, threshold: Optional[float] = None):
+        self.agent = agent
+        self.threshold = config.CONFIDENCE_THRESHOLD if threshold is None else threshold
+        self.students: Dict[str, StudentProfile] = {}
+        self.jobs: Dict[str, InternshipJob] = {}
+        self.rows: Dict[RowKey, Dict] = {}
+        self.rows_scored = 0  # Total rescoring work done, for monitoring
+        self.errors: Dict[RowKey, str] = {}  # Rows whose last rescore failed
+
+        self._deps: Dict[RowKey, FrozenSet[str]] = {}
+        self._student_fields: Dict[str, Dict[str, object]] = {}  # score_snapshot per email
+        self._job_fields: Dict[str, Dict[str, object]] = {}  # score_snapshot per job key
+        self._dirty: "OrderedDict[RowKey, None]" = OrderedDict()
+        self._in_progress = 0
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+        self._worker: Optional[threading.Thread] = None
+        self._stopping = False
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    # ==================== UPDATES ====================
+
+    def upsert_student(self, student: StudentProfile) -> int:
+        """Add or update a student; returns the number of rows marked dirty"""
+        key = student.email
+        with self._lock:
+            old = self._student_fields.get(key)
+            self.students[key] = student
+            self._student_fields[key] = score_snapshot(student, STUDENT_SCORE_FIELDS)
+            if old is None:
+                return self._mark(((key, j) for j in self.jobs), None)
+            changed = changed_fields("student", old, student)
+            return self._mark(((key, j) for j in self.jobs), changed)
+
+    def upsert_job(self, job: InternshipJob, key: Optional[str] = None) -> int:
+        """Add or update a job (keyed like the store); returns rows marked dirty"""
+        key = key or job_key(job)
+        with self._lock:
+            old = self._job_fields.get(key)
+            self.jobs[key] = job
+            self._job_fields[key] = score_snapshot(job, JOB_SCORE_FIELDS)
+            if old is None:
+                return self._mark(((s, key) for s in self.students), None)
+            changed = changed_fields("job", old, job)
+            return self._mark(((s, key) for s in self.students), changed)
+
+    def remove_student(self, email: str):
+        with self._lock:
+            self.students.pop(email, None)
+            self._student_fields.pop(email, None)
+            self._drop(row for row in self.rows if row[0] == email)
+
+    def remove_job(self, key: str):
+        with self._lock:
+            self.jobs.pop(key, None)
+            self._job_fields.pop(key, None)
+            self._drop(row for row in self.rows if row[1] == key)
+
+    def set_threshold(self, threshold: float):
+        """Change the match threshold and re-flag is_match from stored scores"""
+        with self._lock:
+            self.threshold = threshold
+            for row in self.rows.values():
+                row["is_match"] = row["_confidence"] >= threshold
+
+    # ==================== READS ====================
+
+    def get(self, email: str, key: str) -> Optional[Dict]:
+        """Stored result for one pair (None until first scored)"""
+        with self._lock:
+            row = self.rows.get((email, key))
+            return self._public(row) if row else None
+
+    def matches_for_student(self, email: str) -> List[Tuple[str, Dict]]:
+        """(job key, result) for the student's matching rows, best first"""
+        with self._lock:
+            rows = [(k[1], r) for k, r in self.rows.items() if k[0] == email and r["is_match"]]
+        rows.sort(key=lambda item: -item[1]["_confidence"])
+        return [(key, self._public(row)) for key, row in rows]
+
+    @property
+    def pending(self) -> int:
+        """Rows waiting to be (re)scored"""
+        with self._lock:
+            return len(self._dirty) + self._in_progress
+
+    # ==================== PROCESSING ====================
+
+    def process_pending(self, limit: Optional[int] = None) -> int:
+        """Rescore dirty rows in the calling thread; returns rows rescored"""
+        done = 0
+        while limit is None or done < limit:
+            if not self._process_one():
+                break
+            done += 1
+        return done
+
+    def start(self):
+        """Rescore dirty rows on a background thread as they appear"""
+        with self._lock:
+            if self._worker is not None:
+                return
+            self._stopping = False
+            self._worker = threading.Thread(target=self._run_worker, daemon=True)
+            self._worker.start()
+
+    def stop(self):
+        with self._changed:
+            self._stopping = True
+            self._changed.notify_all()
+            worker, self._worker = self._worker, None
+        if worker is not None:
+            worker.join()
+
+    def wait_until_clean(self, timeout: Optional[float] = None) -> bool:
+        """Block until the dirty queue is empty (background worker mode)"""
+        with self._changed:
+            return self._changed.wait_for(
+                lambda: not self._dirty and not self._in_progress, timeout
+            )
+
+    # ==================== INTERNALS ====================
+
+    def _mark(self, rows: Iterable[RowKey], changed: Optional[FrozenSet[str]]) -> int:
+        """Queue rows whose dependencies intersect `changed` (None = all rows)"""
+        marked = 0
+        for row in rows:
+            deps = self._deps.get(row)
+            if changed is None or deps is None or deps & changed:
+                self._dirty[row] = None
+                marked += 1
+        if marked:
+            self._changed.notify_all()
+        return marked
+
+    def _drop(self, rows: Iterable[RowKey]):
+        for row in list(rows):
+            self.rows.pop(row, None)
+            self._deps.pop(row, None)
+        for row in [r for r in self._dirty if r[0] not in self.students or r[1] not in self.jobs]:
+            del self._dirty[row]
+        for row in [r for r in self.errors if r[0] not in self.students or r[1] not in self.jobs]:
+            del self.errors[row]
+        self._changed.notify_all()
+
+    def _process_one(self) -> bool:
+        with self._lock:
+            if not self._dirty:
+                return False
+            row_key, _ = self._dirty.popitem(last=False)
+            self._in_progress += 1
+            student = self.students[row_key[0]]
+            job = self.jobs[row_key[1]]
+
+        row, error = None, None
+        try:
+            # Score outside the lock so readers and writers aren't blocked
+            confidence, skill_gaps, strengths = self.agent._score_match(student, job)
+            row = self.agent._match_result(confidence, skill_gaps, strengths, None)
+            del row["recommendation"]
+            row["_confidence"] = confidence
+        except Exception as e:
+            error = str(e) or type(e).__name__
+        finally:
+            with self._lock:
+                self._in_progress -= 1
+                # Discard if the pair was removed, or re-queued by a score-relevant
+                # change while scoring (other field changes leave the score valid)
+                if (row_key[0] in self.students and row_key[1] in self.jobs
+                        and row_key not in self._dirty):
+                    if row is not None:
+                        row["is_match"] = row["_confidence"] >= self.threshold
+                        self.rows[row_key] = row
+                        self._deps[row_key] = row_dependencies(student, job)
+                        self.errors.pop(row_key, None)
+                    elif error is not None:
+                        # No dependencies recorded: any later update rescores it
+                        self.rows.pop(row_key, None)
+                        self._deps.pop(row_key, None)
+                        self.errors[row_key] = error
+                self.rows_scored += 1
+                self._changed.notify_all()
+        return True
+
+    def _run_worker(self):
+        while True:
+            with self._changed:
+                self._changed.wait_for(lambda: self._dirty or self._stopping)
+                if self._stopping:
+                    return
+            self._process_one()
+
+    @staticmethod
+    def _public(row: Dict) -> Dict:
+        return {k: v for k, v in row.items() if k != "_confidence"}
@@ -0,0 +1,165 @@
+"""
+Latency Metrics
+Minimal thread-safe histograms rendered in the Prometheus text format.
+When disabled, observe() returns immediately and stage timers are no-ops.
+"""
+import bisect
+import threading
+import time
+from typing import Callable, Dict, List, Sequence, Tuple
+
+import config
+
+
+# Seconds; fine-grained at the low end so microsecond scoring stages resolve
+DEFAULT_BUCKETS = (
+    0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025,
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+_enabled = config.METRICS_ENABLED
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+def set_enabled(value: bool):
+    global _enabled
+    _enabled = bool(value)
+
+
+class Histogram:
+    """Prometheus-style histogram keyed by a fixed tuple of label names"""
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        # label values -> [per-bucket counts (+Inf last), sum]
+        self._series: Dict[Tuple[str, ...], list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float, *labels: str):
+        """Record one observation (label values in labelnames order)"""
+        if not _enabled:
+            return
+        idx = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][idx] += 1
+            series[1] += seconds
+
+    def observe_since(self, start: float, *labels: str):
+        """observe() the time elapsed since a time.perf_counter() reading"""
+        if _enabled:
+            self.observe(time.perf_counter() - start, *labels)
+
+    def snapshot(self) -> Dict[Tuple[str, ...], Dict]:
+        """{labels: {"count", "sum", "buckets": [(le, cumulative count)]}}"""
+        with self._lock:
+            series = {k: (list(counts), total) for k, (counts, total) in self._series.items()}
+        out = {}
+        for labels, (counts, total) in series.items():
+            cumulative, running = [], 0
+            for le, count in zip(self.buckets + (float("inf"),), counts):
+                running += count
+                cumulative.append((le, running))
+            out[labels] = {"count": running, "sum": total, "buckets": cumulative}
+        return out
+
+    def reset(self):
+        with self._lock:
+            self._series.clear()
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        for labels, data in sorted(self.snapshot().items()):
+            pairs = [f'{n}="{_escape(v)}"' for n, v in zip(self.labelnames, labels)]
+            for le, count in data["buckets"]:
+                le_text = "+Inf" if le == float("inf") else repr(le)
+                bucket_labels = ",".join(pairs + ['le="%s"' % le_text])
+                lines.append(f"{self.name}_bucket{{{bucket_labels}}} {count}")
+            suffix = f"{{{','.join(pairs)}}}" if pairs else ""
+            lines.append(f"{self.name}_sum{suffix} {data['sum']!r}")
+            lines.append(f"{self.name}_count{suffix} {data['count']}")
+        return lines
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+# ==================== REGISTERED METRICS ====================
+
+STAGE_SECONDS = Histogram(
+    "internhub_stage_duration_seconds",
+    "Time spent in each analyze_match stage",
+    ("stage",)
+)
+LLM_CALL_SECONDS = Histogram(
+    "internhub_llm_call_duration_seconds",
+    "Latency of _call_llm by response source (mock, cache, real, coalesced, fallback)",
+    ("source",)
+)
+LLM_TTFT_SECONDS = Histogram(
+    "internhub_llm_time_to_first_token_seconds",
+    "Time to the first streamed LLM chunk, by response source",
+    ("source",)
+)
+LLM_QUEUE_SECONDS = Histogram(
+    "internhub_llm_queue_wait_seconds",
+    "Time upstream LLM requests waited for rate-limit budget, by priority",
+    ("priority",)
+)
+HTTP_REQUEST_SECONDS = Histogram(
+    "internhub_http_request_duration_seconds",
+    "Flask request latency until the response is returned (streams: until headers)",
+    ("route", "method", "status")
+)
+REGISTRY = [STAGE_SECONDS, LLM_CALL_SECONDS, LLM_TTFT_SECONDS, LLM_QUEUE_SECONDS,
+            HTTP_REQUEST_SECONDS]
+
+
+def render() -> str:
+    """All registered metrics in the Prometheus text exposition format"""
+    lines = []
+    for histogram in REGISTRY:
+        lines.extend(histogram.render())
+    return "\n".join(lines) + "\n"
+
+
+def reset():
+    for histogram in REGISTRY:
+        histogram.reset()
+
+
+# ==================== STAGE TIMERS ====================
+
+def _noop_lap(stage: str):
+    pass
+
+
+def stage_timer() -> Callable[[str], None]:
+    """
+    lap = stage_timer(); ...work...; lap("score"); ...; lap("gaps")
+    Each lap records the time since the previous lap (or since creation)
+    """
+    if not _enabled:
+        return _noop_lap
+    last = [time.perf_counter()]
+
+    def lap(stage: str):
+        now = time.perf_counter()
+        STAGE_SECONDS.observe(now - last[0], stage)
+        last[0] = now
+    return lap
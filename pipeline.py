@@ -0,0 +1,79 @@
+"""
+Concurrent Stage Pipeline
+Runs analysis stages as a dependency graph on a shared executor, starting each
+stage as soon as the stages it depends on have finished
+"""
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, wait
+from typing import Any, Callable, Dict, Iterable
+
+from student_profile import StudentProfile
+from internship_job import InternshipJob
+
+
+class StageGraph:
+    """
+    A small DAG of named stages
+
+    Each stage is called with its dependencies' results as keyword arguments,
+    e.g. add("ats", lambda resume: ..., deps=["resume"]).
+    """
+
+    def __init__(self):
+        self._stages: Dict[str, tuple] = {}  # name -> (fn, deps)
+
+    def add(self, name: str, fn: Callable, deps: Iterable[str] = ()) -> "StageGraph":
+        """Register a stage; dependencies must already be registered"""
+        deps = tuple(deps)
+        missing = [d for d in deps if d not in self._stages]
+        if missing:
+            raise ValueError(f"Stage '{name}' depends on unknown stages: {missing}")
+        self._stages[name] = (fn, deps)
+        return self
+
+    def run(self, executor: Executor) -> Dict[str, Any]:
+        """Run all stages and return {stage name: result}; re-raises the first failure"""
+        results: Dict[str, Any] = {}
+        running: Dict[Future, str] = {}
+        pending = dict(self._stages)
+
+        while pending or running:
+            for name, (fn, deps) in list(pending.items()):
+                if all(d in results for d in deps):
+                    kwargs = {d: results[d] for d in deps}
+                    running[executor.submit(fn, **kwargs)] = name
+                    del pending[name]
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                try:
+                    results[name] = future.result()
+                except Exception:
+                    for other in running:
+                        other.cancel()
+                    raise
+
+        return results
+
+
+def run_full_analysis(
+    agent,
+    student: StudentProfile,
+    job: InternshipJob,
+    executor: Executor
+) -> Dict[str, Any]:
+    """
+    Match analysis, resume generation and ATS scoring as a stage graph
+
+    The recommendation and resume LLM calls are independent and run in
+    parallel; ATS scoring starts as soon as the resume is ready.
+    """
+    graph = StageGraph()
+    graph.add("match", lambda: agent.analyze_match(student, job))
+    graph.add("resume", lambda: agent.generate_optimized_resume(student, job))
+    graph.add(
+        "ats",
+        lambda resume: agent.calculate_ats_score(student, job, resume),
+        deps=["resume"]
+    )
+    return graph.run(executor)
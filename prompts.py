@@ -0,0 +1,159 @@
+"""
+Prompt Templates
+Job-first prompt layouts: the job-invariant part of each prompt (role,
+posting, instructions) comes first and is rendered once per InternshipJob,
+so every student's prompt for a posting shares a byte-identical prefix that
+provider-side prompt caches and the local response cache can reuse.
+"""
+import string
+import threading
+from typing import Dict, List, Tuple
+
+from internship_job import InternshipJob
+
+
+JOB_FIELDS = ("title", "company", "required_skills", "preferred_skills",
+              "responsibilities", "focus_skills")
+
+
+def job_fields(job: InternshipJob) -> Dict[str, str]:
+    """Rendered job values available to a template's prefix"""
+    return {
+        "title": job.title,
+        "company": job.company,
+        "required_skills": ", ".join(job.required_skills),
+        "preferred_skills": ", ".join(job.preferred_skills),
+        "responsibilities": ", ".join(job.responsibilities[:3]),
+        "focus_skills": ", ".join(job.required_skills[:3]),
+    }
+
+
+def _job_source(job: InternshipJob) -> Tuple:
+    """Job fields a prefix depends on (a cached prefix is reused while equal)"""
+    return (job.title, job.company, tuple(job.required_skills),
+            tuple(job.preferred_skills), tuple(job.responsibilities[:3]))
+
+
+def _field_names(template: str) -> List[str]:
+    return [field for _, field, _, _ in string.Formatter().parse(template) if field]
+
+
+class PromptTemplate:
+    """
+    Two-part prompt: a `prefix` over job fields and a `suffix` over per-request
+    fields. Field names are checked once at construction; the prefix is cached
+    on the job (job._prompt_prefixes) and re-rendered only if the job changes.
+    """
+
+    def __init__(self, name: str, prefix: str, suffix: str):
+        unknown = set(_field_names(prefix)) - set(JOB_FIELDS)
+        if unknown:
+            raise ValueError(f"Prompt {name!r} prefix uses non-job fields: {sorted(unknown)}")
+        self.name = name
+        self.prefix = prefix
+        self.suffix = suffix
+        self._lock = threading.Lock()
+        self.reset_stats()
+
+    def render(self, job: InternshipJob, **fields) -> str:
+        """Full prompt: the job's cached prefix followed by the rendered suffix"""
+        prefix, reused = self.job_prefix(job)
+        prompt = prefix + self.suffix.format_map(fields)
+        with self._lock:
+            self.renders += 1
+            self.total_chars += len(prompt)
+            if reused:
+                self.prefix_hits += 1
+                self.reused_chars += len(prefix)
+        return prompt
+
+    def job_prefix(self, job: InternshipJob) -> Tuple[str, bool]:
+        """(prefix, whether it was already rendered for this job)"""
+        source = _job_source(job)
+        prefixes = getattr(job, '_prompt_prefixes', None)
+        if prefixes is None:
+            prefixes = job._prompt_prefixes = {}
+        cached = prefixes.get(self.name)
+        if cached is not None and cached[0] == source:
+            return cached[1], True
+        prefix = self.prefix.format_map(job_fields(job))
+        prefixes[self.name] = (source, prefix)
+        return prefix, False
+
+    def stats(self) -> Dict:
+        """Render counters; prefix_reuse_ratio is the share of prompt characters
+        that repeat a prefix already rendered for the same job"""
+        with self._lock:
+            return {
+                "renders": self.renders,
+                "prefix_hits": self.prefix_hits,
+                "prefix_hit_rate": round(self.prefix_hits / self.renders, 4) if self.renders else 0.0,
+                "prefix_reuse_ratio": round(self.reused_chars / self.total_chars, 4) if self.total_chars else 0.0,
+            }
+
+    def reset_stats(self):
+        with self._lock:
+            self.renders = 0
+            self.prefix_hits = 0
+            self.total_chars = 0
+            self.reused_chars = 0
+
+
+RESUME_PROMPT = PromptTemplate(
+    "resume",
+    prefix="""You are a resume optimization expert.
+
+Job Description:
+- Title: {title}
+- Company: {company}
+- Required Skills: {required_skills}
+- Preferred Skills: {preferred_skills}
+- Key Responsibilities: {responsibilities}
+
+Task: Generate a concise, ATS-friendly resume tailored to this internship.
+Focus on highlighting relevant skills and experiences.
+Format as a professional resume snippet (under 300 words).
+Emphasize alignment with: {focus_skills}
+
+""",
+    suffix="""Student Profile:
+- Name: {name}
+- Skills: {skills}
+- Interests: {interests}
+- Experience: {experience}
+- CGPA: {cgpa}
+
+Resume:"""
+)
+
+RECOMMENDATION_PROMPT = PromptTemplate(
+    "recommendation",
+    prefix="""You are a career advisor for an internship platform.
+
+Job: {title} at {company}
+Required: {required_skills}
+
+Provide a 2-3 sentence personalized recommendation on whether this student should apply.
+Consider the match score and skill gaps. Be encouraging but honest.
+
+""",
+    suffix="""Student: {name}
+Match Confidence: {confidence}%
+Student Skills: {skills}
+Student Interests: {interests}
+Skill Gaps: {skill_gaps}
+
+Recommendation:"""
+)
+
+TEMPLATES = (RESUME_PROMPT, RECOMMENDATION_PROMPT)
+
+
+def stats() -> Dict[str, Dict]:
+    """Per-template render and prefix-reuse counters"""
+    return {template.name: template.stats() for template in TEMPLATES}
+
+
+def reset_stats():
+    for template in TEMPLATES:
+        template.reset_stats()
@@ -0,0 +1,108 @@
+"""
+Match Scoring Primitives
+Shared weights and score components used by the per-pair scorer and the
+bulk matchers (match matrix, indexes), so every path produces identical scores
+"""
+import re
+from functools import lru_cache
+from typing import FrozenSet, Iterable, List, NamedTuple
+
+
+# Score component weights (see ARCHITECTURE.md -> Match Scoring Algorithm)
+REQUIRED_WEIGHT = 0.6
+PREFERRED_WEIGHT = 0.3
+INTEREST_WEIGHT = 0.2
+CGPA_WEIGHT = 0.1
+
+# Interest alignment: description phrases up to this many tokens are
+# precomputed; longer interests fall back to a scan of the token text
+MAX_PHRASE_TOKENS = 4
+_TOKEN_RE = re.compile(r"[^\W_]+[+#]*")
+
+
+def skill_coverage(
+    required_matches: int,
+    required_total: int,
+    preferred_matches: int,
+    preferred_total: int
+) -> float:
+    """Weighted required/preferred coverage (0 when the job lists no required skills)"""
+    if not required_total:
+        return 0
+    preferred = (
+        preferred_matches / preferred_total * PREFERRED_WEIGHT
+        if preferred_total else 0
+    )
+    return required_matches / required_total * REQUIRED_WEIGHT + preferred
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased word tokens ("C++", "C#" keep their symbols; "Node.js" -> node, js)"""
+    return _TOKEN_RE.findall(text.lower())
+
+
+@lru_cache(maxsize=4096)
+def normalize_phrase(text: str) -> str:
+    """Canonical phrase form: tokens joined by single spaces ("" if no tokens)"""
+    return " ".join(tokenize(text))
+
+
+class DescriptionTerms(NamedTuple):
+    """Precomputed phrase set for a job description (see interest_terms)"""
+    phrases: FrozenSet[str]  # every run of 1..MAX_PHRASE_TOKENS consecutive tokens
+    text: str  # " tok tok ... " for phrases longer than MAX_PHRASE_TOKENS
+
+    def contains(self, phrase: str) -> bool:
+        """True if a normalized phrase occurs as consecutive description tokens"""
+        if phrase in self.phrases:
+            return True
+        return phrase.count(" ") >= MAX_PHRASE_TOKENS and f" {phrase} " in self.text
+
+
+def description_terms(description: str) -> DescriptionTerms:
+    tokens = tokenize(description)
+    phrases = {
+        " ".join(tokens[start:start + n])
+        for n in range(1, MAX_PHRASE_TOKENS + 1)
+        for start in range(len(tokens) - n + 1)
+    }
+    return DescriptionTerms(frozenset(phrases), f" {' '.join(tokens)} ")
+
+
+def interest_terms(job) -> DescriptionTerms:
+    """
+    The job's description phrase set, cached on the job and rebuilt only when
+    the description changes (compact jobs are keyed by their packed bytes)
+    """
+    source = getattr(job, '_description', None)
+    if source is None:
+        source = job.description
+    cached = getattr(job, '_interest_terms', None)
+    if cached is None or (cached[0] is not source and cached[0] != source):
+        cached = (source, description_terms(job.description))
+        job._interest_terms = cached
+    return cached[1]
+
+
+def interest_matches(interests: Iterable[str], job) -> bool:
+    """True if any interest appears as a phrase in the job description"""
+    return interests_in_terms(interests, interest_terms(job))
+
+
+def interests_in_terms(interests: Iterable[str], terms: DescriptionTerms) -> bool:
+    """
+    True if any interest, as a whole token phrase, occurs in the description
+    Interests without any word characters never match.
+    """
+    return any(terms.contains(normalize_phrase(interest)) for interest in interests)
+
+
+def cgpa_component(cgpa: float) -> float:
+    """CGPA factor (3.0+ is good), capped at CGPA_WEIGHT"""
+    return min(cgpa / 4.0, 1.0) * CGPA_WEIGHT
+
+
+def combine(coverage: float, interest_match: bool, cgpa: float) -> float:
+    """Combine score components into the final 0-1 confidence"""
+    interest_score = INTEREST_WEIGHT if interest_match else 0
+    return min(coverage + interest_score + cgpa_component(cgpa), 1.0)
@@ -0,0 +1,94 @@
+"""
+Single-Flight Request Coalescing
+Concurrent callers asking for the same key share one in-flight call: the
+first caller runs it, the rest block until it finishes and receive the same
+result (or exception). Thread-safe; keys are forgotten once the call returns.
+"""
+import threading
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+class _Call:
+    """One in-flight call and its outcome"""
+
+    def __init__(self, state: Any = None):
+        self.done = threading.Event()
+        self.state = state
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Coalesces concurrent calls with equal keys into one execution"""
+
+    def __init__(self):
+        self._calls: Dict[str, _Call] = {}
+        self._lock = threading.Lock()
+        self.leaders = 0  # calls actually executed
+        self.coalesced = 0  # callers served by another caller's call
+
+    def do(
+        self,
+        key: str,
+        fn: Callable[[], Any],
+        state: Any = None,
+        on_join: Optional[Callable[[Any], None]] = None
+    ) -> Tuple[Any, bool]:
+        """
+        Run fn() unless a call for `key` is already in flight, in which case
+        wait for it. Returns (result, shared) where shared is True for
+        callers that joined another caller's call. A leader's `state` is kept
+        with its call; a joining caller's on_join(state) runs before it waits.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call(state)
+                self.leaders += 1
+            else:
+                self.coalesced += 1
+        if not leader:
+            if on_join is not None:
+                on_join(call.state)
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result, False
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
+
+    def stats(self) -> Dict:
+        """Executed vs coalesced call counters"""
+        with self._lock:
+            return {
+                "in_flight": len(self._calls),
+                "leaders": self.leaders,
+                "coalesced": self.coalesced
+            }
+
+
+_default_group: Optional[SingleFlight] = None
+_default_lock = threading.Lock()
+
+
+def get_default_group() -> SingleFlight:
+    """Process-wide group shared by all agents (and Flask worker threads)"""
+    global _default_group
+    with _default_lock:
+        if _default_group is None:
+            _default_group = SingleFlight()
+        return _default_group
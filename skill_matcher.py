@@ -0,0 +1,118 @@
+"""
+Compiled Per-Job Skill Matcher
+Per-job canonical skill IDs, so a student's precomputed ID sets yield
+required/preferred matches, gaps and strengths in one pass; lowercased ATS
+keywords (and their word-boundary patterns) are prepared on first use
+"""
+import re
+from typing import Dict, FrozenSet, List, NamedTuple, Optional, Pattern, Set, Tuple
+
+from internship_job import InternshipJob
+from canonical_skills import job_skill_ids, student_skill_ids
+
+
+class SkillMatch(NamedTuple):
+    """Result of matching one student's skills against one job"""
+    student_skills: List[str]  # original student skill strings
+    skill_hits: List[FrozenSet[int]]  # per student skill: canonical IDs it covers
+    required_hits: List[bool]  # per job required skill: matched?
+    preferred_hits: List[bool]  # per job preferred skill: matched?
+
+    @property
+    def required_matches(self) -> int:
+        return sum(self.required_hits)
+
+    @property
+    def preferred_matches(self) -> int:
+        return sum(self.preferred_hits)
+
+
+class JobSkillMatcher:
+    """Skill matcher compiled for a single job"""
+
+    def __init__(self, job: InternshipJob):
+        self.required_skills = list(job.required_skills)
+        self.preferred_skills = list(job.preferred_skills)
+        self.required_ids, self.preferred_ids = job_skill_ids(job)
+        self._keywords: Optional[List[Tuple[str, str]]] = None
+        self._patterns: Dict[str, Pattern] = {}
+
+    def match(
+        self,
+        student_skills: List[str],
+        skill_ids: Optional[List[FrozenSet[int]]] = None
+    ) -> SkillMatch:
+        """
+        Match a student's skills: a job skill is matched when its canonical ID
+        is among the IDs the student's skills cover. Pass the student's
+        precomputed per-skill ID sets (canonical_skills.student_skill_sets).
+        """
+        if skill_ids is None:
+            skill_ids = [student_skill_ids(skill) for skill in student_skills]
+        covered = frozenset().union(*skill_ids)
+        return SkillMatch(
+            student_skills=student_skills,
+            skill_hits=skill_ids,
+            required_hits=[i in covered for i in self.required_ids],
+            preferred_hits=[i in covered for i in self.preferred_ids]
+        )
+
+    @property
+    def keywords(self) -> List[Tuple[str, str]]:
+        """(job skill, lowercased keyword) pairs for ATS scans"""
+        if self._keywords is None:
+            self._keywords = [
+                (skill, skill.lower()) for skill in self.required_skills + self.preferred_skills
+            ]
+        return self._keywords
+
+    def find_keywords(self, text: str, word_boundary: bool = False) -> Set[str]:
+        """
+        Return the job skills (original spelling) found in a lowercased text
+        One C-level substring test per keyword; for many jobs against one
+        text, KeywordAutomaton (bulk ATS) scans the text once instead
+        """
+        if not word_boundary:
+            return {skill for skill, keyword in self.keywords if keyword in text}
+        return {
+            skill for skill, keyword in self.keywords
+            if keyword in text and self._pattern(keyword).search(text)
+        }
+
+    def _pattern(self, keyword: str) -> Pattern:
+        pattern = self._patterns.get(keyword)
+        if pattern is None:
+            pattern = self._patterns[keyword] = _word_boundary_pattern(keyword)
+        return pattern
+
+    def strengths(self, match: SkillMatch, limit: int = 3) -> List[Tuple[str, str]]:
+        """(student skill, required skill) pairs for the first `limit` required skills"""
+        return [
+            (student_skill, req_skill)
+            for req_skill, skill_id in zip(self.required_skills[:limit], self.required_ids)
+            for student_skill, hits in zip(match.student_skills, match.skill_hits)
+            if skill_id in hits
+        ]
+
+
+def _word_boundary_pattern(keyword: str) -> Pattern:
+    """
+    Regex for a keyword whose word-character edges must not touch another
+    word character (like KeywordAutomaton.find's word_boundary mode)
+    """
+    head = r'(?<!\w)' if re.match(r'\w', keyword[:1]) else ''
+    tail = r'(?!\w)' if re.match(r'\w', keyword[-1:]) else ''
+    return re.compile(head + re.escape(keyword) + tail)
+
+
+def get_job_matcher(job: InternshipJob) -> JobSkillMatcher:
+    """Return the job's compiled matcher, rebuilding it if the skill lists changed"""
+    matcher = getattr(job, '_skill_matcher', None)
+    if (
+        matcher is None
+        or matcher.required_skills != job.required_skills
+        or matcher.preferred_skills != job.preferred_skills
+    ):
+        matcher = JobSkillMatcher(job)
+        job._skill_matcher = matcher
+    return matcher
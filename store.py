@@ -0,0 +1,248 @@
+"""
+SQLite Store for Students and Job Postings
+Upserts plus indexed skill / location / duration queries that return model
+objects without scanning every stored posting
+"""
+import json
+import sqlite3
+import threading
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from student_profile import StudentProfile
+from internship_job import InternshipJob
+from canonical_skills import canonical_key, student_keys
+import config
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS students (
+    id INTEGER PRIMARY KEY,
+    email TEXT NOT NULL UNIQUE,
+    cgpa REAL NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS student_skills (
+    student_id INTEGER NOT NULL REFERENCES students(id) ON DELETE CASCADE,
+    skill TEXT NOT NULL,
+    PRIMARY KEY (skill, student_id)
+);
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY,
+    job_key TEXT NOT NULL UNIQUE,
+    location TEXT NOT NULL COLLATE NOCASE,
+    duration_months INTEGER NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_location ON jobs(location, duration_months);
+CREATE INDEX IF NOT EXISTS idx_jobs_duration ON jobs(duration_months);
+CREATE TABLE IF NOT EXISTS job_skills (
+    job_id INTEGER NOT NULL REFERENCES jobs(id) ON DELETE CASCADE,
+    skill TEXT NOT NULL,
+    kind TEXT NOT NULL CHECK (kind IN ('required', 'preferred')),
+    PRIMARY KEY (skill, kind, job_id)
+);
+"""
+
+
+def normalize_skill(skill: str) -> str:
+    """Canonical key used for the skill index columns ("JS" -> "javascript")"""
+    return canonical_key(skill)
+
+
+def job_key(job: InternshipJob) -> str:
+    """Default job key when the caller doesn't supply one"""
+    return f"{job.company}::{job.title}"
+
+
+class InternHubStore:
+    """Local persistence for students and postings (thread-safe, one connection)"""
+
+    def __init__(self, path: str = config.STORE_PATH):
+        self.path = path
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA foreign_keys = ON")
+        self._db.executescript(SCHEMA)
+        self._lock = threading.Lock()
+
+    def close(self):
+        self._db.close()
+
+    def __enter__(self) -> "InternHubStore":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ==================== UPSERTS ====================
+
+    def upsert_job(self, job: InternshipJob, key: Optional[str] = None) -> str:
+        """Insert or replace a posting (keyed by `key` or company::title)"""
+        return self.upsert_jobs([(key, job)])[0]
+
+    def upsert_jobs(self, items: Iterable[Tuple[Optional[str], InternshipJob]]) -> List[str]:
+        """Insert or replace many postings in one transaction"""
+        keys = []
+        with self._lock, self._db:
+            for key, job in items:
+                key = key or job_key(job)
+                job_id = self._db.execute(
+                    """INSERT INTO jobs (job_key, location, duration_months, data)
+                       VALUES (?, ?, ?, ?)
+                       ON CONFLICT(job_key) DO UPDATE SET
+                           location = excluded.location,
+                           duration_months = excluded.duration_months,
+                           data = excluded.data
+                       RETURNING id""",
+                    (key, job.location, job.duration_months, json.dumps(job.to_dict()))
+                ).fetchone()[0]
+                self._db.execute("DELETE FROM job_skills WHERE job_id = ?", (job_id,))
+                self._db.executemany(
+                    "INSERT OR IGNORE INTO job_skills (job_id, skill, kind) VALUES (?, ?, ?)",
+                    [(job_id, normalize_skill(s), "required") for s in job.required_skills] +
+                    [(job_id, normalize_skill(s), "preferred") for s in job.preferred_skills]
+                )
+                keys.append(key)
+        return keys
+
+    def upsert_student(self, student: StudentProfile) -> str:
+        """Insert or replace a student (keyed by email)"""
+        return self.upsert_students([student])[0]
+
+    def upsert_students(self, students: Iterable[StudentProfile]) -> List[str]:
+        """Insert or replace many students in one transaction"""
+        emails = []
+        with self._lock, self._db:
+            for student in students:
+                student_id = self._db.execute(
+                    """INSERT INTO students (email, cgpa, data) VALUES (?, ?, ?)
+                       ON CONFLICT(email) DO UPDATE SET
+                           cgpa = excluded.cgpa,
+                           data = excluded.data
+                       RETURNING id""",
+                    (student.email, student.cgpa, json.dumps(student.to_dict()))
+                ).fetchone()[0]
+                self._db.execute(
+                    "DELETE FROM student_skills WHERE student_id = ?", (student_id,)
+                )
+                self._db.executemany(
+                    "INSERT OR IGNORE INTO student_skills (student_id, skill) VALUES (?, ?)",
+                    [(student_id, key) for s in student.skills for key in student_keys(s)]
+                )
+                emails.append(student.email)
+        return emails
+
+    # ==================== QUERIES ====================
+
+    def get_job(self, key: str) -> Optional[InternshipJob]:
+        row = self._query("SELECT data FROM jobs WHERE job_key = ?", (key,))
+        return InternshipJob.from_dict(json.loads(row[0][0])) if row else None
+
+    def get_student(self, email: str) -> Optional[StudentProfile]:
+        row = self._query("SELECT data FROM students WHERE email = ?", (email,))
+        return StudentProfile.from_dict(json.loads(row[0][0])) if row else None
+
+    def find_jobs(
+        self,
+        skills: Iterable[str] = (),
+        location: Optional[str] = None,
+        max_duration: Optional[int] = None,
+        min_duration: Optional[int] = None,
+        skill_kind: str = "required",
+        limit: Optional[int] = None
+    ) -> List[Tuple[str, InternshipJob]]:
+        """
+        (key, job) pairs matching every filter, via the skill/location/duration
+        indexes. `skills` must all be listed as `skill_kind` ("required",
+        "preferred" or "any"); location is case-insensitive.
+        """
+        sql = ["SELECT j.job_key, j.data FROM jobs j"]
+        where, params = [], []
+
+        skills = sorted({normalize_skill(s) for s in skills})
+        if skills:
+            kinds = ("required", "preferred") if skill_kind == "any" else (skill_kind,)
+            sql.append(
+                "JOIN (SELECT job_id FROM job_skills WHERE skill IN ({}) AND kind IN ({}) "
+                "GROUP BY job_id HAVING COUNT(DISTINCT skill) = ?) s ON s.job_id = j.id".format(
+                    ",".join("?" * len(skills)), ",".join("?" * len(kinds))
+                )
+            )
+            params += skills + list(kinds) + [len(skills)]
+        if location is not None:
+            where.append("j.location = ?")
+            params.append(location)
+        if max_duration is not None:
+            where.append("j.duration_months <= ?")
+            params.append(max_duration)
+        if min_duration is not None:
+            where.append("j.duration_months >= ?")
+            params.append(min_duration)
+        if where:
+            sql.append("WHERE " + " AND ".join(where))
+        sql.append("ORDER BY j.id")
+        if limit is not None:
+            sql.append("LIMIT ?")
+            params.append(limit)
+
+        rows = self._query(" ".join(sql), params)
+        return [(key, InternshipJob.from_dict(json.loads(data))) for key, data in rows]
+
+    def find_students(self, skills: Iterable[str] = ()) -> List[StudentProfile]:
+        """Students covering every one of `skills` (canonical key match)"""
+        skills = sorted({normalize_skill(s) for s in skills})
+        if not skills:
+            return list(self.iter_students())
+        rows = self._query(
+            "SELECT st.data FROM students st JOIN ("
+            "SELECT student_id FROM student_skills WHERE skill IN ({}) "
+            "GROUP BY student_id HAVING COUNT(*) = ?) s ON s.student_id = st.id "
+            "ORDER BY st.id".format(",".join("?" * len(skills))),
+            skills + [len(skills)]
+        )
+        return [StudentProfile.from_dict(json.loads(data)) for (data,) in rows]
+
+    def iter_students(self) -> Iterator[StudentProfile]:
+        for (data,) in self._query("SELECT data FROM students ORDER BY id"):
+            yield StudentProfile.from_dict(json.loads(data))
+
+    def counts(self) -> Dict[str, int]:
+        return {
+            "students": self._query("SELECT COUNT(*) FROM students")[0][0],
+            "jobs": self._query("SELECT COUNT(*) FROM jobs")[0][0]
+        }
+
+    # ==================== SCORING ====================
+
+    def match_student(
+        self,
+        agent,
+        student: StudentProfile,
+        n: int = 10,
+        recommendation: str = "eager",
+        **filters
+    ) -> List[Dict]:
+        """
+        Score a student against the stored postings selected by `filters`
+        (see find_jobs) and return the analysis for the best n
+        (recommendation: see InternHubAIAgent.analyze_match)
+        """
+        candidates = self.find_jobs(**filters)
+        scored = sorted(
+            ((agent._calculate_match_score(student, job), pos)
+             for pos, (_, job) in enumerate(candidates)),
+            key=lambda item: (-item[0], item[1])
+        )[:n]
+        results = []
+        for _, pos in scored:
+            key, job = candidates[pos]
+            results.append({
+                "job_key": key,
+                "job": job.title,
+                "company": job.company,
+                "analysis": agent.analyze_match(student, job, recommendation)
+            })
+        return results
+
+    def _query(self, sql: str, params: Iterable = ()) -> List[tuple]:
+        with self._lock:
+            return self._db.execute(sql, list(params)).fetchall()
@@ -4,6 +4,8 @@ Student Profile Data Model
 from typing import List, Dict
 from dataclasses import dataclass, asdict
 import json
+from interning import SKILLS, INTERESTS, pack_text, unpack_text
+from canonical_skills import student_skill_sets
 
 
 @dataclass
@@ -17,6 +19,10 @@ class StudentProfile:
     cgpa: float  # Cumulative GPA (0-4.0)
     resume_text: str = ""  # Optional: existing resume text
     
+    def __post_init__(self):
+        """Resolve skills to canonical IDs once, at ingestion"""
+        student_skill_sets(self)
+    
     def to_dict(self) -> Dict:
         """Convert to dictionary"""
         return asdict(self)
@@ -46,3 +52,78 @@ Skills: {', '.join(self.skills)}
 Interests: {', '.join(self.interests)}
 Experience: {self.experience}
 """
+
+
+class CompactStudentProfile:
+    """
+    Memory-lean StudentProfile for large in-memory cohorts
+    Uses __slots__, interned skill/interest IDs (small int arrays) and packed
+    text fields that are only decoded when accessed. Field access, to_dict and
+    to_json match StudentProfile, so it can be passed to the AI agent as is.
+    """
+    __slots__ = ('name', 'email', 'skill_ids', 'interest_ids', 'cgpa',
+                 '_experience', '_resume_text', '_canonical_skills')
+    
+    @property
+    def skills(self) -> List[str]:
+        return SKILLS.lookup_all(self.skill_ids)
+    
+    @property
+    def interests(self) -> List[str]:
+        return INTERESTS.lookup_all(self.interest_ids)
+    
+    @property
+    def experience(self) -> str:
+        return unpack_text(self._experience)
+    
+    @property
+    def resume_text(self) -> str:
+        return unpack_text(self._resume_text) if self._resume_text else ""
+    
+    def to_dict(self) -> Dict:
+        """Convert to dictionary (same shape as StudentProfile.to_dict)"""
+        return {
+            "name": self.name,
+            "email": self.email,
+            "skills": self.skills,
+            "interests": self.interests,
+            "experience": self.experience,
+            "cgpa": self.cgpa,
+            "resume_text": self.resume_text
+        }
+    
+    def to_json(self) -> str:
+        """Convert to JSON string"""
+        return json.dumps(self.to_dict(), indent=2)
+    
+    def to_profile(self) -> StudentProfile:
+        """Materialize a regular StudentProfile"""
+        return StudentProfile(**self.to_dict())
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'CompactStudentProfile':
+        """Create from dictionary without going through __init__"""
+        obj = cls.__new__(cls)
+        obj.name = data['name']
+        obj.email = data['email']
+        obj.skill_ids = SKILLS.intern_all(data['skills'])
+        obj.interest_ids = INTERESTS.intern_all(data['interests'])
+        obj.cgpa = data['cgpa']
+        obj._experience = pack_text(data['experience'])
+        resume_text = data.get('resume_text', "")
+        obj._resume_text = pack_text(resume_text) if resume_text else b""
+        obj._canonical_skills = None
+        student_skill_sets(obj)
+        return obj
+    
+    @classmethod
+    def from_json(cls, json_str: str) -> 'CompactStudentProfile':
+        """Create from JSON string"""
+        return cls.from_dict(json.loads(json_str))
+    
+    @classmethod
+    def from_profile(cls, profile: StudentProfile) -> 'CompactStudentProfile':
+        """Compact an existing StudentProfile"""
+        return cls.from_dict(profile.__dict__)
+    
+    get_profile_summary = StudentProfile.get_profile_summary
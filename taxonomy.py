@@ -0,0 +1,161 @@
+"""
+Skill Taxonomy
+Canonical skill IDs and categories loaded once from a data file
+(skill_taxonomy.json), resolved by hash lookups over normalized token phrases
+"""
+import json
+import threading
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import config
+from scoring import normalize_phrase
+
+
+MAX_MEMO_ENTRIES = 100_000  # Resolved skill strings kept per taxonomy
+
+
+class SkillEntry(NamedTuple):
+    """One canonical skill"""
+    id: str
+    name: str
+    category: str  # Category label, e.g. "Programming Language"
+
+
+class SkillTaxonomy:
+    """
+    Resolves free-text skills to canonical entries
+
+    A skill resolves to the entry whose name or alias equals its normalized
+    token phrase (see scoring.normalize_phrase). Otherwise every run of up to
+    `max_alias_tokens` consecutive tokens is looked up, and the hit from the
+    highest-priority category wins (ties: longer phrase, then earlier), so
+    "Advanced Python" -> python and "Spring Boot microservices" -> spring.
+    Cost depends on the skill's length, not on the taxonomy's size; results
+    are memoized per raw skill string.
+    """
+
+    def __init__(self, data: Dict):
+        self.version = data.get("version", 1)
+        self.default_category: str = data["default_category"]
+        categories = {c["id"]: c for c in data["categories"]}
+        self.categories: List[str] = [
+            c["label"] for c in sorted(categories.values(), key=lambda c: c["priority"])
+        ]
+
+        self.entries: List[SkillEntry] = []
+        self._priority: List[int] = []
+        self._by_id: Dict[str, int] = {}
+        self._phrases: Dict[str, int] = {}  # normalized name/alias -> entry index
+        self.max_alias_tokens = 1
+        for skill in data["skills"]:
+            category = categories.get(skill["category"])
+            if category is None:
+                raise ValueError(f"Skill {skill['id']!r} has unknown category {skill['category']!r}")
+            if skill["id"] in self._by_id:
+                raise ValueError(f"Duplicate skill id {skill['id']!r}")
+            idx = len(self.entries)
+            self.entries.append(SkillEntry(skill["id"], skill["name"], category["label"]))
+            self._priority.append(category["priority"])
+            self._by_id[skill["id"]] = idx
+            for term in [skill["name"], *skill.get("aliases", [])]:
+                phrase = normalize_phrase(term)
+                if not phrase:
+                    continue
+                owner = self._phrases.setdefault(phrase, idx)
+                if owner != idx:
+                    raise ValueError(
+                        f"Alias {term!r} of {skill['id']!r} already belongs to "
+                        f"{self.entries[owner].id!r}"
+                    )
+                self.max_alias_tokens = max(self.max_alias_tokens, phrase.count(" ") + 1)
+
+        self._memo: Dict[str, Tuple[int, ...]] = {}
+        self._memo_lock = threading.Lock()
+
+    @classmethod
+    def from_file(cls, path: str) -> "SkillTaxonomy":
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def get(self, skill_id: str) -> Optional[SkillEntry]:
+        """Entry for a canonical ID"""
+        idx = self._by_id.get(skill_id)
+        return None if idx is None else self.entries[idx]
+
+    def resolve(self, skill: str) -> Optional[SkillEntry]:
+        """Canonical entry for a free-text skill, or None if unknown"""
+        hits = self._hits(skill)
+        return self.entries[hits[0]] if hits else None
+
+    def matches(self, skill: str) -> List[SkillEntry]:
+        """
+        Every entry a skill mentions, best first: just the exact entry when the
+        whole skill is a name/alias, else all token-run hits in resolve() order
+        ("Python/Django" -> python, django)
+        """
+        return [self.entries[idx] for idx in self._hits(skill)]
+
+    def canonical_id(self, skill: str) -> Optional[str]:
+        entry = self.resolve(skill)
+        return None if entry is None else entry.id
+
+    def categorize(self, skill: str) -> str:
+        """Category label for a skill (default_category when unknown)"""
+        entry = self.resolve(skill)
+        return self.default_category if entry is None else entry.category
+
+    def _hits(self, skill: str) -> Tuple[int, ...]:
+        try:
+            return self._memo[skill]
+        except KeyError:
+            pass
+        hits = self._lookup(skill)
+        with self._memo_lock:
+            if len(self._memo) >= MAX_MEMO_ENTRIES:
+                self._memo.clear()
+            self._memo[skill] = hits
+        return hits
+
+    def _lookup(self, skill: str) -> Tuple[int, ...]:
+        phrase = normalize_phrase(skill)
+        exact = self._phrases.get(phrase)
+        if exact is not None:
+            return (exact,)
+        if not phrase:
+            return ()
+
+        # Longest runs first; a run inside an already matched longer run is
+        # skipped ("c sharp" is csharp, not also c)
+        tokens = phrase.split(" ")
+        ranks: Dict[int, Tuple[int, int, int]] = {}
+        covered = set()
+        for n in range(min(self.max_alias_tokens, len(tokens)), 0, -1):
+            for start in range(len(tokens) - n + 1):
+                span = range(start, start + n)
+                if covered.issuperset(span):
+                    continue
+                idx = self._phrases.get(" ".join(tokens[start:start + n]))
+                if idx is None:
+                    continue
+                covered.update(span)
+                rank = (self._priority[idx], -n, start)
+                if idx not in ranks or rank < ranks[idx]:
+                    ranks[idx] = rank
+        return tuple(sorted(ranks, key=ranks.__getitem__))
+
+
+_default_taxonomy: Optional[SkillTaxonomy] = None
+_default_lock = threading.Lock()
+
+
+def get_default_taxonomy() -> SkillTaxonomy:
+    """Process-wide taxonomy loaded from config.SKILL_TAXONOMY_PATH on first use"""
+    global _default_taxonomy
+    if _default_taxonomy is None:
+        with _default_lock:
+            if _default_taxonomy is None:
+                _default_taxonomy = SkillTaxonomy.from_file(config.SKILL_TAXONOMY_PATH)
+    return _default_taxonomy
@@ -3,6 +3,7 @@ Test script to demonstrate InternHub capabilities
 Run: python test_internhub.py
 """
 import json
+import random
 from student_profile import StudentProfile
 from internship_job import InternshipJob
 from ai_agent import InternHubAIAgent, analyze_internship_fit, generate_resume, get_ats_score
@@ -21,6 +22,42 @@ def print_section(title):
     print("=" * 70)
 
 
+def _random_cohort(seed=7, n_students=40, n_jobs=15):
+    """Build a small random cohort and catalog from a shared skill pool"""
+    rng = random.Random(seed)
+    skills = ["Python", "JavaScript", "Java", "React", "Flask", "SQL", "Docker",
+              "AWS", "REST APIs", "Git", "Go", "Kubernetes", "Basic JavaScript",
+              "Advanced Python", "Database Design", "CI/CD", "C++", "GraphQL"]
+    interests = ["Web Development", "Data Science", "Cloud", "AI", "APIs", "a", ""]
+    words = ["scalable", "web", "apis", "cloud", "data", "python", "team", "ai"]
+    students = [
+        StudentProfile(
+            name=f"Student {i}",
+            email=f"student{i}@example.com",
+            skills=rng.sample(skills, rng.randint(0, 6)),
+            interests=rng.sample(interests, rng.randint(0, 2)),
+            experience="Synthetic profile",
+            cgpa=round(rng.uniform(2.0, 4.5), 2)
+        )
+        for i in range(n_students)
+    ]
+    jobs = [
+        InternshipJob(
+            title=f"Intern {j}",
+            company=f"Company {j}",
+            description=" ".join(rng.choice(words) for _ in range(12)),
+            required_skills=[s.lower() if rng.random() < 0.3 else s
+                             for s in rng.sample(skills, rng.randint(0, 5))],
+            preferred_skills=rng.sample(skills, rng.randint(0, 4)),
+            responsibilities=["Code", "Test"],
+            duration_months=rng.randint(1, 6),
+            location=rng.choice(["Remote", "Bangalore, India"])
+        )
+        for j in range(n_jobs)
+    ]
+    return students, jobs
+
+
 def test_case_1():
     """Test Case 1: Strong candidate for full-stack role"""
     print_section("TEST CASE 1: Strong Full-Stack Match")
@@ -188,6 +225,1346 @@ def test_json_serialization():
     print(f"    Match: {'✅ IDENTICAL' if match_before['confidence_score'] == match_after['confidence_score'] else '❌ DIFFERENT'}")
 
 
+def test_match_matrix():
+    """Test Case 7: Vectorized cohort x catalog match matrix"""
+    print_section("TEST CASE 7: Vectorized Match Matrix")
+    
+    students, jobs = _random_cohort()
+    students.append(get_example_student())
+    jobs.append(get_example_job())
+    agent = InternHubAIAgent(use_mock=True)
+    
+    matrix = agent.match_matrix(students, jobs)
+    mismatches = [
+        (i, j)
+        for i, student in enumerate(students)
+        for j, job in enumerate(jobs)
+        if matrix[i, j] != agent._calculate_match_score(student, job)
+    ]
+    
+    print(f"\n📐 Matrix shape: {matrix.shape}")
+    print(f"    Mismatches vs per-pair scorer: {len(mismatches)}")
+    assert matrix.shape == (len(students), len(jobs))
+    assert not mismatches
+
+
+def test_job_index_top_k():
+    """Test Case 8: Inverted skill index top-K job retrieval"""
+    print_section("TEST CASE 8: JobIndex Top-K Retrieval")
+    
+    from match_index import JobIndex
+    from canonical_skills import job_skill_id, student_skill_ids
+    
+    students, jobs = _random_cohort(seed=11, n_students=25, n_jobs=60)
+    agent = InternHubAIAgent(use_mock=True)
+    index = JobIndex(jobs)
+    
+    for student in students:
+        covered = set().union(*(student_skill_ids(s) for s in student.skills))
+        shares_skill = [
+            pos for pos, job in enumerate(jobs)
+            if any(job_skill_id(k) in covered
+                   for k in job.required_skills + job.preferred_skills)
+        ]
+        assert sorted(index.candidates(student)) == shares_skill
+        expected = sorted(
+            ((agent._calculate_match_score(student, jobs[pos]), -pos) for pos in shares_skill),
+            reverse=True
+        )[:5]
+        got = index.top_k(student, 5)
+        assert [(score, jobs.index(job)) for job, score in got] == \
+            [(score, -neg_pos) for score, neg_pos in expected]
+    
+    top = index.top_k(students[0], 3)
+    print(f"\n🔎 Indexed {len(index)} jobs")
+    print(f"    Top-3 for {students[0].name}: {[(j.title, round(s, 2)) for j, s in top]}")
+
+
+def test_rank_candidates():
+    """Test Case 9: Recruiter-side candidate ranking"""
+    print_section("TEST CASE 9: StudentIndex Candidate Ranking")
+    
+    from match_index import StudentIndex
+    from canonical_skills import job_skill_id, student_skill_ids
+    from app import app
+    
+    students, jobs = _random_cohort(seed=5, n_students=80, n_jobs=10)
+    agent = InternHubAIAgent(use_mock=True)
+    index = StudentIndex(students)
+    
+    for job in jobs:
+        ids = {job_skill_id(k) for k in job.required_skills + job.preferred_skills}
+        sharing = [
+            pos for pos, student in enumerate(students)
+            if any(ids & student_skill_ids(s) for s in student.skills)
+        ]
+        assert sorted(index.candidates(job)) == sharing
+        expected = sorted(
+            (
+                (agent.analyze_match(students[pos], job)['confidence_score'], -pos)
+                for pos in sharing
+            ),
+            reverse=True
+        )[:5]
+        got = index.rank_candidates(job, 5)
+        assert [round(score, 2) for _, score in got] == [score for score, _ in expected]
+    
+    # Concurrent adds (the API's shared pool) keep positions and postings aligned
+    import threading
+    shared = StudentIndex()
+    positions = {}
+    
+    def add_all(chunk):
+        for student in chunk:
+            positions[student.email] = shared.add(student)
+    
+    threads = [threading.Thread(target=add_all, args=(students[i::4],)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sorted(positions.values()) == list(range(len(students)))
+    assert all(shared.students[pos].email == email for email, pos in positions.items())
+    for job in jobs:
+        assert [s for _, s in shared.rank_candidates(job, 5)] == \
+            [s for _, s in index.rank_candidates(job, 5)]
+    
+    client = app.test_client()
+    response = client.post('/candidates', json={
+        "job": get_example_job().to_dict(),
+        "students": [s.to_dict() for s in students[:20]] + [get_example_student().to_dict()],
+        "n": 3
+    })
+    ranked = response.get_json()['data']['candidates']
+    
+    print(f"\n🏆 Top candidates for {get_example_job().title}:")
+    for candidate in ranked:
+        print(f"   • {candidate['name']}: {candidate['confidence_score']}")
+    assert response.status_code == 200
+    assert ranked[0]['name'] == get_example_student().name
+
+
+def test_compiled_skill_matcher():
+    """Test Case 10: Compiled per-job skill matcher vs naive canonical-ID scans"""
+    print_section("TEST CASE 10: Compiled Skill Matcher")
+    
+    from skill_matcher import get_job_matcher
+    from keyword_automaton import KeywordAutomaton
+    from canonical_skills import job_skill_id, student_skill_ids
+    
+    automaton = KeywordAutomaton(["he", "she", "his", "hers", ""])
+    assert automaton.find("ushers") == {0, 1, 3, 4}
+    
+    students, jobs = _random_cohort(seed=3, n_students=30, n_jobs=20)
+    agent = InternHubAIAgent(use_mock=True)
+    
+    for job in jobs:
+        for student in students:
+            covered = set()
+            for s in student.skills:
+                covered |= student_skill_ids(s)
+            expected_gaps = [
+                req for req in job.required_skills[:5]
+                if job_skill_id(req) not in covered
+            ]
+            expected_strengths = [
+                f"Strong in {s} (aligns with {req})"
+                for req in job.required_skills[:3]
+                for s in student.skills if job_skill_id(req) in student_skill_ids(s)
+            ]
+            result = agent.analyze_match(student, job)
+            assert [gap['skill'] for gap in result['skill_gaps']] == expected_gaps
+            assert [s for s in result['strengths'] if s.startswith("Strong in")] == \
+                expected_strengths
+    
+    job = jobs[0]
+    assert get_job_matcher(job) is get_job_matcher(job)
+    job.required_skills = job.required_skills + ["Rust"]
+    assert ("Rust", "rust") in get_job_matcher(job).keywords
+    assert job_skill_id("Rust") in get_job_matcher(job).required_ids
+    
+    print(f"\n⚙️  Compiled matchers for {len(jobs)} jobs, {len(students)} students checked")
+
+
+def test_ats_single_pass():
+    """Test Case 11: Single-pass ATS keyword scan"""
+    print_section("TEST CASE 11: Single-Pass ATS Scanning")
+    
+    agent = InternHubAIAgent(use_mock=True)
+    student = get_example_student()
+    students, jobs = _random_cohort(seed=9, n_students=1, n_jobs=25)
+    resume = generate_resume(student, get_example_job()) + " Java, C++ and docker-compose."
+    
+    for job in jobs + [get_example_job()]:
+        keywords = set(job.required_skills + job.preferred_skills)
+        expected = {k for k in keywords if k.lower() in resume.lower()}
+        ats = agent.calculate_ats_score(student, job, resume)
+        assert set(ats['matched_keywords']) == expected
+        assert set(ats['missing_keywords']) == keywords - expected
+        assert ats['matched_count'] == len(expected)
+        assert ats['keyword_count'] == len(keywords)
+    
+    job = InternshipJob(
+        title="Systems Intern", company="Acme", description="Low-level work",
+        required_skills=["Java", "C++", "Go"], preferred_skills=["Docker"],
+        responsibilities=["Build"], duration_months=3, location="Remote"
+    )
+    text = "JavaScript developer, some C++ and Google Cloud; docker-compose"
+    loose = agent.calculate_ats_score(student, job, text)
+    strict = agent.calculate_ats_score(student, job, text, word_boundary=True)
+    
+    print(f"\n🤖 Substring matches:     {sorted(loose['matched_keywords'])}")
+    print(f"   Word-boundary matches: {sorted(strict['matched_keywords'])}")
+    assert sorted(loose['matched_keywords']) == ["C++", "Docker", "Go", "Java"]
+    assert sorted(strict['matched_keywords']) == ["C++", "Docker"]
+    
+    from app import app
+    body = {"student": student.to_dict(), "job": job.to_dict(), "resume_text": text}
+    client = app.test_client()
+    assert client.post('/ats', json=body).get_json()['data']['matched_count'] == 4
+    body["word_boundary"] = True
+    assert client.post('/ats', json=body).get_json()['data']['matched_count'] == 2
+    
+    # Word-boundary patterns agree with the bulk automaton's boundary rule
+    import time
+    from keyword_automaton import KeywordAutomaton
+    from skill_matcher import get_job_matcher
+    lowered = resume.lower()
+    for job in jobs:
+        matcher = get_job_matcher(job)
+        automaton = KeywordAutomaton(keyword for _, keyword in matcher.keywords)
+        found = automaton.find(lowered, word_boundary=True)
+        assert matcher.find_keywords(lowered, word_boundary=True) == {
+            skill for skill, keyword in matcher.keywords
+            if automaton.patterns.index(keyword) in found
+        }
+    
+    # One job's scan is no slower than testing each keyword against the text
+    big_job = InternshipJob(
+        title="Generalist Intern", company="Acme", description="Everything",
+        required_skills=[s for j in jobs for s in j.required_skills][:30],
+        preferred_skills=[s for j in jobs for s in j.preferred_skills][:12],
+        responsibilities=["Build"], duration_months=3, location="Remote"
+    )
+    long_resume = " ".join([resume] * 12)
+    keywords = big_job.required_skills + big_job.preferred_skills
+    
+    def best_of(fn, repeats=7, loops=20):
+        best = float("inf")
+        for _ in range(repeats):
+            start = time.perf_counter()
+            for _ in range(loops):
+                fn()
+            best = min(best, time.perf_counter() - start)
+        return best
+    
+    baseline = best_of(lambda: {k for k in keywords if k.lower() in long_resume.lower()})
+    current = best_of(lambda: agent.calculate_ats_score(student, big_job, long_resume))
+    print(f"   {len(long_resume.split())}-word resume, {len(keywords)} keywords: "
+          f"{current / 20 * 1e6:.0f}µs (per-keyword scan {baseline / 20 * 1e6:.0f}µs)")
+    assert current <= baseline * 1.5
+
+
+def test_bulk_ats():
+    """Test Case 12: One resume against the whole catalog"""
+    print_section("TEST CASE 12: Bulk ATS Scoring")
+    
+    from app import app
+    
+    agent = InternHubAIAgent(use_mock=True)
+    student = get_example_student()
+    _, jobs = _random_cohort(seed=21, n_students=1, n_jobs=30)
+    jobs.append(get_example_job())
+    resume = generate_resume(student, get_example_job())
+    
+    bulk = agent.bulk_ats(resume, jobs)
+    for job, result in zip(jobs, bulk):
+        single = agent.calculate_ats_score(student, job, resume)
+        assert sorted(result['matched_keywords']) == sorted(single['matched_keywords'])
+        assert result['ats_score'] == single['ats_score']
+    
+    response = app.test_client().post('/ats/batch', json={
+        "resume_text": resume,
+        "jobs": [job.to_dict() for job in jobs]
+    })
+    data = response.get_json()['data']
+    passing = [r['job'] for r in data if r['ats_score'] >= 0.5]
+    
+    print(f"\n🤖 Scored 1 resume against {len(data)} jobs")
+    print(f"   Passing (≥ 50%): {len(passing)}")
+    assert response.status_code == 200
+    assert len(data) == len(jobs)
+
+
+class CountingAgent(InternHubAIAgent):
+    """Agent whose 'real' LLM backend is a local counter instead of OpenAI"""
+    
+    def __init__(self, **kwargs):
+        super().__init__(use_mock=False, **kwargs)
+        self.use_mock = False
+        self.upstream_calls = 0
+    
+    def _request_completion(self, prompt):
+        self.upstream_calls += 1
+        return self._mock_llm_response(prompt)
+
+
+def test_llm_response_cache():
+    """Test Case 13: Persistent LLM response cache"""
+    print_section("TEST CASE 13: LLM Response Cache")
+    
+    import os
+    import tempfile
+    from llm_cache import LLMResponseCache
+    
+    student = get_example_student()
+    job = get_example_job()
+    path = os.path.join(tempfile.mkdtemp(), "llm.sqlite3")
+    
+    agent = CountingAgent(cache=LLMResponseCache(path=path))
+    first = agent.generate_optimized_resume(student, job)
+    second = agent.generate_optimized_resume(student, job)
+    agent.analyze_match(student, job)
+    agent.analyze_match(student, job)
+    assert first == second
+    assert agent.upstream_calls == 2
+    assert agent.cache.stats()['memory_hits'] == 2
+    # One miss per upstream call (the leader's re-check isn't counted)
+    assert agent.cache.stats()['misses'] == 2
+    assert agent.cache.stats()['hit_rate'] == 0.5
+    
+    # A fresh process (new cache object) is served from SQLite
+    restarted = CountingAgent(cache=LLMResponseCache(path=path))
+    assert restarted.generate_optimized_resume(student, job) == first
+    assert restarted.upstream_calls == 0
+    assert restarted.cache.stats()['disk_hits'] == 1
+    
+    # TTL and size-based eviction
+    expired = LLMResponseCache(path=path, ttl_seconds=-1)
+    expired.set("k", "v")
+    assert expired.get("k") is None
+    small = LLMResponseCache(max_memory_entries=2)
+    for key in ("a", "b", "c"):
+        small.set(key, key.upper())
+    assert small.get("a") is None and small.get("c") == "C"
+    bounded = LLMResponseCache(path=os.path.join(tempfile.mkdtemp(), "b.sqlite3"),
+                               max_memory_entries=1, max_disk_entries=2)
+    for key in ("a", "b", "c"):
+        bounded.set(key, key.upper())
+    assert bounded.stats()['disk_entries'] == 2 and bounded.get("a") is None
+    
+    # Entries served from memory stay recent on disk and survive eviction
+    hot = LLMResponseCache(path=os.path.join(tempfile.mkdtemp(), "h.sqlite3"),
+                           max_disk_entries=2)
+    hot.set("hot", "H")
+    hot.set("warm", "W")
+    assert hot.get("hot") == "H"  # memory hit
+    hot.set("new", "N")  # evicts the least recently used disk row
+    assert hot._db.execute("SELECT key FROM llm_cache WHERE key = 'hot'").fetchone()
+    assert not hot._db.execute("SELECT key FROM llm_cache WHERE key = 'warm'").fetchone()
+    
+    print(f"\n💾 Cache stats: {agent.cache.stats()}")
+
+
+def _start_stand_in_llm_server(delay=0.05, fail_first=1):
+    """Local OpenAI-compatible /chat/completions stand-in; returns (server, stats)"""
+    import threading
+    import time
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    
+    stats = {"requests": 0, "in_flight": 0, "max_in_flight": 0, "failures_left": fail_first}
+    lock = threading.Lock()
+    
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+            with lock:
+                stats["requests"] += 1
+                stats["in_flight"] += 1
+                stats["max_in_flight"] = max(stats["max_in_flight"], stats["in_flight"])
+                fail = stats["failures_left"] > 0
+                stats["failures_left"] -= fail
+            time.sleep(delay)
+            with lock:
+                stats["in_flight"] -= 1
+            if fail:
+                self.send_response(429)
+                self.send_header("Retry-After", "0")
+                self.end_headers()
+                return
+            prompt = body["messages"][0]["content"]
+            reply = json.dumps({"choices": [{"message": {"content": f" echo:{len(prompt)} "}}]})
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.end_headers()
+            self.wfile.write(reply.encode())
+        
+        def log_message(self, *args):
+            pass
+    
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, stats
+
+
+def test_async_llm_client():
+    """Test Case 14: Async LLM path with bounded concurrency"""
+    print_section("TEST CASE 14: Async Batch Analysis")
+    
+    import asyncio
+    import time
+    from async_llm import AsyncLLMClient
+    from llm_cache import LLMResponseCache
+    
+    server, stats = _start_stand_in_llm_server()
+    base_url = f"http://127.0.0.1:{server.server_port}"
+    students, jobs = _random_cohort(seed=2, n_students=12, n_jobs=2)
+    pairs = [(student, jobs[i % 2]) for i, student in enumerate(students)]
+    
+    async def run():
+        async with AsyncLLMClient(api_key="test", base_url=base_url, max_concurrency=4,
+                                  backoff_base=0.01) as client:
+            agent = InternHubAIAgent(use_mock=False, cache=LLMResponseCache(),
+                                     async_client=client)
+            agent.use_mock = False
+            results = await agent.analyze_batch_async(pairs)
+            resume = await agent.generate_optimized_resume_async(students[0], jobs[0])
+            return results, resume, client.retries
+    
+    start = time.perf_counter()
+    results, resume, retries = asyncio.run(run())
+    elapsed = time.perf_counter() - start
+    server.shutdown()
+    
+    sync_agent = InternHubAIAgent(use_mock=True)
+    for (student, job), result in zip(pairs, results):
+        expected = sync_agent.analyze_match(student, job)
+        assert result['confidence_score'] == expected['confidence_score']
+        assert result['recommendation'].startswith("echo:")
+    
+    print(f"\n⚡ {len(results)} analyses in {elapsed:.2f}s")
+    print(f"   Max in flight: {stats['max_in_flight']} (limit 4), retries: {retries}")
+    assert 1 < stats['max_in_flight'] <= 4
+    assert retries == 1
+    assert resume.startswith("echo:")
+
+
+def test_parallel_full_analysis():
+    """Test Case 15: Concurrent stage DAG for /full-analysis"""
+    print_section("TEST CASE 15: Parallel Full Analysis")
+    
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+    from pipeline import run_full_analysis
+    from app import app
+    
+    class SlowLLMAgent(InternHubAIAgent):
+        def _call_llm(self, prompt):
+            time.sleep(0.2)
+            return super()._call_llm(prompt)
+    
+    student = get_example_student()
+    job = get_example_job()
+    agent = SlowLLMAgent(use_mock=True)
+    
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        start = time.perf_counter()
+        stages = run_full_analysis(agent, student, job, executor)
+        elapsed = time.perf_counter() - start
+    
+    sequential = analyze_internship_fit(student, job)
+    assert stages["match"] == sequential
+    assert stages["ats"]["ats_score"] == get_ats_score(student, job, stages["resume"])["ats_score"]
+    
+    response = app.test_client().post('/full-analysis', json={
+        "student": student.to_dict(), "job": job.to_dict()
+    })
+    
+    print(f"\n⏱️  Two 0.2s LLM stages finished in {elapsed:.2f}s")
+    assert elapsed < 0.35
+    assert response.status_code == 200
+    assert response.get_json()['data']['match_analysis']['confidence_score'] == \
+        sequential['confidence_score']
+
+
+def test_streaming_batch_analysis():
+    """Test Case 16: Streaming NDJSON batch endpoint"""
+    print_section("TEST CASE 16: Streaming Batch Analysis")
+    
+    import io
+    from batch import iter_json_records
+    from app import app
+    
+    students, jobs = _random_cohort(seed=4, n_students=30, n_jobs=3)
+    pairs = [{"student": s.to_dict(), "job": jobs[i % 3].to_dict()}
+             for i, s in enumerate(students)]
+    pairs[0]["student"]["name"] = "Zoë Ünicode"
+    
+    # Lazy parsing copes with tiny chunks in both formats
+    array_body = json.dumps(pairs).encode()
+    ndjson_body = "\n".join(json.dumps(p) for p in pairs).encode()
+    assert list(iter_json_records(io.BytesIO(array_body), chunk_size=7)) == pairs
+    assert list(iter_json_records(io.BytesIO(ndjson_body), chunk_size=5)) == pairs
+    assert list(iter_json_records(io.BytesIO(b"[1, 22, 333]"), chunk_size=1)) == [1, 22, 333]
+    
+    client = app.test_client()
+    agent = InternHubAIAgent(use_mock=True)
+    bodies = {
+        "application/x-ndjson": ndjson_body + b'\n{"bad": 1}\n',
+        "application/json": array_body
+    }
+    for content_type, body in bodies.items():
+        response = client.post('/analyze/batch', data=body, content_type=content_type)
+        lines = [json.loads(line) for line in response.data.decode().splitlines()]
+        by_index = {line['index']: line for line in lines}
+        for i, student in enumerate(students):
+            expected = agent.analyze_match(student, jobs[i % 3])['confidence_score']
+            assert by_index[i]['data']['confidence_score'] == expected
+        if content_type == "application/x-ndjson":
+            assert by_index[len(students)]['status'] == "error"
+    
+    print(f"\n📦 Streamed {len(lines)} results for {len(pairs)} pairs")
+
+
+def test_resume_sse_streaming():
+    """Test Case 17: Server-sent events for /resume"""
+    print_section("TEST CASE 17: Streaming Resume (SSE)")
+    
+    from app import app
+    
+    student = get_example_student()
+    job = get_example_job()
+    body = {"student": student.to_dict(), "job": job.to_dict()}
+    
+    response = app.test_client().post('/resume?stream=1', json=body)
+    events = []
+    for block in response.data.decode().strip().split("\n\n"):
+        event, data = block.split("\n", 1)
+        events.append((event[len("event: "):], json.loads(data[len("data: "):])))
+    
+    tokens = [payload['text'] for event, payload in events if event == "token"]
+    done = events[-1][1]
+    assert response.mimetype == "text/event-stream"
+    assert events[-1][0] == "done" and done['source'] == "mock"
+    assert "".join(tokens) == generate_resume(student, job)
+    
+    # Real backend failing before the first token falls back to the mock stream
+    class BrokenStreamAgent(CountingAgent):
+        def _request_completion_stream(self, prompt):
+            raise ConnectionError("upstream down")
+    
+    from llm_cache import LLMResponseCache
+    stream = BrokenStreamAgent(cache=LLMResponseCache()).generate_optimized_resume_stream(student, job)
+    assert "".join(stream) == generate_resume(student, job)
+    assert stream.source == "fallback" and stream.ttft_seconds is not None
+    
+    # Failing after the first token is an error event, never a "done"
+    class TruncatedStreamAgent(CountingAgent):
+        def _request_completion_stream(self, prompt):
+            yield "PROFESSIONAL"
+            raise ConnectionError("connection reset")
+    
+    import app as app_module
+    import metrics
+    metrics.set_enabled(True)
+    metrics.reset()
+    shared_agent = app_module.agent
+    app_module.agent = TruncatedStreamAgent(cache=LLMResponseCache())
+    try:
+        response = app.test_client().post('/resume?stream=1', json=body)
+    finally:
+        app_module.agent = shared_agent
+    blocks = response.data.decode().strip().split("\n\n")
+    assert blocks[0].startswith("event: token")
+    assert blocks[-1].startswith("event: error") and "connection reset" in blocks[-1]
+    assert not any(block.startswith("event: done") for block in blocks)
+    assert metrics.LLM_TTFT_SECONDS.snapshot()[("real",)]["count"] == 1
+    
+    print(f"\n📡 {len(tokens)} token events, TTFT {done['ttft_ms']} ms")
+
+
+def test_cli_batch_mode():
+    """Test Case 18: CLI batch mode with checkpoint/resume"""
+    print_section("TEST CASE 18: CLI Batch Mode")
+    
+    import os
+    import tempfile
+    from cli import _build_parser, run_batch
+    
+    students, jobs = _random_cohort(seed=8, n_students=20, n_jobs=6)
+    tmp = tempfile.mkdtemp()
+    students_path = os.path.join(tmp, "students.jsonl")
+    jobs_path = os.path.join(tmp, "jobs.jsonl")
+    output = os.path.join(tmp, "results.jsonl")
+    with open(students_path, "w") as f:
+        f.writelines(json.dumps(s.to_dict()) + "\n" for s in students)
+    with open(jobs_path, "w") as f:
+        f.writelines(json.dumps(j.to_dict()) + "\n" for j in jobs)
+    
+    args = _build_parser().parse_args(
+        ["--batch", students_path, jobs_path, "-o", output, "--workers", "2"]
+    )
+    assert run_batch(args) == len(students) * len(jobs)
+    
+    # Simulate an interrupted run: keep half the lines plus a torn write
+    with open(output) as f:
+        lines = f.readlines()
+    with open(output, "w") as f:
+        f.writelines(lines[:len(lines) // 2])
+        f.write('{"index": 3, "sta')
+    
+    resumed = _build_parser().parse_args(
+        ["--batch", students_path, jobs_path, "-o", output, "--workers", "2", "--resume"]
+    )
+    assert run_batch(resumed) == len(lines) - len(lines) // 2
+    
+    with open(output) as f:
+        results = [json.loads(line) for line in f]
+    agent = InternHubAIAgent(use_mock=True)
+    assert sorted(r['index'] for r in results) == list(range(len(students) * len(jobs)))
+    for r in results[:10]:
+        student, job = students[r['index'] // len(jobs)], jobs[r['index'] % len(jobs)]
+        assert r['match']['confidence_score'] == \
+            agent.analyze_match(student, job)['confidence_score']
+    
+    print(f"\n🗂️  {len(results)} results after resume, no duplicates")
+
+
+def test_compact_representations():
+    """Test Case 19: Compact, interned StudentProfile/InternshipJob"""
+    print_section("TEST CASE 19: Compact Representations")
+    
+    import tracemalloc
+    from student_profile import CompactStudentProfile
+    from internship_job import CompactInternshipJob
+    
+    students, jobs = _random_cohort(seed=13, n_students=30, n_jobs=8)
+    students.append(get_example_student())
+    jobs.append(get_example_job())
+    agent = InternHubAIAgent(use_mock=True)
+    
+    compact_students = [CompactStudentProfile.from_profile(s) for s in students]
+    compact_jobs = [CompactInternshipJob.from_json(j.to_json()) for j in jobs]
+    for student, compact in zip(students, compact_students):
+        assert compact.to_dict() == student.to_dict()
+        assert compact.to_json() == student.to_json()
+        assert compact.to_profile() == student
+    for job, compact in zip(jobs, compact_jobs):
+        assert compact.to_dict() == job.to_dict()
+        assert compact.to_job() == job
+    for student, compact_student in zip(students, compact_students):
+        for job, compact_job in zip(jobs, compact_jobs):
+            assert agent.analyze_match(compact_student, compact_job) == \
+                agent.analyze_match(student, job)
+    
+    # Memory: many profiles sharing the same skills and long experience text
+    record = get_example_student().to_dict()
+    record['experience'] = "Built full-stack web projects with REST APIs. " * 20
+    
+    def measure(factory):
+        tracemalloc.start()
+        items = [factory(dict(record, email=f"s{i}@example.com")) for i in range(2000)]
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        return size, items
+    
+    regular, _ = measure(lambda d: StudentProfile.from_json(json.dumps(d)))
+    compact, _ = measure(lambda d: CompactStudentProfile.from_json(json.dumps(d)))
+    
+    print(f"\n🗜️  2000 profiles: {regular / 1024:.0f} KiB regular vs {compact / 1024:.0f} KiB compact")
+    assert compact < regular / 2
+
+
+def test_job_catalog():
+    """Test Case 20: Memory-mapped JSONL catalog with offset index"""
+    print_section("TEST CASE 20: Memory-Mapped Job Catalog")
+    
+    import os
+    import tempfile
+    from job_catalog import JobCatalog, write_catalog
+    
+    _, jobs = _random_cohort(seed=17, n_students=1, n_jobs=50)
+    path = os.path.join(tempfile.mkdtemp(), "catalog.jsonl")
+    write_catalog(path, ((f"job-{i}", job) for i, job in enumerate(jobs)))
+    
+    with JobCatalog(path) as catalog:
+        assert not catalog.index_loaded_from_disk
+        assert len(catalog) == len(jobs)
+        assert catalog["job-37"] == jobs[37]
+        assert [j for _, j in catalog.iter_jobs(10, 13)] == jobs[10:13]
+    
+    with JobCatalog(path) as catalog:
+        assert catalog.index_loaded_from_disk
+        assert catalog.get_many(["job-0", "job-49"]) == [jobs[0], jobs[49]]
+        assert catalog.get("missing") is None
+    
+    # Appending to the catalog invalidates the saved index
+    with open(path, "a") as f:
+        f.write(json.dumps(get_example_job().to_dict()) + "\n")
+    with JobCatalog(path, compact=True) as catalog:
+        assert not catalog.index_loaded_from_disk
+        assert catalog[str(len(jobs))].to_dict() == get_example_job().to_dict()
+    
+    print(f"\n🗺️  Indexed {len(jobs) + 1} postings; index file {os.path.getsize(path + '.idx')} bytes")
+
+
+def test_store_queries():
+    """Test Case 21: SQLite store with indexed skill/location/duration queries"""
+    print_section("TEST CASE 21: SQLite Job/Student Store")
+    
+    import os
+    import tempfile
+    from store import InternHubStore
+    from canonical_skills import canonical_key
+    from app import app
+    import app as app_module
+    
+    students, jobs = _random_cohort(seed=21, n_students=10, n_jobs=60)
+    path = os.path.join(tempfile.mkdtemp(), "store.sqlite3")
+    
+    with InternHubStore(path) as store:
+        store.upsert_jobs((f"job-{i}", job) for i, job in enumerate(jobs))
+        store.upsert_students(students)
+        assert store.counts() == {"students": len(students), "jobs": len(jobs)}
+        
+        found = store.find_jobs(skills=["python"], location="remote", max_duration=3)
+        expected = [
+            (f"job-{i}", job) for i, job in enumerate(jobs)
+            if "python" in [canonical_key(s) for s in job.required_skills]
+            and job.location == "Remote" and job.duration_months <= 3
+        ]
+        assert found == expected
+        
+        # The skill and location filters are served by indexes, not a table scan
+        plan = " ".join(row[-1] for row in store._db.execute(
+            "EXPLAIN QUERY PLAN SELECT job_id FROM job_skills WHERE skill = 'python'"))
+        assert "USING" in plan and "SCAN" not in plan
+        
+        # Upserts replace the posting and its skill rows
+        updated = InternshipJob.from_dict(dict(jobs[0].to_dict(), required_skills=["Rust"],
+                                               location="Remote", duration_months=2))
+        store.upsert_job(updated, "job-0")
+        assert store.get_job("job-0") == updated
+        assert store.find_jobs(skills=["rust"])[0] == ("job-0", updated)
+        assert store.counts()["jobs"] == len(jobs)
+        
+        agent = InternHubAIAgent(use_mock=True)
+        matches = store.match_student(agent, students[0], n=5, location="Remote")
+        scores = [m["analysis"]["confidence_score"] for m in matches]
+        assert scores == sorted(scores, reverse=True)
+    
+    app_module.store = InternHubStore(path)
+    client = app.test_client()
+    response = client.post('/store/jobs/search',
+                           json={"skills": ["Python"], "location": "Remote", "max_duration": 3})
+    assert response.status_code == 200
+    assert len(response.get_json()['data']['jobs']) == len(expected) - ("job-0" in dict(expected))
+    response = client.post('/store/match', json={"email": students[0].email, "n": 3})
+    assert len(response.get_json()['data']['matches']) == 3
+    app_module.store.close()
+    app_module.store = None
+    
+    print(f"\n🗄️  {len(found)} Remote Python jobs of <= 3 months out of {len(jobs)}")
+
+
+def test_incremental_match_table():
+    """Test Case 22: Incremental materialized match table"""
+    print_section("TEST CASE 22: Incremental Match Table")
+    
+    from match_table import MatchTable
+    
+    students, jobs = _random_cohort(seed=22, n_students=25, n_jobs=12)
+    agent = InternHubAIAgent(use_mock=True)
+    table = MatchTable(agent)
+    for student in students:
+        table.upsert_student(student)
+    for i, job in enumerate(jobs):
+        table.upsert_job(job, f"job-{i}")
+    assert table.process_pending() == len(students) * len(jobs)
+    
+    def check():
+        for student in table.students.values():
+            for key, job in table.jobs.items():
+                expected = agent.analyze_match(student, job)
+                del expected["recommendation"]
+                expected["is_match"] = agent._score_match(student, job)[0] >= table.threshold
+                assert table.get(student.email, key) == expected
+    check()
+    
+    # A required-skill change touches only that job's column
+    changed = InternshipJob.from_dict(dict(jobs[3].to_dict(), required_skills=["Python", "Go"]))
+    assert table.upsert_job(changed, "job-3") == len(students)
+    
+    # Score-irrelevant fields don't dirty anything; description only matters with interests
+    assert table.upsert_job(InternshipJob.from_dict(dict(jobs[4].to_dict(), location="Mars")),
+                            "job-4") == 0
+    with_interests = sum(1 for s in students if s.interests)
+    assert table.upsert_job(InternshipJob.from_dict(dict(jobs[5].to_dict(), description="new")),
+                            "job-5") == with_interests
+    assert table.upsert_student(StudentProfile.from_dict(
+        dict(students[0].to_dict(), cgpa=1.0))) == len(jobs)
+    
+    # Background worker drains the queue (overlapping marks are queued once)
+    pending = table.pending
+    assert pending == len(students) + with_interests + len(jobs) - 1 - bool(students[0].interests)
+    table.start()
+    assert table.wait_until_clean(timeout=10)
+    table.stop()
+    assert table.rows_scored == len(students) * len(jobs) + pending
+    check()
+    
+    # Threshold changes re-flag without rescoring
+    scored = table.rows_scored
+    table.set_threshold(0.2)
+    assert table.rows_scored == scored
+    check()
+    
+    # Re-upserting the stored object after editing it in place is detected
+    job = table.jobs["job-6"]
+    job.required_skills.append("Haskell")
+    assert table.upsert_job(job, "job-6") == len(students)
+    job.required_skills = ["Haskell"]
+    assert table.upsert_job(job, "job-6") == len(students)
+    assert table.upsert_job(job, "job-6") == 0
+    student = table.students[students[1].email]
+    student.skills.append("Haskell")
+    assert table.upsert_student(student) == len(jobs)
+    table.process_pending()
+    check()
+    
+    # A failing row doesn't wedge the queue or kill the worker
+    class FailingAgent(InternHubAIAgent):
+        def _score_match(self, student, job):
+            if job.title == "Broken":
+                raise RuntimeError("scoring failed")
+            return super()._score_match(student, job)
+    
+    failing = MatchTable(FailingAgent(use_mock=True))
+    failing.upsert_student(students[0])
+    broken = InternshipJob.from_dict(dict(jobs[0].to_dict(), title="Broken"))
+    failing.upsert_job(broken, "broken")
+    failing.upsert_job(jobs[1], "ok")
+    failing.start()
+    assert failing.wait_until_clean(timeout=5)
+    assert failing.errors == {(students[0].email, "broken"): "scoring failed"}
+    assert failing.get(students[0].email, "ok") is not None
+    failing.upsert_job(jobs[2], "broken")  # fixed posting: rescored, error cleared
+    assert failing.wait_until_clean(timeout=5)
+    failing.stop()
+    assert not failing.errors and failing.get(students[0].email, "broken") is not None
+    
+    print(f"\n🧮 {len(table)} rows; {table.rows_scored - len(students) * len(jobs)} rescored after updates")
+
+
+def test_benchmark_suite():
+    """Test Case 23: Benchmark suite and baseline comparison"""
+    print_section("TEST CASE 23: Benchmark Suite")
+    
+    import copy
+    from benchmark import compare, make_jobs, make_students, run_suite
+    
+    students = make_students(5, skills_per_profile=4)
+    assert all(len(s.skills) == 4 for s in students)
+    assert len(make_jobs(7)) == 7
+    
+    report = run_suite(students=3, jobs=4, resume_words=50, repeats=1)
+    assert {"match_score", "ats_score", "analyze_match_mock", "route_analyze"} <= set(report["results"])
+    json.dumps(report)
+    
+    # Against itself nothing regresses; a 2x faster baseline flags everything
+    assert not any(row["regressed"] for row in compare(report, report))
+    faster = copy.deepcopy(report)
+    for result in faster["results"].values():
+        result["median_s"] /= 2
+    assert all(row["regressed"] for row in compare(report, faster, threshold=0.5))
+    
+    for name, result in report["results"].items():
+        print(f"   {name:<22} {result['median_s'] * 1e6:8.1f}µs")
+
+
+def test_latency_metrics():
+    """Test Case 24: Per-stage latency histograms and /metrics"""
+    print_section("TEST CASE 24: Latency Metrics")
+    
+    import metrics
+    from app import app
+    from llm_cache import LLMResponseCache
+    
+    student = get_example_student()
+    job = get_example_job()
+    metrics.set_enabled(True)
+    metrics.reset()
+    
+    client = app.test_client()
+    client.post('/analyze', json={"student": student.to_dict(), "job": job.to_dict()})
+    
+    class FlakyAgent(CountingAgent):
+        def _request_completion(self, prompt):
+            self.upstream_calls += 1
+            if self.upstream_calls == 1:
+                raise ConnectionError("upstream down")
+            return self._mock_llm_response(prompt)
+    
+    flaky = FlakyAgent(cache=LLMResponseCache())
+    for _ in range(3):
+        flaky.generate_optimized_resume(student, job)  # fallback, real, cache
+    
+    stages = metrics.STAGE_SECONDS.snapshot()
+    assert set(stages) == {("match_skills",), ("score",), ("gaps",), ("strengths",),
+                           ("recommendation",)}
+    llm = metrics.LLM_CALL_SECONDS.snapshot()
+    assert {k: v["count"] for k, v in llm.items()} == \
+        {("mock",): 1, ("fallback",): 1, ("real",): 1, ("cache",): 1}
+    
+    text = client.get('/metrics').data.decode()
+    assert 'internhub_http_request_duration_seconds_count{route="/analyze",method="POST",status="200"} 1' in text
+    assert 'internhub_stage_duration_seconds_bucket{stage="score",le="+Inf"} 1' in text
+    
+    # Disabled: nothing is recorded
+    metrics.set_enabled(False)
+    metrics.reset()
+    InternHubAIAgent(use_mock=True).analyze_match(student, job)
+    client.post('/analyze', json={"student": student.to_dict(), "job": job.to_dict()})
+    assert not metrics.STAGE_SECONDS.snapshot() and not metrics.HTTP_REQUEST_SECONDS.snapshot()
+    metrics.set_enabled(True)
+    
+    print(f"\n📈 /metrics exposes {text.count(chr(10))} lines")
+
+
+def test_score_only_analysis():
+    """Test Case 25: Score-only and lazy recommendation modes"""
+    print_section("TEST CASE 25: Score-Only / Lazy Recommendations")
+    
+    from ai_agent import LazyRecommendation, json_default
+    from app import app
+    from llm_cache import LLMResponseCache
+    
+    student = get_example_student()
+    job = get_example_job()
+    agent = CountingAgent(cache=LLMResponseCache())
+    eager = agent.analyze_match(student, job)
+    assert agent.upstream_calls == 1
+    
+    score_only = agent.analyze_match(student, job, recommendation="none")
+    assert "recommendation" not in score_only and agent.upstream_calls == 1
+    assert score_only == {k: v for k, v in eager.items() if k != "recommendation"}
+    
+    fresh = CountingAgent(cache=LLMResponseCache())
+    lazy = fresh.analyze_match(student, job, recommendation="lazy")
+    assert isinstance(lazy["recommendation"], LazyRecommendation)
+    assert fresh.upstream_calls == 0 and not lazy["recommendation"].resolved
+    assert json.loads(json.dumps(lazy, default=json_default)) == eager
+    assert lazy == eager and fresh.upstream_calls == 1
+    
+    client = app.test_client()
+    body = {"student": student.to_dict(), "job": job.to_dict()}
+    assert client.post('/analyze', json=body).get_json()['data'] == eager
+    for mode in ("none", "lazy"):
+        data = client.post('/analyze', json=dict(body, recommendation=mode)).get_json()['data']
+        assert data == (score_only if mode == "none" else eager)
+    assert client.post('/analyze', json=dict(body, recommendation="later")).status_code == 400
+    
+    print(f"\n⚡ Score-only: {score_only['match_percentage']} with no LLM call")
+
+
+def test_interest_phrase_matching():
+    """Test Case 26: Tokenized description cache for interest alignment"""
+    print_section("TEST CASE 26: Interest Phrase Matching")
+    
+    import scoring
+    from internship_job import CompactInternshipJob
+    
+    job = get_example_job()
+    job.description = "Build Web-Development APIs in C++ and Node.js for AI/ML teams at Google"
+    cases = {
+        "Web Development": True, "web  development": True, "AI": True, "ml": True,
+        "C++": True, "node.js": True, "API": False, "Go": False, "": False,
+        "Build web development apis in c++": True, "apis in c++ and node js for ai": True,
+        "apis in c++ and python": False
+    }
+    for interest, expected in cases.items():
+        assert scoring.interest_matches([interest], job) == expected, interest
+    
+    # Phrase set is cached on the job and rebuilt only when the description changes
+    terms = scoring.interest_terms(job)
+    assert scoring.interest_terms(job) is terms
+    job.description = "Cloud infrastructure"
+    assert scoring.interest_matches(["Cloud"], job) and not scoring.interest_matches(["AI"], job)
+    compact = CompactInternshipJob.from_job(job)
+    assert scoring.interest_terms(compact) is scoring.interest_terms(compact)
+    
+    # Per-pair scorer, match matrix and indexes agree on the new semantics
+    from match_matrix import build_match_matrix
+    from match_index import JobIndex
+    students, jobs = _random_cohort(seed=26, n_students=30, n_jobs=10)
+    jobs[0].description = "scalable cloud data apis for the python web team"
+    students[0].interests = ["cloud data apis for the python web", "AI"]  # > 4 tokens
+    students[1].interests = ["data apis for the python team"]
+    agent = InternHubAIAgent(use_mock=True)
+    matrix = build_match_matrix(students, jobs, block_size=7)
+    index = JobIndex(jobs)
+    for i, student in enumerate(students):
+        expected = [agent._calculate_match_score(student, job) for job in jobs]
+        assert list(matrix[i]) == expected
+        top = index.top_k(student, 3)
+        assert [score for _, score in top] == sorted(expected, reverse=True)[:len(top)]
+    
+    print(f"\n🔤 {len(terms.phrases)} phrases cached for the example description")
+
+
+def test_skill_taxonomy():
+    """Test Case 27: Data-driven skill taxonomy"""
+    print_section("TEST CASE 27: Skill Taxonomy")
+    
+    from taxonomy import SkillTaxonomy, get_default_taxonomy
+    
+    taxonomy = get_default_taxonomy()
+    assert taxonomy is get_default_taxonomy()
+    cases = {
+        "Python": ("python", "Programming Language"),
+        "Basic JavaScript": ("javascript", "Programming Language"),
+        "golang": ("go", "Programming Language"),
+        "Spring Boot": ("spring", "Framework/Library"),
+        "Google Cloud": ("gcp", "Cloud Platform"),
+        "MongoDB": ("mongodb", "Database"),
+        "Python for Machine Learning": ("python", "Programming Language"),
+        "Underwater basket weaving": (None, "Technical Skill"),
+    }
+    for skill, (skill_id, category) in cases.items():
+        assert taxonomy.canonical_id(skill) == skill_id, skill
+        assert taxonomy.categorize(skill) == category, skill
+    
+    agent = InternHubAIAgent(use_mock=True)
+    assert agent._categorize_skill("AWS") == "Cloud Platform"
+    
+    # Hundreds of categories: lookups stay hash-based and memoized
+    big = SkillTaxonomy({
+        "default_category": "Other",
+        "categories": [{"id": f"c{i}", "label": f"Category {i}", "priority": i}
+                       for i in range(500)],
+        "skills": [{"id": f"s{i}", "name": f"skill {i}", "category": f"c{i % 500}",
+                    "aliases": [f"alias {i} x"]} for i in range(5000)]
+    })
+    assert big.categorize("senior skill 4321 engineer") == "Category 321"
+    assert big.canonical_id("Alias 77 X") == "s77"
+    assert big.categorize("nothing known") == "Other"
+    
+    try:
+        SkillTaxonomy({"default_category": "x", "categories": [],
+                       "skills": [{"id": "a", "name": "A", "category": "missing"}]})
+        assert False, "unknown category accepted"
+    except ValueError:
+        pass
+    
+    print(f"\n🏷️  {len(taxonomy)} skills across {len(taxonomy.categories)} categories")
+
+
+def test_canonical_skill_matching():
+    """Test Case 28: Alias-aware canonical skill matching"""
+    print_section("TEST CASE 28: Canonical Skill IDs")
+    
+    from canonical_skills import canonical_key, job_skill_id, student_skill_ids
+    from match_index import JobIndex, StudentIndex
+    
+    assert canonical_key("JS") == canonical_key("JavaScript") == "javascript"
+    assert canonical_key("k8s") == "kubernetes"
+    assert canonical_key("Underwater Basket Weaving") == "~underwater basket weaving"
+    assert job_skill_id("JavaScript") in student_skill_ids("JS")
+    assert job_skill_id("Java") not in student_skill_ids("JavaScript")
+    assert job_skill_id("Django") in student_skill_ids("Python/Django")
+    # Skills outside the taxonomy match as contained token phrases
+    assert job_skill_id("Communication") in student_skill_ids("Communication Skills")
+    assert job_skill_id("Excel") in student_skill_ids("Microsoft Excel")
+    assert job_skill_id("Data Structures") in student_skill_ids("Data Structures and Algorithms")
+    assert job_skill_id("Communication Skills") not in student_skill_ids("Communication")
+    # Phrase keys are bounded per skill; long phrases still match whole
+    long_skill = "Distributed Systems Design And Capacity Planning For Web Services"
+    assert len(student_skill_ids(long_skill)) <= 4 * len(long_skill.split()) + 1
+    assert job_skill_id(long_skill) in student_skill_ids(long_skill)
+    assert job_skill_id("Capacity Planning") in student_skill_ids(long_skill)
+    import canonical_skills
+    saved = canonical_skills.MAX_MEMO_ENTRIES
+    canonical_skills.MAX_MEMO_ENTRIES = 8
+    try:
+        for i in range(20):
+            assert job_skill_id(f"Memo Skill {i}") in student_skill_ids(f"Memo Skill {i}")
+        assert len(canonical_skills._job_ids) <= 8 and len(canonical_skills._student_ids) <= 8
+    finally:
+        canonical_skills.MAX_MEMO_ENTRIES = saved
+    
+    student = StudentProfile(
+        name="Alias Student", email="alias@example.com",
+        skills=["JS", "k8s", "Python/Django"], interests=[],
+        experience="Synthetic profile", cgpa=3.2
+    )
+    job = InternshipJob(
+        title="Platform Intern", company="Alias Co", description="Platform work",
+        required_skills=["JavaScript", "Kubernetes", "Java"],
+        preferred_skills=["Django"], responsibilities=["Build"],
+        duration_months=3, location="Remote"
+    )
+    agent = InternHubAIAgent(use_mock=True)
+    result = agent.analyze_match(student, job, recommendation="none")
+    assert [gap['skill'] for gap in result['skill_gaps']] == ["Java"]
+    
+    # Matrix and both indexes agree with the per-pair scorer on the same IDs
+    students, jobs = _random_cohort(seed=28, n_students=20, n_jobs=20)
+    students.append(student)
+    jobs.append(job)
+    matrix = agent.match_matrix(students, jobs)
+    expected = [[agent._calculate_match_score(s, j) for j in jobs] for s in students]
+    assert matrix.tolist() == expected
+    
+    job_index = JobIndex(jobs)
+    student_index = StudentIndex(students)
+    for i, s in enumerate(students):
+        top = job_index.top_k(s, k=3)
+        assert [score for _, score in top] == sorted(expected[i], reverse=True)[:len(top)]
+    ranked = student_index.rank_candidates(job, n=3)
+    assert ranked[0][0] is student
+    
+    print(f"\n🔗 JS/k8s aliases matched; {len(students)}x{len(jobs)} scores agree")
+
+
+def test_job_first_prompts():
+    """Test Case 29: Job-first prompt templates with a cached job prefix"""
+    print_section("TEST CASE 29: Job-First Prompt Prefixes")
+    
+    import os
+    import prompts
+    from app import app
+    
+    students, jobs = _random_cohort(seed=29, n_students=12, n_jobs=1)
+    job = get_example_job()
+    agent = InternHubAIAgent(use_mock=True)
+    prompts.reset_stats()
+    
+    resume_prompts = [agent._build_resume_prompt(s, job) for s in students]
+    rec_prompts = [agent._build_recommendation_prompt(s, job, 0.5, []) for s in students]
+    for batch in (resume_prompts, rec_prompts):
+        shared = os.path.commonprefix(batch)
+        assert shared.startswith("You are") and job.title in shared
+        assert all(students[0].name not in p[:len(shared)] for p in batch)
+    assert "Student Profile:" in resume_prompts[0] and "CGPA:" in resume_prompts[0]
+    
+    stats = prompts.stats()
+    assert stats["resume"]["renders"] == len(students)
+    assert stats["resume"]["prefix_hits"] == len(students) - 1
+    assert 0 < stats["recommendation"]["prefix_reuse_ratio"] < 1
+    
+    # The cached prefix follows edits to the job, including in-place ones
+    job.required_skills = job.required_skills + ["Rust"]
+    assert "Rust" in agent._build_resume_prompt(students[0], job)
+    job.required_skills.append("Haskell")
+    assert "Haskell" in agent._build_resume_prompt(students[0], job)
+    
+    # Mock responses still key off the prompt intent
+    result = agent.analyze_match(get_example_student(), get_example_job())
+    assert "resume" not in agent._build_recommendation_prompt(
+        get_example_student(), get_example_job(), 0.9, []).lower()
+    assert result['recommendation']
+    
+    response = app.test_client().get('/prompts/stats')
+    assert response.status_code == 200
+    assert "prefix_reuse_ratio" in response.get_json()['data']['resume']
+    
+    print(f"\n🧩 Recommendation prefix reuse: "
+          f"{stats['recommendation']['prefix_reuse_ratio']:.0%} of prompt characters")
+
+
+def test_single_flight_coalescing():
+    """Test Case 30: Identical concurrent LLM calls share one upstream request"""
+    print_section("TEST CASE 30: Single-Flight LLM Coalescing")
+    
+    import threading
+    import time
+    from llm_cache import LLMResponseCache
+    from singleflight import SingleFlight
+    
+    n_callers = 8
+    flights = SingleFlight()
+    
+    class SlowAgent(CountingAgent):
+        def _request_completion(self, prompt):
+            self.upstream_calls += 1
+            # Hold the request open until every other caller has joined it
+            deadline = time.time() + 5
+            while flights.stats()["coalesced"] < n_callers - 1 and time.time() < deadline:
+                time.sleep(0.001)
+            return self._mock_llm_response(prompt)
+    
+    agent = SlowAgent(cache=LLMResponseCache(), flights=flights)
+    student, job = get_example_student(), get_example_job()
+    prompt = agent._build_recommendation_prompt(student, job, 0.9, [])
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(agent._call_llm(prompt)))
+        for _ in range(n_callers)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert agent.upstream_calls == 1
+    assert len(results) == n_callers and len(set(results)) == 1
+    assert flights.stats() == {"in_flight": 0, "leaders": 1, "coalesced": n_callers - 1}
+    assert agent.cache.stats()["misses"] == n_callers
+    
+    # A failed leader's error reaches every waiter, each of which falls back
+    group = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+    
+    def failing():
+        started.set()
+        release.wait(5)
+        raise ConnectionError("upstream down")
+    
+    errors = []
+    
+    def call():
+        try:
+            group.do("k", failing)
+        except ConnectionError as e:
+            errors.append(e)
+    
+    leader = threading.Thread(target=call)
+    leader.start()
+    started.wait(5)
+    follower = threading.Thread(target=call)
+    follower.start()
+    while group.stats()["coalesced"] < 1:
+        time.sleep(0.001)
+    release.set()
+    leader.join()
+    follower.join()
+    assert len(errors) == 2 and group.in_flight() == 0
+    
+    print(f"\n🛫 {n_callers} concurrent callers → {agent.upstream_calls} upstream call")
+
+
+def test_llm_rate_limit_scheduler():
+    """Test Case 31: RPM/TPM token buckets with interactive-first scheduling"""
+    print_section("TEST CASE 31: LLM Rate Limiter & Priority Scheduler")
+    
+    import os
+    import tempfile
+    import threading
+    import time
+    from llm_cache import LLMResponseCache
+    from llm_scheduler import BATCH, INTERACTIVE, LLMScheduler, TokenBucket, llm_priority
+    from singleflight import SingleFlight
+    from app import app
+    
+    now = [0.0]
+    bucket = TokenBucket(60, clock=lambda: now[0])  # 1 per second, burst of 60
+    bucket.take(60)
+    assert bucket.wait_time(2) == 2.0
+    now[0] = 1.5
+    assert bucket.wait_time(2) == 0.5
+    assert bucket.wait_time(500) == 58.5  # capped at a full bucket
+    now[0] = 40.0
+    assert bucket.wait_time(20) == 0.0
+    assert bucket.wait_time(20, reserve=0.5) == 10.0  # keep 30 in the bucket
+    
+    # Batch requests leave the reserved share for interactive ones
+    reserved = LLMScheduler(rpm=60, tpm=0, clock=lambda: now[0], batch_fraction=0.25)
+    for _ in range(15):
+        reserved.acquire(priority=BATCH)
+    batch_blocked = threading.Thread(target=reserved.acquire, kwargs={"priority": BATCH})
+    batch_blocked.start()
+    while reserved.queue_depth()[BATCH] < 1:
+        time.sleep(0.001)
+    for _ in range(45):
+        assert reserved.acquire(priority=INTERACTIVE) == 0.0
+    assert batch_blocked.is_alive()
+    now[0] += 60.0
+    reserved._wake()
+    batch_blocked.join()
+    
+    # Schedulers on the same budget file (server and CLI processes) share one budget
+    budget_path = os.path.join(tempfile.mkdtemp(), "budget.sqlite3")
+    server = LLMScheduler(rpm=60, tpm=0, path=budget_path)
+    worker = LLMScheduler(rpm=60, tpm=0, path=budget_path)
+    assert server.stats()["shared"] and not reserved.stats()["shared"]
+    for _ in range(30):
+        worker.acquire(priority=BATCH)  # worker may use half the budget
+    for _ in range(30):
+        server.acquire(priority=INTERACTIVE)
+    late = threading.Thread(target=server.acquire)
+    late.start()
+    late.join(timeout=0.5)
+    assert late.is_alive()  # the budget is exhausted for both
+    late.join()
+    
+    # Drain a 6000 TPM budget (100 tokens/s), then queue batch work ahead of
+    # an interactive request: the interactive one is granted first
+    scheduler = LLMScheduler(rpm=0, tpm=6000, batch_fraction=1.0)
+    scheduler.acquire(6000)
+    granted = []
+    
+    def request(priority):
+        scheduler.acquire(20, priority)
+        granted.append(priority)
+    
+    batch = [threading.Thread(target=request, args=(BATCH,)) for _ in range(3)]
+    for thread in batch:
+        thread.start()
+    while scheduler.queue_depth()[BATCH] < 3:
+        time.sleep(0.001)
+    interactive = threading.Thread(target=request, args=(INTERACTIVE,))
+    interactive.start()
+    for thread in batch + [interactive]:
+        thread.join()
+    
+    assert granted[:2].count(INTERACTIVE) == 1 and granted[-1] == BATCH
+    stats = scheduler.stats()
+    assert stats["queue_depth"] == {INTERACTIVE: 0, BATCH: 0}
+    assert stats["priorities"][BATCH]["granted"] == 3
+    assert stats["priorities"][BATCH]["wait_max_s"] >= 0.4
+    
+    # Agents acquire budget per upstream request only (not for cache hits)
+    agent = CountingAgent(cache=LLMResponseCache(), scheduler=LLMScheduler(rpm=600))
+    with llm_priority(BATCH):
+        for _ in range(2):
+            agent.generate_optimized_resume(get_example_student(), get_example_job())
+    assert agent.upstream_calls == 1
+    assert agent.scheduler.stats()["priorities"][BATCH]["granted"] == 1
+    
+    # An interactive caller joining a batch caller's flight raises the shared
+    # request to interactive, so it is granted ahead of queued batch work
+    queued = LLMScheduler(rpm=600, tpm=0, batch_fraction=1.0)  # one request per 0.1s
+    for _ in range(600):
+        queued.acquire()
+    agent = CountingAgent(cache=LLMResponseCache(), flights=SingleFlight(), scheduler=queued)
+    backlog = [threading.Thread(target=queued.acquire, kwargs={"priority": BATCH}) for _ in range(6)]
+    for thread in backlog:
+        thread.start()
+    while queued.queue_depth()[BATCH] < 6:
+        time.sleep(0.001)
+    
+    def batch_leader():
+        with llm_priority(BATCH):
+            agent._call_openai_with_source("recommendation for the flight test")
+    
+    leader = threading.Thread(target=batch_leader)
+    leader.start()
+    while queued.queue_depth()[BATCH] < 7:
+        time.sleep(0.001)
+    assert agent._call_openai_with_source("recommendation for the flight test")[1] == "coalesced"
+    assert queued.queue_depth()[BATCH] >= 3  # most of the batch backlog still waits
+    assert queued.stats()["priorities"][INTERACTIVE]["granted"] == 601
+    for thread in backlog + [leader]:
+        thread.join()
+    assert agent.upstream_calls == 1
+    
+    response = app.test_client().get('/llm/queue')
+    assert response.status_code == 200
+    assert set(response.get_json()['data']['queue_depth']) == {INTERACTIVE, BATCH}
+    
+    print(f"\n🚦 Grant order: {' → '.join(granted)}")
+
+
 def main():
     """Run all tests"""
     print("\n")
@@ -202,6 +1579,31 @@ def main():
         test_ats_scoring()
         test_full_analysis()
         test_json_serialization()
+        test_match_matrix()
+        test_job_index_top_k()
+        test_rank_candidates()
+        test_compiled_skill_matcher()
+        test_ats_single_pass()
+        test_bulk_ats()
+        test_llm_response_cache()
+        test_async_llm_client()
+        test_parallel_full_analysis()
+        test_streaming_batch_analysis()
+        test_resume_sse_streaming()
+        test_cli_batch_mode()
+        test_compact_representations()
+        test_job_catalog()
+        test_store_queries()
+        test_incremental_match_table()
+        test_benchmark_suite()
+        test_latency_metrics()
+        test_score_only_analysis()
+        test_interest_phrase_matching()
+        test_skill_taxonomy()
+        test_canonical_skill_matching()
+        test_job_first_prompts()
+        test_single_flight_coalescing()
+        test_llm_rate_limit_scheduler()
         
         print_section("✅ ALL TESTS COMPLETED SUCCESSFULLY!")
         print("\n📊 Summary:")